@@ -6,11 +6,17 @@ import requests
 import urllib3
 from dotenv import load_dotenv
 
+from src.core.jobs import JobTimeoutError, wait_for_job
+
 load_dotenv()
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+class SearchJobFailedError(Exception):
+    """Raised when Splunk reports the delete search job as failed."""
+
+
 def grant_can_delete(mgmt_url, username, password):
     resp = requests.get(
         f"{mgmt_url}/services/authentication/users/{username}",
@@ -32,7 +38,7 @@ def grant_can_delete(mgmt_url, username, password):
         print(f"[*] Granted 'can_delete' role to '{username}'.")
 
 
-def delete_data(index, query="*"):
+def delete_data(index, query="*", timeout=600):
     host = os.environ.get("SPLUNK_HOST", "localhost")
     port = os.environ.get("SPLUNK_MGMT_PORT", "8089")
     mgmt_url = f"https://{host}:{port}"
@@ -66,8 +72,7 @@ def delete_data(index, query="*"):
     sid = resp.json()["sid"]
     print(f"[*] Search job created: sid={sid}")
 
-    # Poll until the job is done
-    while True:
+    def poll():
         status_resp = requests.get(
             f"{mgmt_url}/services/search/jobs/{sid}",
             params={"output_mode": "json"},
@@ -76,22 +81,46 @@ def delete_data(index, query="*"):
         )
         status_resp.raise_for_status()
         job = status_resp.json()["entry"][0]["content"]
-        dispatch_state = job["dispatchState"]
+        if job["dispatchState"] == "FAILED":
+            raise SearchJobFailedError(f"Search job failed: {job.get('messages', '')}")
+        return job
+
+    # Poll until the job is done, backing off so the management port is not flooded
+    try:
+        job = wait_for_job(
+            poll,
+            lambda job: job["dispatchState"] == "DONE",
+            description=f"Search job {sid}",
+            timeout=timeout,
+            on_progress=lambda job, elapsed: print(
+                f"[*] Job state: {job['dispatchState']} ({elapsed:.0f}s)..."
+            ),
+        )
+    except (JobTimeoutError, KeyboardInterrupt):
+        # Don't leave the delete running on the server.
+        print(f"[*] Cancelling search job {sid}...")
+        requests.post(
+            f"{mgmt_url}/services/search/jobs/{sid}/control",
+            data={"action": "cancel", "output_mode": "json"},
+            auth=(username, password),
+            verify=False,
+        )
+        raise
 
-        if dispatch_state == "DONE":
-            event_count = job.get("eventCount", 0)
-            print(f"[+] Done. {event_count} events deleted from index='{index}'.")
-            break
-        elif dispatch_state == "FAILED":
-            print(f"[-] Search job failed: {job.get('messages', '')}")
-            sys.exit(1)
-        else:
-            print(f"[*] Job state: {dispatch_state}...")
+    event_count = job.get("eventCount", 0)
+    print(f"[+] Done. {event_count} events deleted from index='{index}'.")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Delete events from a Splunk index.")
     parser.add_argument("index", help="Splunk index name to delete events from")
     parser.add_argument("--query", default="*", help="Additional search filter (default: * deletes all events)")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for the delete job (default: 600)")
     args = parser.parse_args()
-    delete_data(args.index, args.query)
+    try:
+        delete_data(args.index, args.query, args.timeout)
+    except (SearchJobFailedError, JobTimeoutError) as e:
+        print(f"[-] {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        sys.exit(130)
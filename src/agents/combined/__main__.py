@@ -0,0 +1,163 @@
+# pylint: disable=logging-fstring-interpolation
+
+import asyncio
+import logging
+import sys
+from contextlib import asynccontextmanager
+from typing import Any
+
+import click
+import uvicorn
+from dotenv import load_dotenv
+
+from src.agents.jira_ticket_agent import server as jira_server
+from src.agents.splunk_inventory_agent import server as inventory_server
+from src.agents.splunk_query_agent import server as query_server
+from src.core.client import create_client
+from src.core.log import setup_logging
+from src.core.setup import ensure_agent_keys, ensure_mcp_tool
+
+load_dotenv(override=True)
+setup_logging('agents')
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '0.0.0.0'
+DEFAULT_LOG_LEVEL = 'info'
+
+# Agent name -> module providing setup_agent(), build_app() and DEFAULT_PORT
+AGENT_SERVERS = {
+    'inventory': inventory_server,
+    'query': query_server,
+    'jira': jira_server,
+}
+
+
+@asynccontextmanager
+async def app_lifespan(contexts: dict[str, dict[str, Any]]):
+    """Set up every agent on one H2OGPTE client.
+
+    The per-agent collections are created and ingested concurrently; MCP
+    tool registration and agent keys, which are global to the H2OGPTE
+    account, run once.
+    """
+    logger.info('Lifespan: Initializing shared H2OGPTE client and MCP tools...')
+
+    try:
+        client = create_client()
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(module.setup_agent, client, contexts[name])
+                for name, module in AGENT_SERVERS.items()
+            )
+        )
+        ensure_mcp_tool(client)
+        ensure_agent_keys(client)
+
+        logger.info('Lifespan: All agents initialized successfully.')
+        yield
+    except Exception as e:
+        logger.error(f'Lifespan: Error during initialization: {e}')
+        raise
+    finally:
+        logger.info('Lifespan: Shutting down...')
+        contexts.clear()
+
+
+def main(
+    host: str = DEFAULT_HOST,
+    ports: dict[str, int] | None = None,
+    log_level: str = DEFAULT_LOG_LEVEL,
+):
+    """Serve the inventory, query and Jira agents from one process.
+
+    Each agent keeps its own port, so hosts configured for the separate
+    processes need no changes. The agents share one H2OGPTE client, and with
+    it the websocket connection pool, and run on one event loop.
+    """
+    ports = {
+        name: (ports or {}).get(name) or module.DEFAULT_PORT
+        for name, module in AGENT_SERVERS.items()
+    }
+
+    async def run_server_async():
+        contexts: dict[str, dict[str, Any]] = {name: {} for name in AGENT_SERVERS}
+        async with app_lifespan(contexts):
+            servers = [
+                uvicorn.Server(
+                    uvicorn.Config(
+                        app=module.build_app(contexts[name], host, ports[name]),
+                        host=host,
+                        port=ports[name],
+                        log_level=log_level.lower(),
+                        lifespan='auto',
+                    )
+                )
+                for name, module in AGENT_SERVERS.items()
+            ]
+
+            logger.info(
+                f'Starting agents at {host} on ports {ports} with log-level {log_level}...'
+            )
+            serving = [asyncio.create_task(server.serve()) for server in servers]
+            try:
+                # When one server stops (signal or error), stop the others.
+                await asyncio.wait(serving, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for server in servers:
+                    server.should_exit = True
+                await asyncio.gather(*serving, return_exceptions=True)
+                logger.info('Uvicorn servers have stopped.')
+
+    try:
+        asyncio.run(run_server_async())
+    except KeyboardInterrupt:
+        logger.info('Server shutdown requested (KeyboardInterrupt).')
+    except Exception as e:
+        logger.error(f'An unexpected error occurred in main: {e}')
+        sys.exit(1)
+
+
+@click.command()
+@click.option(
+    '--host',
+    'host',
+    default=DEFAULT_HOST,
+    help='Hostname to bind the servers to.',
+)
+@click.option(
+    '--inventory-port',
+    'inventory_port',
+    default=inventory_server.DEFAULT_PORT,
+    type=int,
+    help='Port for the Splunk Inventory Agent.',
+)
+@click.option(
+    '--query-port',
+    'query_port',
+    default=query_server.DEFAULT_PORT,
+    type=int,
+    help='Port for the Splunk Query Agent.',
+)
+@click.option(
+    '--jira-port',
+    'jira_port',
+    default=jira_server.DEFAULT_PORT,
+    type=int,
+    help='Port for the Jira Ticket Agent.',
+)
+@click.option(
+    '--log-level',
+    'log_level',
+    default=DEFAULT_LOG_LEVEL,
+    help='Uvicorn log level.',
+)
+def cli(host: str, inventory_port: int, query_port: int, jira_port: int, log_level: str):
+    main(
+        host,
+        {'inventory': inventory_port, 'query': query_port, 'jira': jira_port},
+        log_level,
+    )
+
+
+if __name__ == '__main__':
+    cli()
@@ -1,14 +1,20 @@
 import asyncio
-import os
-import traceback
+import logging
+
+from collections.abc import AsyncIterator
 
 import gradio as gr
 
+from .agent_registry import default_agent_addresses
 from .routing_agent import RoutingAgent
 from dotenv import load_dotenv
+from src.core.config import get_agent_config
+from src.core.log import setup_logging
 
 
 load_dotenv(override=True)
+setup_logging('host')
+logger = logging.getLogger(__name__)
 
 CUSTOM_CSS = """
 /* ── Global ── */
@@ -74,6 +80,14 @@ CUSTOM_CSS = """
     box-shadow: 0 0 6px rgba(34, 197, 94, 0.6);
     flex-shrink: 0;
 }
+.agent-pill .status-dot.degraded {
+    background: #f59e0b;
+    box-shadow: 0 0 6px rgba(245, 158, 11, 0.6);
+}
+.agent-pill .status-dot.unhealthy {
+    background: #ef4444;
+    box-shadow: 0 0 6px rgba(239, 68, 68, 0.6);
+}
 .agent-pill .agent-icon {
     font-size: 1rem;
 }
@@ -147,22 +161,26 @@ CUSTOM_CSS = """
 """
 
 
-def _build_agent_pills_html(agent_names: list[str]) -> str:
-    """Build HTML status pills with green online dots."""
+def _build_agent_pills_html(agent_health: dict[str, str]) -> str:
+    """Build HTML status pills with dots coloured by agent health.
+
+    Args:
+        agent_health: 'healthy', 'degraded' or 'unhealthy' per agent name.
+    """
     icon_map = {
         'inventory': '\U0001f50d',
         'query': '\U0001f4ca',
         'jira': '\U0001f3ab',
     }
     pills = []
-    for name in agent_names:
+    for name, health in agent_health.items():
         icon = next(
             (v for k, v in icon_map.items() if k in name.lower()),
             '\U0001f916',
         )
         pills.append(
-            f'<span class="agent-pill">'
-            f'<span class="status-dot"></span>'
+            f'<span class="agent-pill" title="{health}">'
+            f'<span class="status-dot {health}"></span>'
             f'<span class="agent-icon">{icon}</span>'
             f'{name}'
             f'</span>'
@@ -170,6 +188,28 @@ def _build_agent_pills_html(agent_names: list[str]) -> str:
     return ''.join(pills)
 
 
+def _build_footer_markdown(agent_health: dict[str, str]) -> str:
+    online = sum(health != 'unhealthy' for health in agent_health.values())
+    return (
+        f'Powered by A2A Protocol &nbsp;\u00b7&nbsp; '
+        f'{online}/{len(agent_health)} agents online'
+    )
+
+
+def _build_admin_markdown(routing_agent: RoutingAgent) -> str:
+    cache = routing_agent.routing_cache.stats()
+    state = 'enabled' if cache['enabled'] else 'disabled'
+    routes = ', '.join(f'{source}: {count}' for source, count in routing_agent.route_stats.items())
+    agents = ', '.join(routing_agent.registry.cards) or 'none'
+    pending = ', '.join(sorted(routing_agent.registry.pending)) or 'none'
+    return (
+        f'**Routing cache:** {state} &nbsp;\u00b7&nbsp; {cache["entries"]} entries '
+        f'&nbsp;\u00b7&nbsp; {cache["hits"]} hits / {cache["misses"]} misses\n\n'
+        f'**Routing decisions:** {routes}\n\n'
+        f'**Agents:** {agents} &nbsp;\u00b7&nbsp; **Pending:** {pending}'
+    )
+
+
 SUGGESTION_QUERIES = [
     'What is the version of this Splunk instance?',
     'What indexes are available in Splunk?',
@@ -178,38 +218,34 @@ SUGGESTION_QUERIES = [
 
 async def main():
     """Main gradio app."""
-    print('Initializing routing agent (connecting to remote A2A agents)...')
+    logger.info('Initializing routing agent (connecting to remote A2A agents)...')
     routing_agent = await RoutingAgent.create(
-        remote_agent_addresses=[
-            os.getenv('SPLUNK_INVENTORY_AGENT_URL', 'http://localhost:8080'),
-            os.getenv('SPLUNK_QUERY_AGENT_URL', 'http://localhost:8082'),
-            os.getenv('JIRA_TICKET_AGENT_URL', 'http://localhost:8084'),
-        ]
+        remote_agent_addresses=default_agent_addresses()
     )
 
     if not routing_agent.remote_agent_connections:
-        print(
-            '\nERROR: No remote agents were discovered.\n'
-            'Make sure the Splunk agents are running first.\n'
-            'Then restart this host agent.\n'
+        logger.warning(
+            'No remote agents were discovered yet. Make sure the Splunk agents '
+            'are running; they will be picked up automatically as soon as they respond.'
         )
-        return
 
     agent_names = list(routing_agent.remote_agent_connections.keys())
-    print(f'Connected to {len(agent_names)} agent(s): {agent_names}')
+    logger.info('Connected to %d agent(s): %s', len(agent_names), agent_names)
 
     async def get_response_from_agent(
         message: str,
         history: list[gr.ChatMessage],
-    ) -> str:
-        """Get response from host agent."""
+        request: gr.Request,
+    ) -> AsyncIterator[str]:
+        """Stream the response from host agent into the chat as it arrives."""
         try:
-            response = await routing_agent.route(message)
-            return response
-        except Exception as e:
-            print(f'Error in get_response_from_agent (Type: {type(e)}): {e}')
-            traceback.print_exc()
-            return 'An error occurred while processing your request. Please check the server logs for details.'
+            async for partial in routing_agent.route_stream(
+                message, session_id=request.session_hash or 'default'
+            ):
+                yield partial
+        except Exception:
+            logger.exception('Error in get_response_from_agent')
+            yield 'An error occurred while processing your request. Please check the server logs for details.'
 
     theme = gr.themes.Soft(
         primary_hue=gr.themes.colors.orange,
@@ -292,7 +328,9 @@ async def main():
 
         # Agent status pills
         with gr.Row(elem_id='agent-pills'):
-            gr.HTML(_build_agent_pills_html(agent_names))
+            pills_html = gr.HTML(
+                _build_agent_pills_html(routing_agent.agent_health())
+            )
 
         # Chat interface with native example buttons
         chatbot = gr.Chatbot(
@@ -307,20 +345,80 @@ async def main():
             examples=SUGGESTION_QUERIES,
         )
 
+        # Operator controls, hidden unless admin_panel_enabled is set
+        if get_agent_config('host').get('admin_panel_enabled', False):
+            with gr.Accordion('Admin', open=False):
+                admin_status = gr.Markdown(_build_admin_markdown(routing_agent))
+                with gr.Row():
+                    enable_cache_button = gr.Button('Enable routing cache')
+                    disable_cache_button = gr.Button('Disable routing cache')
+                    flush_cache_button = gr.Button('Flush routing cache')
+                with gr.Row():
+                    agent_address = gr.Textbox(
+                        label='Agent URL',
+                        placeholder='http://host:port (comma-separate replicas)',
+                    )
+                    add_agent_button = gr.Button('Add agent')
+                with gr.Row():
+                    agent_name = gr.Textbox(label='Agent name')
+                    remove_agent_button = gr.Button('Remove agent')
+
+            async def enable_cache():
+                routing_agent.routing_cache.enable()
+                logger.info('Routing cache enabled from the admin panel.')
+                return _build_admin_markdown(routing_agent)
+
+            async def disable_cache():
+                routing_agent.routing_cache.disable()
+                logger.info('Routing cache disabled from the admin panel.')
+                return _build_admin_markdown(routing_agent)
+
+            async def flush_cache():
+                routing_agent.routing_cache.clear()
+                logger.info('Routing cache flushed from the admin panel.')
+                return _build_admin_markdown(routing_agent)
+
+            async def add_agent(address: str):
+                if address.strip():
+                    await routing_agent.add_agent(address)
+                    logger.info('Agent %s added from the admin panel.', address)
+                return _build_admin_markdown(routing_agent)
+
+            async def remove_agent(name: str):
+                if await routing_agent.remove_agent(name.strip()):
+                    logger.info('Agent %s removed from the admin panel.', name)
+                return _build_admin_markdown(routing_agent)
+
+            enable_cache_button.click(enable_cache, outputs=admin_status)
+            disable_cache_button.click(disable_cache, outputs=admin_status)
+            flush_cache_button.click(flush_cache, outputs=admin_status)
+            add_agent_button.click(add_agent, inputs=agent_address, outputs=admin_status)
+            remove_agent_button.click(remove_agent, inputs=agent_name, outputs=admin_status)
+
         # Footer
         with gr.Row(elem_id='footer-row'):
-            gr.Markdown(
-                f'Powered by A2A Protocol &nbsp;\u00b7&nbsp; {len(agent_names)} agents online'
+            footer = gr.Markdown(_build_footer_markdown(routing_agent.agent_health()))
+
+        # Refresh pills and footer from the health monitor's breaker states
+        def refresh_health():
+            agent_health = routing_agent.agent_health()
+            return _build_agent_pills_html(agent_health), _build_footer_markdown(
+                agent_health
             )
 
-    print('Launching Gradio interface...')
+        gr.Timer(5).tick(
+            refresh_health, outputs=[pills_html, footer]
+        )
+
+    logger.info('Launching Gradio interface...')
     demo.queue().launch(
         server_name='0.0.0.0',
         server_port=8083,
         theme=theme,
         css=CUSTOM_CSS,
     )
-    print('Gradio application has been shut down.')
+    await routing_agent.close()
+    logger.info('Gradio application has been shut down.')
 
 
 if __name__ == '__main__':
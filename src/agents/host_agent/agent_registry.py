@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import os
+import threading
+from collections.abc import Callable
+
+import httpx
+from a2a.client import A2ACardResolver
+from a2a.types import AgentCard
+
+from .health import CircuitBreaker
+from .remote_agent_connection import RemoteAgentConnections
+
+logger = logging.getLogger(__name__)
+
+
+def default_agent_addresses() -> list[str]:
+    """Remote agent addresses from the environment, one entry per agent.
+
+    Each entry may list several replica URLs separated by commas.
+    """
+    return [
+        os.getenv('SPLUNK_INVENTORY_AGENT_URL', 'http://localhost:8080'),
+        os.getenv('SPLUNK_QUERY_AGENT_URL', 'http://localhost:8082'),
+        os.getenv('JIRA_TICKET_AGENT_URL', 'http://localhost:8084'),
+    ]
+
+
+def split_addresses(entries: list[str]) -> list[str]:
+    """Flatten comma-separated replica lists into single URLs."""
+    return [url.strip() for entry in entries for url in entry.split(',') if url.strip()]
+
+
+class AgentRegistry:
+    """The remote agents the host can route to, kept current at runtime.
+
+    Agent cards are resolved concurrently. Servers that publish the same
+    agent card name become replicas of one agent. Addresses that cannot be
+    resolved stay pending and are retried by a background thread, so an
+    agent that was down when the host started joins once it comes up.
+    Addresses can be added and agents removed at runtime; ``on_change`` is
+    called whenever the set of agents changes.
+
+    ``on_change`` always runs on the serving loop passed to ``bind_loop()``:
+    changes found by the discovery thread are handed to that loop with
+    ``call_soon_threadsafe``. A change made while no open loop is bound is
+    held back and delivered once one is.
+
+    ``connections`` and ``cards`` are replaced rather than mutated, so code
+    on other threads always sees a consistent snapshot.
+    """
+
+    def __init__(
+        self,
+        httpx_client: httpx.AsyncClient,
+        breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+        on_change: Callable[[], None] | None = None,
+        retry_interval: float = 30,
+        discovery_timeout: float = 10,
+    ):
+        """
+        Args:
+            httpx_client: Shared client the agent connections send requests with.
+            breaker_factory: Creates the circuit breaker for each replica.
+            on_change: Called on the serving loop after agents are added or
+                removed.
+            retry_interval: Seconds between retries of pending addresses.
+            discovery_timeout: Seconds an agent card fetch may take.
+        """
+        self.connections: dict[str, RemoteAgentConnections] = {}
+        self.cards: dict[str, AgentCard] = {}
+        self.pending: set[str] = set()
+        self._httpx_client = httpx_client
+        self._breaker_factory = breaker_factory
+        self._on_change = on_change
+        self.retry_interval = retry_interval
+        self.discovery_timeout = discovery_timeout
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Whether a change has not been passed to on_change yet
+        self._unapplied = False
+
+    async def discover(self, addresses: list[str]) -> None:
+        """Resolve ``addresses`` concurrently and register the agents found.
+
+        Addresses whose card cannot be fetched are left pending for retry.
+        """
+        # Cards are fetched with a throwaway client: discovery runs on
+        # whichever event loop calls it, not the one that serves requests.
+        async with httpx.AsyncClient(timeout=self.discovery_timeout) as client:
+            cards = await asyncio.gather(
+                *(self._resolve(client, address) for address in addresses)
+            )
+
+        changed = False
+        unreachable = []
+        with self._lock:
+            connections = dict(self.connections)
+            known_cards = dict(self.cards)
+            for address, card in zip(addresses, cards):
+                if card is None:
+                    if address not in self.pending:
+                        unreachable.append(address)
+                        self.pending.add(address)
+                    continue
+                self.pending.discard(address)
+                if card.name in connections:
+                    # Another server for an agent we already know: a replica.
+                    connections[card.name].add_replica(address)
+                    logger.info('Added replica %s for %s', address, card.name)
+                    continue
+                connections[card.name] = RemoteAgentConnections(
+                    agent_card=card,
+                    agent_url=address,
+                    httpx_client=self._httpx_client,
+                    breaker_factory=self._breaker_factory,
+                )
+                known_cards[card.name] = card
+                changed = True
+            self.connections = connections
+            self.cards = known_cards
+        if unreachable:
+            logger.warning('Agents not reachable yet, retrying in background: %s', unreachable)
+        if changed:
+            self._changed()
+
+    async def _resolve(
+        self, client: httpx.AsyncClient, address: str
+    ) -> AgentCard | None:
+        try:
+            return await A2ACardResolver(client, address).get_agent_card()
+        except Exception as e:
+            # Only report the first failure; retries of pending addresses stay quiet.
+            if address not in self.pending:
+                if isinstance(e, httpx.ConnectError):
+                    logger.error('Failed to get agent card from %s: %s', address, e)
+                else:
+                    logger.error('Failed to initialize connection for %s: %s', address, e)
+        return None
+
+    def add(self, address: str) -> None:
+        """Queue an address (or comma-separated replicas) for discovery.
+
+        The background thread resolves it right away and keeps retrying
+        until it answers.
+        """
+        with self._lock:
+            self.pending.update(split_addresses([address]))
+        self._wake.set()
+
+    def remove(self, agent_name: str) -> bool:
+        """Stop routing to ``agent_name``.
+
+        Returns:
+            Whether the agent was registered.
+        """
+        with self._lock:
+            if agent_name not in self.connections:
+                return False
+            self.connections = {
+                name: connection
+                for name, connection in self.connections.items()
+                if name != agent_name
+            }
+            self.cards = {
+                name: card for name, card in self.cards.items() if name != agent_name
+            }
+        logger.info('Removed agent %s', agent_name)
+        self._changed()
+        return True
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Deliver ``on_change`` on ``loop``, the loop that serves requests.
+
+        Call it from that loop. Rebinding delivers any change still held
+        back, e.g. one scheduled on a loop that has since closed.
+        """
+        with self._lock:
+            if loop is self._loop and not self._unapplied:
+                return
+            self._loop = loop
+            unapplied = self._unapplied
+        if unapplied:
+            self._apply()
+
+    def _changed(self) -> None:
+        with self._lock:
+            self._unapplied = True
+            loop = self._loop
+        if loop is None or loop.is_closed():
+            # Held back until a serving loop is bound.
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._apply()
+        else:
+            try:
+                loop.call_soon_threadsafe(self._apply)
+            except RuntimeError:
+                # The loop closed meanwhile; the next bind_loop() delivers it.
+                pass
+
+    def _apply(self) -> None:
+        with self._lock:
+            if not self._unapplied:
+                return
+            self._unapplied = False
+        if self._on_change is not None:
+            self._on_change()
+
+    def start(self) -> None:
+        """Start retrying pending addresses in a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='agent-discovery', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.retry_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            with self._lock:
+                pending = sorted(self.pending)
+            if pending:
+                # The request-serving loop may be blocked or elsewhere, so
+                # retries run on this thread's own event loop.
+                asyncio.run(self.discover(pending))
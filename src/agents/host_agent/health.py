@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+import httpx
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+from src.core.admission import ADMISSION_STATS_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Per-replica circuit breaker.
+
+    ``closed``: requests flow. After ``failure_threshold`` consecutive
+    failures (failed requests or health probes) it opens. ``open``: requests
+    are refused immediately. After ``reset_timeout`` seconds one trial request
+    is let through (``half_open``); its outcome, or the next health probe,
+    closes or re-opens the breaker.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        """Whether ``allow_request()`` would let a request through, without
+        moving an open breaker to ``half_open``."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            elapsed = time.monotonic() - self.opened_at
+            return self.state == self.OPEN and elapsed >= self.reset_timeout
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == self.OPEN and elapsed >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        'Circuit opened after %d consecutive failure(s).', self.failures
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class HealthMonitor:
+    """Periodically probes every replica by fetching its agent card.
+
+    Runs in a daemon thread with a synchronous HTTP client, so it keeps
+    working regardless of which event loop serves requests. A successful
+    probe closes the replica's breaker; a failed or slow one counts as a
+    failure. Healthy replicas are also asked for their admission stats, and
+    their ``queue_wait_p95`` is recorded for replica selection.
+    """
+
+    def __init__(
+        self,
+        replicas: Callable[[], Iterable],
+        interval: float = 15,
+        timeout: float = 5,
+    ):
+        """
+        Args:
+            replicas: Returns the current ``AgentReplica`` objects to probe.
+            interval: Seconds between probe rounds.
+            timeout: Seconds a probe may take before it counts as failed.
+        """
+        self.replicas = replicas
+        self.interval = interval
+        self.timeout = timeout
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='agent-health', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        with httpx.Client(timeout=self.timeout) as client:
+            while not self._stop.wait(self.interval):
+                self.probe_all(client)
+
+    def probe_all(self, client: httpx.Client) -> None:
+        for replica in list(self.replicas()):
+            url = replica.url.rstrip('/') + AGENT_CARD_WELL_KNOWN_PATH
+            try:
+                client.get(url).raise_for_status()
+            except httpx.HTTPError as e:
+                if replica.breaker.state != CircuitBreaker.OPEN:
+                    logger.warning(
+                        'Health probe failed for %s: %s: %s', replica.url, type(e).__name__, e
+                    )
+                replica.breaker.record_failure()
+            else:
+                if replica.breaker.state != CircuitBreaker.CLOSED:
+                    logger.info('Health probe succeeded for %s; closing circuit.', replica.url)
+                replica.breaker.record_success()
+                self._probe_load(client, replica)
+
+    def _probe_load(self, client: httpx.Client, replica) -> None:
+        """Record the replica's recent queue wait; agents without the
+        admission route are left as they are."""
+        url = replica.url.rstrip('/') + ADMISSION_STATS_PATH
+        try:
+            response = client.get(url)
+            response.raise_for_status()
+            replica.queue_wait_p95 = float(response.json()['queue_wait_p95'])
+        except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+            logger.debug('No admission stats from %s: %s', replica.url, e)
@@ -0,0 +1,77 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any
+
+from src.core.sqlite import execute
+
+logger = logging.getLogger(__name__)
+
+
+def new_hunt_id() -> str:
+    """Return a short ID users can type to resume a hunt."""
+    return uuid.uuid4().hex[:12]
+
+
+class ThreatHuntStore:
+    """Checkpoints of threat-hunt ``workflow_state`` in a local SQLite file.
+
+    The state is saved after every completed phase (and every completed
+    Phase 2 sub-investigation) so a hunt that failed part-way can be resumed
+    without redoing the work that succeeded. Checkpoints older than
+    ``retention`` seconds are pruned when new hunts are created. Statements
+    run in a worker thread.
+    """
+
+    def __init__(self, db_path: str, retention: float = 7 * 24 * 3600):
+        self.db_path = db_path
+        self.retention = retention
+        execute(self.db_path, 'PRAGMA journal_mode=WAL')
+        execute(
+            self.db_path,
+            'CREATE TABLE IF NOT EXISTS threat_hunts ('
+            ' hunt_id TEXT PRIMARY KEY,'
+            ' state TEXT NOT NULL,'
+            ' updated_at REAL NOT NULL)'
+        )
+
+    async def create(self, hunt_id: str, hypothesis: str) -> dict[str, Any]:
+        """Start a new checkpointed hunt and return its initial state."""
+        _, pruned = await asyncio.to_thread(
+            execute,
+            self.db_path,
+            'DELETE FROM threat_hunts WHERE updated_at < ?',
+            (time.time() - self.retention,),
+        )
+        if pruned:
+            logger.info('Pruned %d expired threat hunt checkpoint(s).', pruned)
+        state = {
+            'hunt_id': hunt_id,
+            'hypothesis': hypothesis,
+            'completed': [],
+            'investigations': {},
+        }
+        await self.save(state)
+        return state
+
+    async def load(self, hunt_id: str) -> dict[str, Any] | None:
+        rows, _ = await asyncio.to_thread(
+            execute,
+            self.db_path,
+            'SELECT state FROM threat_hunts WHERE hunt_id = ?',
+            (hunt_id,),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    async def save(self, state: dict[str, Any]) -> None:
+        # Serialize now: the hunt keeps mutating the state while the
+        # statement waits for a worker thread.
+        await asyncio.to_thread(
+            execute,
+            self.db_path,
+            'INSERT OR REPLACE INTO threat_hunts (hunt_id, state, updated_at)'
+            ' VALUES (?, ?, ?)',
+            (state['hunt_id'], json.dumps(state), time.time()),
+        )
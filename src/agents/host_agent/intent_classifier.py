@@ -0,0 +1,186 @@
+import re
+
+from a2a.types import AgentCard
+
+# Hint lists shared with RoutingAgent._pick_upstream_agent.
+INVENTORY_HINTS = ['index', 'indexes', 'metadata', 'source', 'sourcetype', 'host', 'kv']
+QUERY_HINTS = ['spl', 'query', 'search', 'correlat', 'analy', 'result']
+JIRA_HINTS = ['jira', 'ticket', 'issue']
+
+# Fast-path evidence for the inventory agent. INVENTORY_HINTS names things
+# events are also filtered by ('index', 'sourcetype', 'host'), so only
+# listing and metadata words count here.
+INVENTORY_ROUTING_HINTS = ['inventory', 'metadata', 'list', 'available', 'exist', 'version']
+
+# Nouns that name where events live. They appear in inventory and event
+# questions alike, so they are never evidence for either agent. Stemmed
+# forms are listed too ('sourcetypes' folds to 'sourcetyp').
+_CONTAINER_NOUNS = {
+    'index', 'source', 'sourc', 'sourcetype', 'sourcetyp', 'host', 'kv', 'store',
+}
+
+# Words asking about the events themselves rather than the environment.
+# A message containing any of them is never fast-pathed to inventory.
+_EVENT_INTENT_WORDS = {'find', 'count', 'search', 'who', 'top', 'event', 'events'}
+
+# Messages containing any of these need the LLM: they either describe a
+# threat hunt hypothesis or depend on prior turns to be understood.
+THREAT_HUNT_HINTS = [
+    'investigat', 'hunt', 'suspicious', 'compromise', 'attack', 'breach',
+    'exfiltrat', 'lateral', 'anomal', 'hypothesis', 'incident',
+]
+_FOLLOW_UP_HINTS = ['that', 'those', 'these', 'above', 'previous', 'same', 'again']
+_AMBIGUOUS_HINTS = THREAT_HUNT_HINTS + _FOLLOW_UP_HINTS
+
+_STOPWORDS = {
+    'about', 'answers', 'based', 'can', 'cannot', 'create', 'data', 'describe',
+    'does', 'from', 'have', 'known', 'logs', 'name', 'names', 'needed',
+    'only', 'output', 'read', 'requires', 'run', 'runs', 'splunk', 'status',
+    'that', 'this', 'what', 'when', 'with',
+}
+
+_WORD_RE = re.compile(r'[a-z][a-z0-9]+')
+
+
+def _stem(word: str) -> str:
+    """Crude plural folding so 'indexes' and 'index' compare equal."""
+    for suffix in ('es', 's'):
+        if len(word) > 4 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def matches_hints(message: str, hints: list[str]) -> bool:
+    """Return True if any word of the message starts with one of the hints."""
+    words = [word for word in _WORD_RE.findall(message.lower()) if word not in _STOPWORDS]
+    return any(word.startswith(hint) for word in words for hint in hints)
+
+
+def _card_vocabulary(card: AgentCard) -> set[str]:
+    """Collect keywords from an agent card's description and skills."""
+    texts = [card.description or '']
+    for skill in card.skills or []:
+        texts.append(skill.name or '')
+        texts.append(skill.description or '')
+        texts.extend(tag.replace('_', ' ').replace('-', ' ') for tag in skill.tags or [])
+    words = _WORD_RE.findall(' '.join(texts).lower())
+    return {
+        _stem(word)
+        for word in words
+        if len(word) >= 3 and word not in _STOPWORDS
+    } - _CONTAINER_NOUNS
+
+
+class IntentClassifier:
+    """Keyword classifier that routes obvious requests without the LLM.
+
+    Each agent is scored on how many of its keywords appear in the message.
+    Keywords come from the agent card (description, skill names, skill tags)
+    plus the routing hint lists. Keywords shared by more than one agent, and
+    container nouns such as 'index' or 'sourcetype', are dropped because they
+    do not discriminate. Messages asking to find, count or search events
+    are never scored for the inventory agent.
+    """
+
+    def __init__(
+        self,
+        cards: dict[str, AgentCard],
+        min_score: float = 2.0,
+        min_margin: float = 3.0,
+    ):
+        """
+        Args:
+            cards: Agent cards keyed by agent name.
+            min_score: Minimum score the best agent needs to be chosen.
+            min_margin: Required ratio between best and runner-up scores.
+        """
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.card_keywords: dict[str, set[str]] = {}
+        self.hint_keywords: dict[str, list[str]] = {}
+        self.inventory_agents: set[str] = set()
+
+        vocabularies = {name: _card_vocabulary(card) for name, card in cards.items()}
+        for name, vocabulary in vocabularies.items():
+            others = set().union(
+                *(v for other, v in vocabularies.items() if other != name)
+            )
+            self.card_keywords[name] = vocabulary - others
+            self.hint_keywords[name] = self._hints_for(name)
+            if self.hint_keywords[name] is INVENTORY_ROUTING_HINTS:
+                self.inventory_agents.add(name)
+
+    @staticmethod
+    def _hints_for(agent_name: str) -> list[str]:
+        lowered = agent_name.lower()
+        if 'jira' in lowered:
+            return JIRA_HINTS
+        if 'inventory' in lowered or 'explorer' in lowered:
+            return INVENTORY_ROUTING_HINTS
+        if 'query' in lowered or 'analyst' in lowered:
+            return QUERY_HINTS
+        return []
+
+    def score(self, message: str) -> dict[str, float]:
+        """Score every agent against a message.
+
+        A word matching one of the agent's hints counts double since the
+        hints were curated for routing; card keywords count once. Inventory
+        agents score zero when the message asks about events.
+        """
+        raw_words = set(_WORD_RE.findall(message.lower()))
+        asks_for_events = bool(raw_words & _EVENT_INTENT_WORDS)
+        words = {
+            _stem(word)
+            for word in _WORD_RE.findall(message.lower())
+            if word not in _STOPWORDS
+        }
+        scores: dict[str, float] = {}
+        for name, keywords in self.card_keywords.items():
+            if asks_for_events and name in self.inventory_agents:
+                scores[name] = 0.0
+                continue
+            hints = self.hint_keywords[name]
+            hint_hits = {
+                word for word in words
+                if word not in _CONTAINER_NOUNS
+                and any(word.startswith(hint) for hint in hints)
+            }
+            card_hits = (keywords & words) - hint_hits
+            scores[name] = 2.0 * len(hint_hits) + len(card_hits)
+        return scores
+
+    def classify(self, message: str) -> dict[str, str] | None:
+        """Return a routing decision if the message is unambiguous.
+
+        Args:
+            message: The user's natural language message.
+
+        Returns:
+            A dict with ``agent_name`` and ``reasoning``, or None when the
+            message should fall through to the routing LLM.
+        """
+        lowered = message.lower()
+        words = set(_WORD_RE.findall(lowered))
+        if any(hint in word for hint in _AMBIGUOUS_HINTS for word in words):
+            return None
+
+        scores = self.score(message)
+        if not scores:
+            return None
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_name, best_score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+
+        if best_score < self.min_score:
+            return None
+        if best_score < self.min_margin * runner_up:
+            return None
+
+        return {
+            'agent_name': best_name,
+            'reasoning': (
+                f'Keyword match (score {best_score:g} vs {runner_up:g}) '
+                f'for {best_name}.'
+            ),
+        }
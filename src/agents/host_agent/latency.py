@@ -0,0 +1,94 @@
+import math
+from collections import defaultdict, deque
+
+# Call classes with separate latency statistics. Threat-hunt
+# sub-investigations run far longer than interactive questions, so mixing
+# them would make interactive deadlines too loose and hunt deadlines too tight.
+INTERACTIVE = 'interactive'
+HUNT = 'hunt'
+
+
+class LatencyHistogram:
+    """Response times of an agent's most recent successful requests."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Args:
+            window: How many recent samples are kept.
+            min_samples: Samples needed before percentiles are reported.
+        """
+        self.samples: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """The ``q``-th percentile (nearest rank), or None if too few samples."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+class AdaptiveTimeouts:
+    """Per-agent deadlines and hedge delays derived from observed latency.
+
+    Latency is tracked separately per agent and call class (``INTERACTIVE``
+    or ``HUNT``). Until a pair has ``latency_min_samples`` recorded requests,
+    its deadline is the fixed ``http_timeout``. After that the deadline is
+    the p99 latency times ``adaptive_timeout_multiplier``, kept between the
+    class floor (``adaptive_timeout_min``, or ``hunt_timeout_min`` for hunts)
+    and ``http_timeout``. Agents whose name contains a ``hedge_agents``
+    fragment get a hedge delay equal to their p95.
+
+    Callers should record only requests the agent actually executed, not
+    answers served from its response cache.
+    """
+
+    def __init__(self, config: dict):
+        """
+        Args:
+            config: The ``host`` section of agents.yaml.
+        """
+        self.ceiling = config.get('http_timeout', 600)
+        self.floors = {
+            INTERACTIVE: config.get('adaptive_timeout_min', 30),
+            HUNT: config.get('hunt_timeout_min', 300),
+        }
+        self.multiplier = config.get('adaptive_timeout_multiplier', 3)
+        self.hedge_fragments = config.get('hedge_agents', ['inventory', 'query'])
+        window = config.get('latency_window', 200)
+        min_samples = config.get('latency_min_samples', 20)
+        self.histograms: dict[tuple[str, str], LatencyHistogram] = defaultdict(
+            lambda: LatencyHistogram(window, min_samples)
+        )
+
+    def record(self, agent_name: str, seconds: float, call_class: str = INTERACTIVE) -> None:
+        self.histograms[agent_name, call_class].record(seconds)
+
+    def deadline(self, agent_name: str, call_class: str = INTERACTIVE) -> float:
+        """Seconds to wait for ``agent_name`` before giving up."""
+        p99 = self.histograms[agent_name, call_class].percentile(99)
+        if p99 is None:
+            return self.ceiling
+        floor = self.floors.get(call_class, self.floors[INTERACTIVE])
+        return min(self.ceiling, max(floor, p99 * self.multiplier))
+
+    def hedge_delay(self, agent_name: str, call_class: str = INTERACTIVE) -> float | None:
+        """Seconds after which to send a hedged request, or None not to hedge."""
+        lowered = agent_name.lower()
+        if not any(fragment in lowered for fragment in self.hedge_fragments):
+            return None
+        return self.histograms[agent_name, call_class].percentile(95)
+
+    def stats(self, agent_name: str, call_class: str = INTERACTIVE) -> str:
+        histogram = self.histograms[agent_name, call_class]
+        p50, p95 = histogram.percentile(50), histogram.percentile(95)
+        if p50 is None:
+            return f'{call_class}: {len(histogram.samples)} sample(s)'
+        return (
+            f'{call_class}: p50 {p50:.1f}s, p95 {p95:.1f}s, '
+            f'deadline {self.deadline(agent_name, call_class):.0f}s'
+        )
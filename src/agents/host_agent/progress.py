@@ -0,0 +1,88 @@
+from collections.abc import Callable
+
+# Receives the full in-progress reply text each time a streamed update arrives.
+ProgressCallback = Callable[[str], None]
+
+
+def render_progress(partial: str, status: str = '') -> str:
+    """Format streamed text for display.
+
+    Args:
+        partial: Reply text received so far, with complete <thinking> blocks
+            already removed. An unfinished trailing block is hidden.
+        status: Current step description, shown in italics after the text.
+    """
+    open_thinking = partial.rfind('<thinking>')
+    if open_thinking != -1:
+        partial = partial[:open_thinking].rstrip()
+    if status:
+        return f'{partial}\n\n_{status}_' if partial else f'_{status}_'
+    return partial
+
+
+def with_heading(
+    on_progress: ProgressCallback | None, heading: str
+) -> ProgressCallback | None:
+    """Announce a workflow step and prefix its streamed output with a heading.
+
+    Returns:
+        The callback to pass to send_message for this step, or None when
+        there is nobody to report progress to.
+    """
+    if on_progress is None:
+        return None
+    on_progress(f'**{heading}**')
+
+    def report(partial: str) -> None:
+        on_progress(f'**{heading}**\n\n{partial}')
+
+    return report
+
+
+class ProgressRelay:
+    """Holds progress from a speculative call until the route is committed.
+
+    Only the latest update is kept; it is replayed to the real callback once
+    ``attach`` is called, and later updates are forwarded directly.
+    """
+
+    def __init__(self):
+        self.latest: str | None = None
+        self.target: ProgressCallback | None = None
+
+    def __call__(self, text: str) -> None:
+        self.latest = text
+        if self.target is not None:
+            self.target(text)
+
+    def attach(self, on_progress: ProgressCallback | None) -> None:
+        self.target = on_progress
+        if on_progress is not None and self.latest is not None:
+            on_progress(self.latest)
+
+
+class ProgressFanout:
+    """Forwards progress from one shared call to every caller waiting on it.
+
+    Callers that subscribe late first get the latest update.
+    """
+
+    def __init__(self):
+        self.latest: str | None = None
+        self.targets: list[ProgressCallback] = []
+
+    def __call__(self, text: str) -> None:
+        self.latest = text
+        for target in list(self.targets):
+            target(text)
+
+    def subscribe(self, on_progress: ProgressCallback | None) -> None:
+        if on_progress is None:
+            return
+        self.targets.append(on_progress)
+        if self.latest is not None:
+            on_progress(self.latest)
+
+    def unsubscribe(self, on_progress: ProgressCallback | None) -> None:
+        if on_progress in self.targets:
+            self.targets.remove(on_progress)
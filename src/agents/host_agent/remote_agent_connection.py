@@ -1,41 +1,311 @@
-from collections.abc import Callable
+import asyncio
+import itertools
+import logging
+import math
+import time
+
+from collections.abc import AsyncGenerator, Callable
 
 import httpx
 
 from a2a.client import A2AClient
+from a2a.client.errors import A2AClientHTTPError, A2AClientTimeoutError
 from a2a.types import (
     AgentCard,
+    CancelTaskRequest,
+    JSONRPCErrorResponse,
     SendMessageRequest,
     SendMessageResponse,
+    SendStreamingMessageRequest,
+    SendStreamingMessageResponse,
     Task,
+    TaskIdParams,
     TaskArtifactUpdateEvent,
     TaskStatusUpdateEvent,
 )
 from dotenv import load_dotenv
 
+from src.core.admission import SERVER_BUSY_CODE
+from src.core.log import Payload
+
+from .health import CircuitBreaker
+
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 
+# Errors that mean the replica itself is unreachable or unresponsive
+_REPLICA_FAILURES = (A2AClientHTTPError, A2AClientTimeoutError, httpx.HTTPError)
+
+
+class AgentUnavailableError(ValueError):
+    """Raised without contacting the agent when every replica's circuit is open.
+
+    A ValueError so existing delegation error handling reports it to the user.
+    """
+
+
+class AgentBusyError(AgentUnavailableError):
+    """Raised when every replica has turned requests away as over capacity."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _task_id(response: SendStreamingMessageResponse) -> str | None:
+    """The ID of the task a streamed event belongs to, if any."""
+    event = getattr(response.root, 'result', None)
+    if isinstance(event, Task):
+        return event.id
+    if isinstance(event, (TaskStatusUpdateEvent, TaskArtifactUpdateEvent)):
+        return event.task_id
+    return None
+
+
+def create_httpx_client(config: dict) -> httpx.AsyncClient:
+    """Build the HTTP client shared by every remote agent connection.
+
+    Args:
+        config: The ``host`` section of agents.yaml. Reads ``http_timeout``,
+            ``http_max_connections`` and ``http_max_keepalive``.
+    """
+    return httpx.AsyncClient(
+        timeout=config.get('http_timeout', 600),
+        limits=httpx.Limits(
+            max_connections=config.get('http_max_connections', 64),
+            max_keepalive_connections=config.get('http_max_keepalive', 16),
+        ),
+    )
+
+
+class AgentReplica:
+    """One server instance of a remote agent, its in-flight request count
+    and its circuit breaker."""
+
+    def __init__(
+        self,
+        httpx_client: httpx.AsyncClient,
+        agent_card: AgentCard,
+        url: str,
+        breaker: CircuitBreaker,
+    ):
+        self.url = url
+        self.client = A2AClient(httpx_client, agent_card, url=url)
+        self.breaker = breaker
+        self.outstanding = 0
+        self.served = 0
+        self.rejected = 0
+        # Monotonic time until which the replica asked not to be sent work.
+        self.busy_until = 0.0
+        # Seconds requests recently queued on the server before running, from
+        # health probes and busy rejections; breaks ties between replicas.
+        self.queue_wait_p95 = 0.0
+
+    def busy(self) -> bool:
+        return time.monotonic() < self.busy_until
+
+    def check_busy(
+        self, response: SendMessageResponse | SendStreamingMessageResponse
+    ) -> bool:
+        """Whether ``response`` is the server turning the request away.
+
+        If so, the replica is avoided for the ``retry_after`` it asked for.
+        """
+        root = response.root
+        if not isinstance(root, JSONRPCErrorResponse) or root.error.code != SERVER_BUSY_CODE:
+            return False
+        data = root.error.data or {}
+        retry_after = data.get('retry_after', 5)
+        self.busy_until = time.monotonic() + retry_after
+        self.queue_wait_p95 = data.get('queue_wait_p95', self.queue_wait_p95)
+        self.rejected += 1
+        logger.warning('%s is at capacity, backing off %ss: %s', self.url, retry_after, data)
+        return True
+
 
 class RemoteAgentConnections:
-    """A class to hold the connections to the remote agents."""
-
-    def __init__(self, agent_card: AgentCard, agent_url: str):
-        print(f'agent_card: {agent_card}')
-        print(f'agent_url: {agent_url}')
-        self._httpx_client = httpx.AsyncClient(timeout=600)
-        self.agent_client = A2AClient(
-            self._httpx_client, agent_card, url=agent_url
-        )
+    """A class to hold the connections to the remote agents.
+
+    Each agent may be served by several replicas (servers publishing the
+    same agent card). Requests go to the replica with the fewest
+    outstanding requests, then the shortest server-side queue wait (whole
+    seconds of its p95); remaining ties are broken round-robin. Replicas whose
+    circuit breaker is open are skipped, and if all are open the request
+    fails immediately with AgentUnavailableError. A replica that rejects a
+    request as over capacity is skipped for the retry-after period it
+    returns and the request moves to another replica; if all are backing
+    off it fails with AgentBusyError. All replicas share the caller's
+    ``httpx.AsyncClient``.
+    """
+
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        agent_url: str,
+        httpx_client: httpx.AsyncClient,
+        breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+    ):
+        logger.info('Connecting to %s at %s', agent_card.name, agent_url)
+        self._httpx_client = httpx_client
+        self._breaker_factory = breaker_factory
         self.card = agent_card
+        self.replicas: list[AgentReplica] = []
+        self._turns = itertools.count()
+        self._cancellations: set[asyncio.Task] = set()
+        self.add_replica(agent_url)
+
+    def add_replica(self, agent_url: str) -> None:
+        """Serve this agent from another URL as well."""
+        if any(replica.url == agent_url for replica in self.replicas):
+            return
+        self.replicas.append(
+            AgentReplica(
+                self._httpx_client, self.card, agent_url, self._breaker_factory()
+            )
+        )
 
     def get_agent(self) -> AgentCard:
         return self.card
 
+    def _pick_replica(self) -> AgentReplica:
+        """Least outstanding requests, then shortest queue wait, rotating
+        between equally busy ones.
+
+        Raises:
+            AgentUnavailableError: If every replica's circuit is open.
+            AgentBusyError: If every remaining replica is backing off.
+        """
+        while True:
+            turn = next(self._turns)
+            count = len(self.replicas)
+            available = [
+                replica
+                for replica in (self.replicas[(turn + i) % count] for i in range(count))
+                if replica.breaker.is_available()
+            ]
+            if not available:
+                raise AgentUnavailableError(
+                    f'{self.card.name} is currently unavailable (failing health checks). '
+                    'Please try again shortly.'
+                )
+            idle = [replica for replica in available if not replica.busy()]
+            if not idle:
+                retry_after = max(
+                    1, round(min(r.busy_until for r in available) - time.monotonic())
+                )
+                raise AgentBusyError(
+                    f'{self.card.name} is at capacity. Please try again in {retry_after}s.',
+                    retry_after,
+                )
+            # Whole seconds, so sub-second noise does not defeat the rotation.
+            replica = min(
+                idle,
+                key=lambda replica: (replica.outstanding, math.floor(replica.queue_wait_p95)),
+            )
+            # Only the chosen replica's breaker takes its half-open trial; if
+            # a probe re-opened it meanwhile, pick again.
+            if replica.breaker.allow_request():
+                return replica
+
     async def send_message(
         self, message_request: SendMessageRequest
     ) -> SendMessageResponse:
-        return await self.agent_client.send_message(message_request)
\ No newline at end of file
+        while True:
+            replica = self._pick_replica()
+            replica.outstanding += 1
+            try:
+                response = await replica.client.send_message(message_request)
+            except _REPLICA_FAILURES:
+                replica.breaker.record_failure()
+                raise
+            finally:
+                replica.outstanding -= 1
+                replica.served += 1
+            replica.breaker.record_success()
+            if not replica.check_busy(response):
+                return response
+
+    async def send_message_streaming(
+        self, message_request: SendStreamingMessageRequest
+    ) -> AsyncGenerator[SendStreamingMessageResponse, None]:
+        """Stream a request's events from one replica.
+
+        If the caller is cancelled while the task is running, the replica is
+        sent ``tasks/cancel`` so the agent stops working on it.
+        """
+        while True:
+            replica = self._pick_replica()
+            replica.outstanding += 1
+            rejected = False
+            task_id = None
+            try:
+                async for response in replica.client.send_message_streaming(
+                    message_request
+                ):
+                    # A rejection is the first and only event; nothing has
+                    # been passed on yet, so the request can move on.
+                    if replica.check_busy(response):
+                        rejected = True
+                        break
+                    task_id = task_id or _task_id(response)
+                    yield response
+            except _REPLICA_FAILURES:
+                replica.breaker.record_failure()
+                raise
+            except asyncio.CancelledError:
+                if task_id is not None:
+                    self._cancel_remote(replica, task_id)
+                raise
+            finally:
+                replica.outstanding -= 1
+                replica.served += 1
+            replica.breaker.record_success()
+            if not rejected:
+                return
+
+    def _cancel_remote(self, replica: AgentReplica, task_id: str) -> None:
+        """Send ``tasks/cancel`` for ``task_id`` in the background."""
+
+        async def cancel() -> None:
+            try:
+                response = await replica.client.cancel_task(
+                    CancelTaskRequest(id=task_id, params=TaskIdParams(id=task_id))
+                )
+                logger.info(
+                    'Cancelled task %s on %s: %s', task_id, replica.url, Payload(response)
+                )
+            except Exception as e:
+                logger.warning('Failed to cancel task %s on %s: %s', task_id, replica.url, e)
+
+        # Keep a reference so the task is not garbage collected mid-flight.
+        cancellation = asyncio.create_task(cancel())
+        self._cancellations.add(cancellation)
+        cancellation.add_done_callback(self._cancellations.discard)
+
+    def health(self) -> str:
+        """``'healthy'`` if every replica's circuit is closed, ``'unhealthy'``
+        if none is, ``'degraded'`` otherwise."""
+        closed = sum(
+            replica.breaker.state == CircuitBreaker.CLOSED for replica in self.replicas
+        )
+        if closed == len(self.replicas):
+            return 'healthy'
+        return 'unhealthy' if closed == 0 else 'degraded'
+
+    def stats(self) -> list[dict[str, str | int | float]]:
+        return [
+            {
+                'url': replica.url,
+                'outstanding': replica.outstanding,
+                'served': replica.served,
+                'circuit': replica.breaker.state,
+                'rejected': replica.rejected,
+                'queue_wait_p95': replica.queue_wait_p95,
+            }
+            for replica in self.replicas
+        ]
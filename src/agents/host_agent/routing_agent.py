@@ -1,14 +1,14 @@
 import asyncio
 import json
-import os
+import logging
 import re
+import time
 import uuid
 
+from collections.abc import AsyncIterator
 from typing import Any
 
-import httpx
-
-from a2a.client import A2ACardResolver
+from a2a.client.errors import A2AClientTimeoutError
 from a2a.types import (
     AgentCard,
     Message,
@@ -16,26 +16,67 @@ from a2a.types import (
     SendMessageRequest,
     SendMessageResponse,
     SendMessageSuccessResponse,
+    SendStreamingMessageRequest,
+    SendStreamingMessageSuccessResponse,
     Task,
+    TaskState,
+    TaskStatusUpdateEvent,
 )
 from dotenv import load_dotenv
 from h2ogpte import H2OGPTE
+from .agent_registry import AgentRegistry, default_agent_addresses, split_addresses
+from .health import CircuitBreaker, HealthMonitor
+from .hunt_store import ThreatHuntStore, new_hunt_id
+from .intent_classifier import (
+    INVENTORY_HINTS,
+    QUERY_HINTS,
+    THREAT_HUNT_HINTS,
+    IntentClassifier,
+    matches_hints,
+)
+from .latency import INTERACTIVE, AdaptiveTimeouts
+from .progress import (
+    ProgressCallback,
+    ProgressFanout,
+    ProgressRelay,
+    render_progress,
+)
 from .remote_agent_connection import (
     RemoteAgentConnections,
     TaskUpdateCallback,
+    create_httpx_client,
 )
-from src.core.client import create_client
+from .routing_cache import RoutingCache, normalize_message
+from .session_store import SessionStore, create_session_store
+from src.core.client import connect_session, create_client, get_session_pool
 from src.core.config import get_agent_config
+from src.core.context_budget import fit_to_budget
+from src.core.h2ogpte_executor import get_h2ogpte_executor
+from src.core.log import CORRELATION_KEY, Payload, bind_correlation_id, correlation_id
 from src.core.prompt_loader import load_prompt
+from src.core.response_cache import CACHED_KEY
 from .threat_hunt import execute_threat_hunt
+from .workflow import run_workflow, sink_steps, validate_workflow
 
 
 load_dotenv()
 
 host_config = get_agent_config("host")
+logger = logging.getLogger(__name__)
 prompt = load_prompt("host")
+planner_prompt = load_prompt("planner")
 
 _THINKING_RE = re.compile(r'<thinking>.*?</thinking>\s*', flags=re.DOTALL)
+# "resume hunt <id>" (or just "resume hunt" for the session's latest hunt)
+_RESUME_RE = re.compile(
+    r'^\s*/?resume\s+(?:threat\s+)?hunt(?:\s+`?([0-9a-f]+)`?)?\s*$', re.IGNORECASE
+)
+
+# Name fragments identifying the read-only agents used as Jira upstreams.
+_UPSTREAM_ROLES = {
+    'inventory': ('inventory', 'explorer'),
+    'query': ('query', 'analyst'),
+}
 
 
 def _strip_thinking(text: str) -> str:
@@ -43,6 +84,11 @@ def _strip_thinking(text: str) -> str:
     return _THINKING_RE.sub('', text).strip()
 
 
+def _is_cached(message: Message | None) -> bool:
+    """Whether a sub-agent answer was served from its response cache."""
+    return bool(message is not None and (message.metadata or {}).get(CACHED_KEY))
+
+
 def create_send_message_payload(
     text: str, task_id: str | None = None, context_id: str | None = None
 ) -> dict[str, Any]:
@@ -77,51 +123,100 @@ class RoutingAgent:
         task_callback: TaskUpdateCallback | None = None,
     ):
         self.task_callback = task_callback
+        # One bounded HTTP client shared by every agent replica
+        self.httpx_client = create_httpx_client(host_config)
+        # Discovered agents; the attributes below are rebuilt from it on change
+        self.registry = AgentRegistry(
+            self.httpx_client,
+            breaker_factory=self._new_breaker,
+            on_change=self._on_agents_changed,
+            retry_interval=host_config.get('agent_retry_interval', 30),
+            discovery_timeout=host_config.get('agent_discovery_timeout', 10),
+        )
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ''
-        # H2OGPTE client and session
+        self.routing_schema: dict[str, Any] = self._build_routing_schema()
+        # Latency-derived deadlines and hedge delays per agent
+        self.timeouts = AdaptiveTimeouts(host_config)
+        self.hedge_stats: dict[str, int] = {'sent': 0, 'won': 0}
+        # Shared calls for identical concurrent tasks, by (agent name, normalized task)
+        self._in_flight: dict[tuple[str, str], dict[str, Any]] = {}
+        self.coalesce_stats: dict[str, int] = {'calls': 0, 'coalesced': 0}
+        # Background probes that open and close each replica's circuit breaker
+        self.health_monitor = HealthMonitor(
+            lambda: [
+                replica
+                for connection in self.remote_agent_connections.values()
+                for replica in connection.replicas
+            ],
+            interval=host_config.get('health_check_interval', 15),
+            timeout=host_config.get('health_check_timeout', 5),
+        )
+        # H2OGPTE client and the bounded pool its blocking calls run in
         self.h2ogpte_client = h2ogpte_client
-        self.chat_session_id: str | None = None
-        # Instance-level state (replaces ADK context.state)
-        self.session_id: str = str(uuid.uuid4())
-        # Conversation memory: tracks each turn for cross-agent continuity
-        self.turn_history: list[dict[str, str]] = []
+        self.h2ogpte_executor = get_h2ogpte_executor('host')
+        # Per-browser-session state: routing chat session and turn history
+        self.sessions: SessionStore = create_session_store(
+            host_config, on_evict=self._delete_routing_chat_sessions
+        )
+        # Threat-hunt checkpoints, so failed hunts can be resumed
+        self.hunt_store = ThreatHuntStore(
+            host_config.get('hunt_db_path', 'threat_hunts.db'),
+            retention=host_config.get('hunt_retention', 7 * 24 * 3600),
+        )
+        # Local keyword classifier that short-circuits the routing LLM
+        self.intent_classifier: IntentClassifier | None = None
+        # LLM routing decisions reused for repeated questions in the same context
+        self.routing_cache = RoutingCache(
+            ttl=host_config.get('routing_cache_ttl', 600),
+            max_entries=host_config.get('routing_cache_max_entries', 256),
+            enabled=host_config.get('routing_cache_enabled', True),
+        )
+        # How many routing decisions each path made ('fast_path', 'cache' or 'llm')
+        self.route_stats: dict[str, int] = {'fast_path': 0, 'cache': 0, 'llm': 0}
+        # Outcome of sub-agent calls started before the routing LLM answered
+        self.speculation_stats: dict[str, float] = {
+            'started': 0,
+            'committed': 0,
+            'discarded': 0,
+            'saved_seconds': 0.0,
+            'wasted_seconds': 0.0,
+        }
 
     async def _async_init_components(
         self, remote_agent_addresses: list[str]
     ) -> None:
         """Asynchronous part of initialization."""
-        async with httpx.AsyncClient(timeout=30) as client:
-            for address in remote_agent_addresses:
-                card_resolver = A2ACardResolver(client, address)
-                try:
-                    card = await card_resolver.get_agent_card()
-                    remote_connection = RemoteAgentConnections(
-                        agent_card=card, agent_url=address
-                    )
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card
-                except httpx.ConnectError as e:
-                    print(
-                        f'ERROR: Failed to get agent card from {address}: {e}'
-                    )
-                except Exception as e:
-                    print(
-                        f'ERROR: Failed to initialize connection for {address}: {e}'
-                    )
+        self.registry.bind_loop(asyncio.get_running_loop())
+        await self.registry.discover(split_addresses(remote_agent_addresses))
+
+    def _on_agents_changed(self) -> None:
+        """Rebuild the roster, routing schema and fast-path classifier after
+        agents were added to or removed from the registry.
+
+        The registry calls this on the serving loop, never on its discovery
+        thread, so requests in flight see either the old or the new roster.
+        """
+        self.remote_agent_connections = self.registry.connections
+        self.cards = self.registry.cards
 
         # Build agent roster string
         agent_info = []
         for agent_detail_dict in self.list_remote_agents():
             agent_info.append(json.dumps(agent_detail_dict))
         self.agents = '\n'.join(agent_info)
+        self.routing_schema = self._build_routing_schema()
 
-        # Create H2OGPTE chat session for routing (no collection = pure LLM reasoning)
-        self.chat_session_id = self.h2ogpte_client.create_chat_session(
-            collection_id=None
-        )
-        print(f'Routing agent chat session created: {self.chat_session_id}')
+        if host_config.get('fast_path_enabled', True):
+            self.intent_classifier = IntentClassifier(
+                self.cards,
+                min_score=host_config.get('fast_path_min_score', 2),
+                min_margin=host_config.get('fast_path_min_margin', 3),
+            )
+        # Cached decisions may name agents that are gone.
+        self.routing_cache.clear()
+        logger.info('Agent roster: %s', list(self.cards))
 
     @classmethod
     async def create(
@@ -130,13 +225,57 @@ class RoutingAgent:
         h2ogpte_client: H2OGPTE | None = None,
         task_callback: TaskUpdateCallback | None = None,
     ) -> 'RoutingAgent':
-        """Create and asynchronously initialize an instance of the RoutingAgent."""
+        """Create and asynchronously initialize an instance of the RoutingAgent.
+
+        Each address may list several replica URLs separated by commas.
+        Servers that publish the same agent card name become replicas of one
+        agent, load balanced by outstanding requests. Addresses that do not
+        answer are retried in the background (see ``AgentRegistry``).
+        """
         if h2ogpte_client is None:
             h2ogpte_client = create_client()
         instance = cls(h2ogpte_client=h2ogpte_client, task_callback=task_callback)
         await instance._async_init_components(remote_agent_addresses)
+        instance.registry.start()
+        instance.health_monitor.start()
         return instance
 
+    async def add_agent(self, address: str) -> None:
+        """Start routing to the agent at ``address`` (or comma-separated
+        replicas) once its card resolves."""
+        self.registry.bind_loop(asyncio.get_running_loop())
+        self.registry.add(address)
+
+    async def remove_agent(self, agent_name: str) -> bool:
+        """Stop routing to ``agent_name``.
+
+        Returns:
+            Whether the agent was registered.
+        """
+        self.registry.bind_loop(asyncio.get_running_loop())
+        return self.registry.remove(agent_name)
+
+    async def close(self) -> None:
+        """Stop background discovery and health probes and close the shared
+        HTTP client used for all remote agents."""
+        self.registry.stop()
+        self.health_monitor.stop()
+        await self.httpx_client.aclose()
+
+    @staticmethod
+    def _new_breaker() -> CircuitBreaker:
+        return CircuitBreaker(
+            failure_threshold=host_config.get('breaker_failure_threshold', 3),
+            reset_timeout=host_config.get('breaker_reset_timeout', 30),
+        )
+
+    def agent_health(self) -> dict[str, str]:
+        """Health of each remote agent: 'healthy', 'degraded' or 'unhealthy'."""
+        return {
+            name: connection.health()
+            for name, connection in self.remote_agent_connections.items()
+        }
+
     def list_remote_agents(self):
         """List the available remote agents you can use to delegate the task."""
         if not self.cards:
@@ -144,38 +283,66 @@ class RoutingAgent:
 
         remote_agent_info = []
         for card in self.cards.values():
-            print(f'Found agent card: {card.model_dump(exclude_none=True)}')
-            print('=' * 100)
+            logger.debug('Found agent card: %s', Payload(card))
             remote_agent_info.append(
                 {'name': card.name, 'description': card.description}
             )
         return remote_agent_info
 
-    def _build_routing_context(self) -> str:
+    def _build_routing_context(self, turn_history: list[dict[str, str]]) -> str:
         """Build concise routing context from tracked conversation turns.
 
         Uses turn_history (which includes agent attribution) rather than raw
         Gradio history to avoid leaking full response text into the routing
         prompt — that confuses the classifier LLM.
         """
-        if not self.turn_history:
+        if not turn_history:
             return 'No prior conversation.'
         lines = []
-        for turn in self.turn_history[-5:]:
+        for turn in turn_history[-5:]:
             lines.append(
                 f'- User: "{turn["user"][:150]}" -> Routed to: {turn["agent"]}'
             )
         return '\n'.join(lines)
 
-    def _build_enriched_message(self, user_message: str) -> str:
-        """Prepend prior conversation context to the message sent to sub-agents."""
-        if not self.turn_history:
+    def context_budget(self, agent_name: str) -> int:
+        """Token budget for context added to prompts sent to ``agent_name``.
+
+        Looked up in the host's ``context_budgets`` by agent name fragment
+        (e.g. ``query``), falling back to ``context_budget_default``.
+        """
+        lowered = agent_name.lower()
+        return next(
+            (
+                tokens
+                for fragment, tokens in host_config.get('context_budgets', {}).items()
+                if fragment in lowered
+            ),
+            host_config.get('context_budget_default', 6000),
+        )
+
+    def _build_enriched_message(
+        self, user_message: str, turn_history: list[dict[str, str]], agent_name: str
+    ) -> str:
+        """Prepend prior conversation context to the message sent to sub-agents.
+
+        Prior responses are fitted into the target agent's context budget,
+        keeping the ones most relevant to the current question whole.
+        """
+        if not turn_history:
             return user_message
+        turns = turn_history[-3:]
+        responses = fit_to_budget(
+            [turn['response'] for turn in turns],
+            self.context_budget(agent_name),
+            query=user_message,
+            label=f'enriched message for {agent_name}',
+        )
         context_lines = []
-        for turn in self.turn_history[-3:]:
+        for turn, response in zip(turns, responses):
             context_lines.append(
                 f'[{turn["agent"]}] User: {turn["user"]}\n'
-                f'[{turn["agent"]}] Response: {turn["response"]}'
+                f'[{turn["agent"]}] Response: {response or "[omitted]"}'
             )
         context = '\n\n'.join(context_lines)
         return (
@@ -185,24 +352,88 @@ class RoutingAgent:
             f'{user_message}'
         )
 
-    async def route(self, user_message: str) -> str:
-        """Route a user message to the appropriate remote agent via H2OGPTE LLM.
+    async def _delete_routing_chat_sessions(self, chat_session_ids: list[str]) -> None:
+        """Delete the H2OGPTE routing chat sessions of evicted browser sessions."""
+        try:
+            await self.h2ogpte_executor.run(
+                self.h2ogpte_client.delete_chat_sessions, chat_session_ids
+            )
+            logger.info('Deleted %d routing chat session(s).', len(chat_session_ids))
+        except Exception as e:
+            logger.warning('Could not delete routing chat sessions %s: %s', chat_session_ids, e)
 
-        Args:
-            user_message: The user's natural language message.
+    async def _query_host_llm(
+        self,
+        user_message: str,
+        system_prompt: str,
+        schema: dict[str, Any],
+        session: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """Ask the host's H2OGPTE LLM for a JSON reply matching ``schema``.
+
+        Uses the session's routing chat session (created on first use) with
+        chat history off, so each call only sees its own system prompt.
 
         Returns:
-            The response text from the remote agent, or a direct response.
+            The parsed JSON reply, or None if it was not valid JSON.
+        """
+        # Sync H2OGPTE calls, run in the host's H2OGPTE pool
+        def _query_llm():
+            if not session['chat_session_id']:
+                # No collection = pure LLM reasoning
+                session['chat_session_id'] = self.h2ogpte_client.create_chat_session(
+                    collection_id=None
+                )
+                logger.info('Routing chat session created: %s', session['chat_session_id'])
+            with connect_session(self.h2ogpte_client, session['chat_session_id']) as chat:
+                reply = chat.query(
+                    message=user_message,
+                    system_prompt=system_prompt,
+                    llm=host_config["llm"],
+                    llm_args=dict(
+                        temperature=host_config["temperature"],
+                        response_format='json_object',
+                        guided_json=schema,
+                    ),
+                    rag_config={"rag_type": "llm_only"},
+                    include_chat_history="off"
+                )
+            return reply.content
+
+        llm_response = await self.h2ogpte_executor.run(_query_llm)
+        logger.info('Host LLM response: %s', Payload(llm_response))
+        logger.debug('Routing connections: %s', get_session_pool(self.h2ogpte_client).stats())
+
+        try:
+            return json.loads(llm_response)
+        except json.JSONDecodeError:
+            return None
+
+    async def _query_routing_llm(
+        self, user_message: str, session: dict[str, Any]
+    ) -> dict[str, str] | None:
+        """Ask the H2OGPTE LLM for a routing decision.
+
+        Returns:
+            The parsed ``{agent_name, reasoning}`` decision, or None if the
+            LLM reply was not valid JSON.
         """
         # Build the system prompt with current agent roster and conversation history
         system_prompt = prompt.format(
             agents=self.agents,
-            conversation_history=self._build_routing_context(),
+            conversation_history=self._build_routing_context(session['turn_history']),
         )
 
-        # Define the strict schema for the router
-        agent_names = list(self.remote_agent_connections.keys()) + ["threat_hunt", "none"]
-        routing_schema = {
+        return await self._query_host_llm(
+            user_message, system_prompt, self.routing_schema, session
+        )
+
+    def _build_routing_schema(self) -> dict[str, Any]:
+        """Define the strict schema for the router over the current agents."""
+        agent_names = list(self.remote_agent_connections.keys()) + [
+            "threat_hunt", "workflow", "none"
+        ]
+        return {
             "type": "object",
             "properties": {
                 "reasoning": {
@@ -216,110 +447,438 @@ class RoutingAgent:
             "required": ["reasoning", "agent_name"]
         }
 
-        # Call H2OGPTE LLM for routing decision (sync call wrapped in thread)
-        def _query_llm():
-            with self.h2ogpte_client.connect(self.chat_session_id) as session:
-                reply = session.query(
-                    message=user_message,
-                    system_prompt=system_prompt,
-                    llm=host_config["llm"],
-                    llm_args=dict(
-                        temperature=host_config["temperature"],
-                        response_format='json_object',
-                        guided_json=routing_schema,
-                    ),
-                    rag_config={"rag_type": "llm_only"},
-                    include_chat_history="off"
+    async def _plan_workflow(
+        self, user_message: str, session: dict[str, Any]
+    ) -> list[dict[str, Any]] | None:
+        """Ask the H2OGPTE LLM to split a multi-part message into a step graph.
+
+        Returns:
+            Validated steps in dependency order, or None if the plan was not
+            valid JSON or not a valid graph.
+        """
+        system_prompt = planner_prompt.format(
+            agents=self.agents,
+            conversation_history=self._build_routing_context(session['turn_history']),
+        )
+        plan_schema = {
+            "type": "object",
+            "properties": {
+                "steps": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "string"},
+                            "agent_name": {
+                                "type": "string",
+                                "enum": list(self.remote_agent_connections.keys()),
+                            },
+                            "task": {"type": "string"},
+                            "depends_on": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                            },
+                        },
+                        "required": ["id", "agent_name", "task", "depends_on"],
+                    },
+                },
+            },
+            "required": ["steps"]
+        }
+        plan = await self._query_host_llm(user_message, system_prompt, plan_schema, session)
+        if not plan or not plan.get('steps'):
+            return None
+        try:
+            return validate_workflow(plan['steps'])
+        except ValueError as e:
+            logger.warning('Rejected workflow plan: %s', e)
+            return None
+
+    def _start_speculation(
+        self, user_message: str, turn_history: list[dict[str, str]]
+    ) -> dict[str, Any] | None:
+        """Dispatch to the predicted read-only agent while the LLM decides.
+
+        Only inventory/query agents are ever speculated on, so a discarded
+        guess has no side effects beyond wasted agent time.
+        """
+        if not host_config.get('speculative_dispatch', True):
+            return None
+        if matches_hints(user_message, THREAT_HUNT_HINTS):
+            return None
+        agent_name = self._predict_agent(user_message)
+        if agent_name is None:
+            return None
+
+        enriched_message = self._build_enriched_message(
+            user_message, turn_history, agent_name
+        )
+        self.speculation_stats['started'] += 1
+        logger.info('Speculatively dispatching to %s', agent_name)
+        relay = ProgressRelay()
+        return {
+            'agent_name': agent_name,
+            'started': time.monotonic(),
+            'relay': relay,
+            'task': asyncio.create_task(
+                self.send_message(agent_name, enriched_message, on_progress=relay)
+            ),
+        }
+
+    def _resolve_speculation(
+        self, speculation: dict[str, Any], decision: dict[str, Any] | None
+    ) -> asyncio.Task | None:
+        """Keep the speculative call if the LLM agreed, otherwise cancel it.
+
+        Returns:
+            The in-flight send_message task to await, or None if discarded.
+        """
+        task = speculation['task']
+        elapsed = time.monotonic() - speculation['started']
+        stats = self.speculation_stats
+        if decision is not None and decision.get('agent_name') == speculation['agent_name']:
+            stats['committed'] += 1
+            stats['saved_seconds'] += elapsed
+            outcome = 'committed'
+        else:
+            stats['discarded'] += 1
+            stats['wasted_seconds'] += elapsed
+            outcome = 'discarded'
+            if task.done():
+                if not task.cancelled():
+                    task.exception()  # Mark any failure as retrieved.
+            else:
+                task.cancel()
+            task = None
+
+        resolved = stats['committed'] + stats['discarded']
+        logger.info(
+            'Speculation to %s %s (accuracy=%.0f%%, stats=%s)',
+            speculation['agent_name'],
+            outcome,
+            100 * stats['committed'] / resolved,
+            stats,
+        )
+        return task
+
+    async def _decide_route(
+        self, user_message: str, session: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Pick a target agent, trying the local fast path before the LLM.
+
+        When the LLM has to be asked, a likely read-only target may be
+        dispatched speculatively in parallel; if the LLM agrees, the in-flight
+        call (``task``) and its buffered progress (``relay``) are returned
+        under ``speculation``.
+
+        Returns:
+            A dict with ``agent_name``, ``reasoning`` and ``source`` (one of
+            ``'fast_path'``, ``'cache'`` or ``'llm'``), or None if no decision
+            could be parsed.
+        """
+        decision = None
+        source = 'llm'
+        if self.intent_classifier is not None:
+            decision = self.intent_classifier.classify(user_message)
+            if decision is not None:
+                source = 'fast_path'
+        if decision is None:
+            routing_context = self._build_routing_context(session['turn_history'])
+            decision = self.routing_cache.get(user_message, routing_context)
+            if decision is not None:
+                source = 'cache'
+            else:
+                speculation = self._start_speculation(
+                    user_message, session['turn_history']
                 )
-            return reply.content
+                try:
+                    decision = await self._query_routing_llm(user_message, session)
+                except BaseException:
+                    if speculation is not None:
+                        self._resolve_speculation(speculation, None)
+                    raise
+                if (
+                    speculation is not None
+                    and self._resolve_speculation(speculation, decision) is not None
+                ):
+                    decision['speculation'] = speculation
+                if decision is None:
+                    return None
+                valid_names = set(self.remote_agent_connections) | {
+                    'threat_hunt', 'workflow', 'none'
+                }
+                if decision.get('agent_name') in valid_names:
+                    self.routing_cache.put(user_message, routing_context, decision)
+
+        decision['source'] = source
+        self.route_stats[source] += 1
+        logger.info(
+            'Routing decision via %s: %s (route_stats=%s, cache=%s)',
+            source,
+            decision.get('agent_name'),
+            self.route_stats,
+            self.routing_cache.stats(),
+        )
+        return decision
+
+    async def route(
+        self,
+        user_message: str,
+        session_id: str = 'default',
+        on_progress: ProgressCallback | None = None,
+    ) -> str:
+        """Route a user message to the appropriate remote agent.
 
-        llm_response = await asyncio.to_thread(_query_llm)
-        print(f'Routing LLM response: {llm_response}')
+        Obvious requests are routed by the local intent classifier; anything
+        ambiguous falls through to the H2OGPTE routing LLM.
 
-        # Parse the routing decision
+        Args:
+            user_message: The user's natural language message.
+            session_id: Browser session whose conversation context to use.
+            on_progress: Optional callback receiving the in-progress reply as
+                sub-agents stream it.
+
+        Returns:
+            The response text from the remote agent, or a direct response.
+        """
+        if correlation_id.get() == '-':
+            bind_correlation_id()
+        # Roster changes are delivered to whichever loop serves requests.
+        self.registry.bind_loop(asyncio.get_running_loop())
+        session = await self.sessions.get(session_id)
         try:
-            decision = json.loads(llm_response)
-        except json.JSONDecodeError:
-            return await self._fallback_delegate(user_message)
+            return await self._route_in_session(user_message, session, on_progress)
+        finally:
+            await self.sessions.save(session)
+
+    async def route_stream(
+        self, user_message: str, session_id: str = 'default'
+    ) -> AsyncIterator[str]:
+        """Route a message, yielding the in-progress reply as it streams.
+
+        The last value yielded is the final response. Intermediate updates
+        that arrive faster than they are consumed are coalesced to the latest.
+        Each call gets a new correlation ID, passed on to remote agents.
+        """
+        bind_correlation_id()
+        updates: asyncio.Queue[str] = asyncio.Queue()
+        started = time.monotonic()
+        routing = asyncio.create_task(
+            self.route(user_message, session_id=session_id, on_progress=updates.put_nowait)
+        )
+        first_update = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(updates.get())
+                await asyncio.wait({getter, routing}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    break
+                latest = getter.result()
+                while not updates.empty():
+                    latest = updates.get_nowait()
+                if first_update is None:
+                    first_update = time.monotonic() - started
+                    logger.info('First streamed update after %.2fs', first_update)
+                yield latest
+            result = await routing
+            logger.info('Route completed after %.2fs', time.monotonic() - started)
+            yield result
+        finally:
+            if not routing.done():
+                # The client went away (stop button, refresh, closed tab):
+                # cancel the route, which cancels its remote agent tasks.
+                logger.info(
+                    'Route cancelled by the client after %.2fs', time.monotonic() - started
+                )
+                routing.cancel()
+
+    async def _route_in_session(
+        self,
+        user_message: str,
+        session: dict[str, Any],
+        on_progress: ProgressCallback | None = None,
+    ) -> str:
+        """Route a message using (and updating) one session's state."""
+        turn_history = session['turn_history']
+        resume = _RESUME_RE.match(user_message)
+        if resume:
+            return await self._resume_threat_hunt(resume.group(1), turn_history, on_progress)
+
+        decision = await self._decide_route(user_message, session)
+        if decision is None:
+            return await self._fallback_delegate(user_message, turn_history, on_progress)
 
         agent_name = decision.get('agent_name')
         reasoning = decision.get('reasoning', '')
 
         # Threat hunting workflow
         if agent_name == 'threat_hunt':
-            result = await execute_threat_hunt(self, user_message)
-            self.turn_history.append({
+            hunt_id = new_hunt_id()
+            result = await execute_threat_hunt(
+                self, user_message, on_progress, hunt_id=hunt_id
+            )
+            turn_history.append({
                 'user': user_message,
                 'agent': 'threat_hunt_workflow',
                 'response': result[:500],
+                'route_source': decision['source'],
+                'hunt_id': hunt_id,
+            })
+            return result
+
+        # Multi-part request: plan a step graph and run independent steps in parallel
+        if agent_name == 'workflow':
+            steps = await self._plan_workflow(user_message, session)
+            if steps is None:
+                return await self._fallback_delegate(user_message, turn_history, on_progress)
+            try:
+                result = await self._execute_workflow(
+                    steps, user_message=user_message, on_progress=on_progress
+                )
+            except ValueError as e:
+                return f'Error: {e}'
+            turn_history.append({
+                'user': user_message,
+                'agent': 'planned_workflow',
+                'response': result[:500],
+                'route_source': decision['source'],
             })
             return result
 
         # Delegate to the named agent with enriched context
-        enriched_message = self._build_enriched_message(user_message)
         if agent_name in self.remote_agent_connections:
+            enriched_message = self._build_enriched_message(
+                user_message, turn_history, agent_name
+            )
             try:
                 if self._is_jira_agent(agent_name):
                     return await self._delegate_to_jira_with_upstream(
-                        user_message=user_message, jira_task=enriched_message
+                        user_message=user_message,
+                        jira_task=enriched_message,
+                        turn_history=turn_history,
+                        on_progress=on_progress,
+                    )
+                speculation = decision.get('speculation')
+                if speculation is not None:
+                    speculation['relay'].attach(on_progress)
+                    result = await speculation['task']
+                else:
+                    result = await self.send_message(
+                        agent_name, enriched_message, on_progress=on_progress
                     )
-                result = await self.send_message(agent_name, enriched_message)
                 if result is None:
                     return f"Error: No response received from agent '{agent_name}'."
-                self.turn_history.append({
+                turn_history.append({
                     'user': user_message,
                     'agent': agent_name,
                     'response': result[:500],
+                    'route_source': decision['source'],
                 })
                 return result
             except ValueError as e:
                 return f'Error: {e}'
+            except A2AClientTimeoutError as e:
+                return f'Error: {e.message}'
         else:
             # LLM returned JSON but didn't follow the format —
             # delegate the original user message to the first available agent.
-            return await self._fallback_delegate(user_message)
+            return await self._fallback_delegate(user_message, turn_history, on_progress)
+
+    async def _resume_threat_hunt(
+        self,
+        hunt_id: str | None,
+        turn_history: list[dict[str, str]],
+        on_progress: ProgressCallback | None = None,
+    ) -> str:
+        """Resume a checkpointed threat hunt from its last completed phase.
+
+        Without an explicit ID, the most recent hunt in this session is resumed.
+        """
+        if hunt_id is None:
+            hunt_id = next(
+                (turn['hunt_id'] for turn in reversed(turn_history) if turn.get('hunt_id')),
+                None,
+            )
+            if hunt_id is None:
+                return 'Error: There is no threat hunt to resume in this session.'
+        state = await self.hunt_store.load(hunt_id)
+        if state is None:
+            return f"Error: No checkpointed threat hunt with ID '{hunt_id}'."
+
+        result = await execute_threat_hunt(
+            self, state['hypothesis'], on_progress, hunt_id=hunt_id
+        )
+        turn_history.append({
+            'user': state['hypothesis'],
+            'agent': 'threat_hunt_workflow',
+            'response': result[:500],
+            'route_source': 'resume',
+            'hunt_id': hunt_id,
+        })
+        return result
 
     def _is_jira_agent(self, agent_name: str) -> bool:
         return 'jira' in agent_name.lower()
 
     def _is_explorer_or_analyst_agent(self, agent_name: str) -> bool:
         lowered = agent_name.lower()
-        return 'explorer' in lowered or 'analyst' in lowered
+        return any(
+            fragment in lowered
+            for fragments in _UPSTREAM_ROLES.values()
+            for fragment in fragments
+        )
 
-    def _pick_upstream_agent(self, user_message: str) -> str | None:
-        """Pick explorer/analyst as Jira upstream based on context."""
-        if self.active_agent and self._is_explorer_or_analyst_agent(self.active_agent):
-            return self.active_agent
+    def _find_upstream_agent(self, role: str) -> str | None:
+        """Return the connected agent for an upstream role ('inventory' or 'query')."""
+        return next(
+            (
+                name
+                for name in self.remote_agent_connections
+                if any(fragment in name.lower() for fragment in _UPSTREAM_ROLES[role])
+            ),
+            None,
+        )
 
-        lowered_message = user_message.lower()
-        explorer_hints = ['index', 'indexes', 'metadata', 'source', 'sourcetype', 'host', 'kv']
-        analyst_hints = ['spl', 'query', 'search', 'correlat', 'analy', 'result']
+    def _predict_agent(self, user_message: str) -> str | None:
+        """Guess a read-only target from the upstream hint lists.
 
-        if any(token in lowered_message for token in explorer_hints):
-            return next(
-                (name for name in self.remote_agent_connections if 'explorer' in name.lower()),
-                None,
-            )
-        if any(token in lowered_message for token in analyst_hints):
-            return next(
-                (name for name in self.remote_agent_connections if 'analyst' in name.lower()),
-                None,
-            )
+        Unlike _pick_upstream_agent this never falls back to a default: it
+        returns None unless exactly one hint list matches.
+        """
+        inventory = matches_hints(user_message, INVENTORY_HINTS)
+        query = matches_hints(user_message, QUERY_HINTS)
+        if inventory == query:
+            return None
+        return self._find_upstream_agent('inventory' if inventory else 'query')
+
+    def _pick_upstream_agent(
+        self,
+        user_message: str,
+        turn_history: list[dict[str, str]] | None = None,
+    ) -> str | None:
+        """Pick explorer/analyst as Jira upstream based on context."""
+        active_agent = turn_history[-1]['agent'] if turn_history else None
+        if active_agent and self._is_explorer_or_analyst_agent(active_agent):
+            return active_agent
+
+        if matches_hints(user_message, INVENTORY_HINTS):
+            return self._find_upstream_agent('inventory')
+        if matches_hints(user_message, QUERY_HINTS):
+            return self._find_upstream_agent('query')
 
         # Default to analyst for evidence generation when intent is generic.
-        return next(
-            (name for name in self.remote_agent_connections if 'analyst' in name.lower()),
-            None,
-        ) or next(
-            (name for name in self.remote_agent_connections if 'explorer' in name.lower()),
-            None,
-        )
+        return self._find_upstream_agent('query') or self._find_upstream_agent('inventory')
 
     async def _delegate_to_jira_with_upstream(
-        self, user_message: str, jira_task: str
+        self,
+        user_message: str,
+        jira_task: str,
+        turn_history: list[dict[str, str]] | None = None,
+        on_progress: ProgressCallback | None = None,
     ) -> str:
         """Ensure Jira actions are always grounded in explorer/analyst output."""
-        upstream_agent = self._pick_upstream_agent(user_message)
+        upstream_agent = self._pick_upstream_agent(user_message, turn_history)
         jira_agent = next(
             (name for name in self.remote_agent_connections if self._is_jira_agent(name)),
             None,
@@ -333,85 +892,133 @@ class RoutingAgent:
             f"User request:\n{user_message}"
         )
         steps = [
-            {'agent_name': upstream_agent, 'task': upstream_task},
-            {'agent_name': jira_agent, 'task': jira_task},
+            {'id': 'upstream', 'agent_name': upstream_agent, 'task': upstream_task},
+            {
+                'id': 'jira',
+                'agent_name': jira_agent,
+                'task': jira_task,
+                'depends_on': ['upstream'],
+            },
         ]
-        return await self._execute_workflow(steps, user_message=user_message)
+        return await self._execute_workflow(
+            steps, user_message=user_message, on_progress=on_progress
+        )
 
     async def _execute_workflow(
-        self, steps: list[dict[str, Any]], user_message: str | None = None
+        self,
+        steps: list[dict[str, Any]],
+        user_message: str | None = None,
+        on_progress: ProgressCallback | None = None,
     ) -> str:
-        """Execute a sequence of delegations and pass context across steps."""
+        """Execute a workflow graph, passing outputs along declared edges.
+
+        Steps whose dependencies are met run concurrently, up to
+        ``workflow_max_parallel`` at a time; see ``run_workflow``.
+
+        Returns:
+            The output of the final step, the outputs of all final steps
+            under headings when the graph has several, or an error message.
+        """
         if not steps:
             return 'Error: Workflow must include at least one step.'
+        try:
+            steps = self._ensure_jira_upstream(validate_workflow(steps), user_message)
+        except ValueError as e:
+            return f'Error: {e}'
 
-        # Guardrail: if Jira appears, ensure explorer/analyst runs before it.
-        jira_index = next(
-            (
-                i
-                for i, step in enumerate(steps)
-                if self._is_jira_agent(str(step.get('agent_name', '')))
-            ),
-            None,
+        async def send(agent_name, task, step_progress):
+            # A timed-out step fails like one without a response: its
+            # dependents are skipped while independent steps carry on.
+            try:
+                return await self.send_message(
+                    agent_name, task, on_progress=step_progress
+                )
+            except A2AClientTimeoutError as e:
+                logger.warning('Workflow step timed out: %s', e.message)
+                return None
+
+        outputs = await run_workflow(
+            steps,
+            send,
+            max_parallel=host_config.get('workflow_max_parallel', 3),
+            on_progress=on_progress,
+            context_budget=self.context_budget,
         )
-        if jira_index == 0:
-            upstream_agent = self._pick_upstream_agent(user_message or '')
-            if upstream_agent:
-                upstream_task = (
-                    "Generate validated findings/evidence for Jira action from the "
-                    "following user request.\n\n"
-                    f"User request:\n{user_message or ''}"
+        for step in steps:
+            if outputs[step['id']] is None:
+                return (
+                    f"Error: No response received from agent '{step['agent_name']}' "
+                    'in workflow.'
                 )
-                steps = [{'agent_name': upstream_agent, 'task': upstream_task}] + steps
-
-        step_results: list[dict[str, str]] = []
-
-        for index, step in enumerate(steps, start=1):
-            agent_name = step.get('agent_name')
-            task = step.get('task')
-
-            if not agent_name or not task:
-                return 'Error: Workflow step is missing agent_name or task.'
 
-            if step_results:
-                previous_outputs = '\n\n'.join(
-                    [
-                        f"Step {result['step']} ({result['agent_name']}) output:\n{result['output']}"
-                        for result in step_results
-                    ]
-                )
-                task = (
-                    f"{task}\n\n"
-                    "Use the following verified outputs from previous steps as context:\n"
-                    f"{previous_outputs}"
-                )
+        results = sink_steps(steps)
+        if len(results) == 1:
+            return outputs[results[0]['id']]
+        return '\n\n'.join(
+            f"### {step['agent_name']} ({step['id']})\n{outputs[step['id']]}"
+            for step in results
+        )
 
-            result = await self.send_message(agent_name, task)
-            if result is None:
-                return f"Error: No response received from agent '{agent_name}' in workflow."
+    def _ensure_jira_upstream(
+        self, steps: list[dict[str, Any]], user_message: str | None
+    ) -> list[dict[str, Any]]:
+        """Guardrail: every Jira step must depend on an explorer/analyst step.
 
-            step_results.append(
-                {
-                    'step': str(index),
-                    'agent_name': agent_name,
-                    'output': result,
-                }
+        Jira steps without one get a shared upstream evidence step added as a
+        dependency.
+        """
+        agents = {step['id']: step['agent_name'] for step in steps}
+        ungrounded = [
+            step
+            for step in steps
+            if self._is_jira_agent(step['agent_name'])
+            and not any(
+                self._is_explorer_or_analyst_agent(agents[dep])
+                for dep in step['depends_on']
             )
+        ]
+        if not ungrounded:
+            return steps
+        upstream_agent = self._pick_upstream_agent(user_message or '')
+        if not upstream_agent:
+            return steps
+
+        upstream_id = 'upstream'
+        while upstream_id in agents:
+            upstream_id = f'_{upstream_id}'
+        upstream_task = (
+            "Generate validated findings/evidence for Jira action from the "
+            "following user request.\n\n"
+            f"User request:\n{user_message or ''}"
+        )
+        for step in ungrounded:
+            step['depends_on'].append(upstream_id)
+        return validate_workflow(
+            [{'id': upstream_id, 'agent_name': upstream_agent, 'task': upstream_task}]
+            + steps
+        )
 
-        return step_results[-1]['output']
-
-    async def _fallback_delegate(self, user_message: str) -> str:
+    async def _fallback_delegate(
+        self,
+        user_message: str,
+        turn_history: list[dict[str, str]],
+        on_progress: ProgressCallback | None = None,
+    ) -> str:
         """Delegate to the first available agent when LLM routing fails."""
         if not self.remote_agent_connections:
             return 'Error: No remote agents available.'
         agent_name = next(iter(self.remote_agent_connections))
-        print(f'Fallback: delegating to {agent_name}')
-        enriched_message = self._build_enriched_message(user_message)
+        logger.info('Fallback: delegating to %s', agent_name)
+        enriched_message = self._build_enriched_message(
+            user_message, turn_history, agent_name
+        )
         try:
-            result = await self.send_message(agent_name, enriched_message)
+            result = await self.send_message(
+                agent_name, enriched_message, on_progress=on_progress
+            )
             if result is None:
                 return f"Error: No response received from agent '{agent_name}'."
-            self.turn_history.append({
+            turn_history.append({
                 'user': user_message,
                 'agent': agent_name,
                 'response': result[:500],
@@ -419,6 +1026,8 @@ class RoutingAgent:
             return result
         except ValueError as e:
             return f'Error: {e}'
+        except A2AClientTimeoutError as e:
+            return f'Error: {e.message}'
 
     def _extract_response_text(self, task_result: Task) -> str:
         """Extract readable text from an A2A Task result."""
@@ -427,17 +1036,17 @@ class RoutingAgent:
             if parts:
                 texts = []
                 for part in parts:
-                    if part.type == 'text':
-                        texts.append(part.text)
+                    if part.root.kind == 'text':
+                        texts.append(part.root.text)
                     else:
-                        texts.append(f'[{part.type} content]')
+                        texts.append(f'[{part.root.kind} content]')
                 return _strip_thinking('\n'.join(texts))
         if task_result.artifacts:
             texts = []
             for artifact in task_result.artifacts:
                 for part in artifact.parts:
-                    if part.type == 'text':
-                        texts.append(part.text)
+                    if part.root.kind == 'text':
+                        texts.append(part.root.text)
             if texts:
                 return _strip_thinking('\n'.join(texts))
         return 'Agent completed task but returned no text content.'
@@ -454,24 +1063,181 @@ class RoutingAgent:
             return _strip_thinking('\n'.join(texts))
         return 'Agent returned an empty message.'
 
-    async def send_message(self, agent_name: str, task: str) -> str | None:
+    async def send_message(
+        self,
+        agent_name: str,
+        task: str,
+        on_progress: ProgressCallback | None = None,
+        call_class: str = INTERACTIVE,
+    ) -> str | None:
         """Sends a task to a remote agent via A2A protocol.
 
+        Identical concurrent tasks for the same agent (compared after
+        normalizing case and whitespace) share one in-flight call: later
+        callers join it, receive its streamed progress and get the same
+        result. The shared call is only cancelled once every caller waiting
+        on it has gone. Jira tasks create tickets, so they are never shared.
+
+        The wait is bounded by the agent's adaptive deadline for the call
+        class (see ``AdaptiveTimeouts``). For read-only agents, a hedged copy of the task
+        is sent once the agent's p95 latency has passed without a reply; it
+        goes to the least busy replica (another replica when there are
+        several, otherwise a fresh task and chat session on the same server)
+        and whichever attempt answers first wins. Jira is never hedged.
+
         Args:
             agent_name: The name of the agent to send the task to.
             task: The task description to send.
+            on_progress: Optional callback for the in-progress reply. When
+                given and the agent card declares streaming, the task is sent
+                with ``message/stream`` instead of ``message/send``.
+            call_class: ``INTERACTIVE`` or ``HUNT``; selects the latency
+                statistics used for the deadline and hedge delay.
 
         Returns:
             The response text, or None on failure.
+
+        Raises:
+            A2AClientTimeoutError: If the agent does not answer within its
+                deadline.
         """
         if agent_name not in self.remote_agent_connections:
             raise ValueError(f'Agent {agent_name} not found')
 
-        client = self.remote_agent_connections[agent_name]
-
-        if not client:
+        if not self.remote_agent_connections[agent_name]:
             raise ValueError(f'Client not available for {agent_name}')
 
+        if self._is_jira_agent(agent_name):
+            return await self._send_with_deadline(agent_name, task, on_progress, call_class)
+
+        key = (agent_name, normalize_message(task))
+        flight = self._in_flight.get(key)
+        if flight is None:
+            progress = ProgressFanout()
+            call = asyncio.ensure_future(
+                self._send_with_deadline(agent_name, task, progress, call_class)
+            )
+            flight = {'call': call, 'progress': progress, 'waiters': 0}
+            self._in_flight[key] = flight
+            call.add_done_callback(lambda _, flight=flight: self._drop_flight(key, flight))
+            self.coalesce_stats['calls'] += 1
+        else:
+            self.coalesce_stats['coalesced'] += 1
+            logger.info(
+                'Joined in-flight %s call for an identical task (stats=%s)',
+                agent_name,
+                self.coalesce_stats,
+            )
+
+        flight['progress'].subscribe(on_progress)
+        flight['waiters'] += 1
+        try:
+            # Shielded so one caller going away does not cancel the others.
+            return await asyncio.shield(flight['call'])
+        finally:
+            flight['progress'].unsubscribe(on_progress)
+            flight['waiters'] -= 1
+            if flight['waiters'] == 0 and not flight['call'].done():
+                # Unlisted right away: a caller arriving before the
+                # cancellation lands must start a new call, not join this one.
+                self._drop_flight(key, flight)
+                flight['call'].cancel()
+
+    def _drop_flight(self, key: tuple[str, str], flight: dict[str, Any]) -> None:
+        """Forget ``flight`` unless a newer call has taken its key."""
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+
+    async def _send_with_deadline(
+        self,
+        agent_name: str,
+        task: str,
+        on_progress: ProgressCallback | None,
+        call_class: str = INTERACTIVE,
+    ) -> str | None:
+        """Send with the agent's adaptive deadline and, if eligible, hedging."""
+        deadline = self.timeouts.deadline(agent_name, call_class)
+        hedge_after = (
+            None
+            if self._is_jira_agent(agent_name)
+            else self.timeouts.hedge_delay(agent_name, call_class)
+        )
+        try:
+            result = await asyncio.wait_for(
+                self._send_hedged(agent_name, task, on_progress, hedge_after, call_class),
+                deadline,
+            )
+        except TimeoutError:
+            # Count the timeout so a persistently slower agent raises its deadline.
+            self.timeouts.record(agent_name, deadline, call_class)
+            raise A2AClientTimeoutError(
+                f'{agent_name} did not respond within {deadline:.0f}s.'
+            ) from None
+        logger.info(
+            'Latency for %s: %s', agent_name, self.timeouts.stats(agent_name, call_class)
+        )
+        return result
+
+    async def _send_hedged(
+        self,
+        agent_name: str,
+        task: str,
+        on_progress: ProgressCallback | None,
+        hedge_after: float | None,
+        call_class: str = INTERACTIVE,
+    ) -> str | None:
+        """Send ``task``, plus a hedged copy if no reply came in ``hedge_after`` s.
+
+        The hedged copy is sent without ``on_progress`` so the user keeps
+        seeing only the first attempt's stream. The first attempt to return
+        a response wins and the other is cancelled.
+        """
+        primary = asyncio.create_task(
+            self._send_once(agent_name, task, on_progress, call_class)
+        )
+        if hedge_after is None:
+            return await primary
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+            if done:
+                return primary.result()
+            logger.info(
+                '%s exceeded p95 (%.1fs); sending hedged request.', agent_name, hedge_after
+            )
+            self.hedge_stats['sent'] += 1
+            hedge = asyncio.create_task(self._send_once(agent_name, task, None, call_class))
+            pending = {primary, hedge}
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for attempt in done:
+                        if attempt.exception() is None and attempt.result() is not None:
+                            if attempt is hedge:
+                                self.hedge_stats['won'] += 1
+                            logger.info('Hedging stats: %s', self.hedge_stats)
+                            return attempt.result()
+                # Neither attempt produced a response: report the original's outcome.
+                return primary.result()
+            finally:
+                hedge.cancel()
+        finally:
+            primary.cancel()
+
+    async def _send_once(
+        self,
+        agent_name: str,
+        task: str,
+        on_progress: ProgressCallback | None,
+        call_class: str = INTERACTIVE,
+    ) -> str | None:
+        """Send one A2A request for ``task`` and return the response text.
+
+        The request's latency is recorded for adaptive timeouts unless the
+        agent answered from its response cache.
+        """
+        client = self.remote_agent_connections[agent_name]
         message_id = str(uuid.uuid4())
 
         payload = {
@@ -479,34 +1245,151 @@ class RoutingAgent:
                 'role': 'user',
                 'parts': [{'type': 'text', 'text': task}],
                 'messageId': message_id,
+                'metadata': {CORRELATION_KEY: correlation_id.get()},
             },
         }
 
-        message_request = SendMessageRequest(
-            id=message_id, params=MessageSendParams.model_validate(payload)
-        )
+        started = time.monotonic()
+        # Streaming makes the task ID known as soon as the agent accepts the
+        # task, so the request can be cancelled remotely if this one is.
+        if client.card.capabilities.streaming:
+            result, cached = await self._send_message_streaming(
+                agent_name,
+                SendStreamingMessageRequest(
+                    id=message_id, params=MessageSendParams.model_validate(payload)
+                ),
+                on_progress,
+            )
+        else:
+            result, cached = await self._send_message_blocking(
+                agent_name,
+                SendMessageRequest(
+                    id=message_id, params=MessageSendParams.model_validate(payload)
+                ),
+            )
+        if result is not None and not cached:
+            self.timeouts.record(agent_name, time.monotonic() - started, call_class)
+        return result
+
+    async def _send_message_blocking(
+        self, agent_name: str, message_request: SendMessageRequest
+    ) -> tuple[str | None, bool]:
+        """Send a task with ``message/send``.
+
+        Returns:
+            The response text (None on failure) and whether it was served
+            from the agent's response cache.
+        """
+        client = self.remote_agent_connections[agent_name]
         send_response: SendMessageResponse = await client.send_message(
             message_request=message_request
         )
-        print(
-            'send_response',
-            send_response.model_dump_json(exclude_none=True, indent=2),
-        )
+        logger.debug('send_response %s', Payload(send_response))
+        logger.debug('Replicas for %s: %s', agent_name, client.stats())
 
         if not isinstance(send_response.root, SendMessageSuccessResponse):
-            print('received non-success response. Aborting get task')
-            return None
+            logger.warning(
+                'Non-success response from %s: %s', agent_name, Payload(send_response)
+            )
+            return None, False
 
         result = send_response.root.result
 
         # The server may return a Task or a Message depending on the executor.
         if isinstance(result, Task):
-            return self._extract_response_text(result)
+            return self._extract_response_text(result), _is_cached(result.status.message)
         elif isinstance(result, Message):
-            return self._extract_message_text(result)
+            return self._extract_message_text(result), _is_cached(result)
         else:
-            print(f'unexpected result type: {type(result)}')
-            return None
+            logger.warning('Unexpected result type: %s', type(result))
+            return None, False
+
+    async def _send_message_streaming(
+        self,
+        agent_name: str,
+        request: SendStreamingMessageRequest,
+        on_progress: ProgressCallback | None,
+    ) -> tuple[str | None, bool]:
+        """Stream a task to a remote agent, reporting partial output.
+
+        ``working`` status updates tagged ``{'stream': 'delta'}`` carry answer
+        tokens and ``{'stream': 'status'}`` carry step descriptions; the
+        terminal status update carries the full response.
+
+        Returns:
+            The response text (None on failure) and whether it was served
+            from the agent's response cache.
+        """
+        client = self.remote_agent_connections[agent_name]
+        started = time.monotonic()
+        first_update = None
+        updates = 0
+        partial = ''
+        status = ''
+        result = None
+        cached = False
+        async for response in client.send_message_streaming(request):
+            if not isinstance(response.root, SendStreamingMessageSuccessResponse):
+                logger.warning(
+                    'Non-success streaming response from %s: %s',
+                    agent_name,
+                    Payload(response),
+                )
+                return None, False
+            event = response.root.result
+            if isinstance(event, TaskStatusUpdateEvent):
+                message = event.status.message
+                if event.final:
+                    if event.status.state != TaskState.completed:
+                        logger.warning(
+                            '%s task ended in state %s', agent_name, event.status.state
+                        )
+                        return None, False
+                    cached = _is_cached(message)
+                    result = (
+                        self._extract_message_text(message)
+                        if message
+                        else _strip_thinking(partial)
+                    )
+                    continue
+                kind = (event.metadata or {}).get('stream')
+                text = ''.join(
+                    part.root.text
+                    for part in (message.parts if message else [])
+                    if part.root.kind == 'text'
+                )
+                if kind == 'delta':
+                    partial += text
+                    # Keep showing the step until visible answer text arrives.
+                    if render_progress(_strip_thinking(partial)):
+                        status = ''
+                elif kind == 'status':
+                    status = text
+                else:
+                    continue
+                updates += 1
+                if first_update is None:
+                    first_update = time.monotonic() - started
+                if on_progress is not None:
+                    on_progress(render_progress(_strip_thinking(partial), status))
+            elif isinstance(event, Task):
+                if event.status.state == TaskState.completed:
+                    result = self._extract_response_text(event)
+                    cached = _is_cached(event.status.message)
+            elif isinstance(event, Message):
+                result = self._extract_message_text(event)
+                cached = _is_cached(event)
+
+        first = f'{first_update:.2f}s' if first_update is not None else 'n/a'
+        logger.info(
+            'Streamed %d update(s) from %s: first after %s, done after %.2fs, replicas=%s',
+            updates,
+            agent_name,
+            first,
+            time.monotonic() - started,
+            client.stats(),
+        )
+        return result, cached
 
 
 def get_routing_agent_sync() -> RoutingAgent:
@@ -514,19 +1397,16 @@ def get_routing_agent_sync() -> RoutingAgent:
 
     async def _async_main() -> RoutingAgent:
         return await RoutingAgent.create(
-            remote_agent_addresses=[
-                os.getenv('SPLUNK_EXPLORER_AGENT_URL', 'http://localhost:8080'),
-                os.getenv('SPLUNK_ANALYST_AGENT_URL', 'http://localhost:8082'),
-                os.getenv('JIRA_TICKET_AGENT_URL', 'http://localhost:8084'),
-            ]
+            remote_agent_addresses=default_agent_addresses()
         )
 
     try:
         return asyncio.run(_async_main())
     except RuntimeError as e:
         if 'asyncio.run() cannot be called from a running event loop' in str(e):
-            print(
-                f'Warning: Could not initialize RoutingAgent with asyncio.run(): {e}. '
-                'Consider initializing RoutingAgent within an async function.'
+            logger.warning(
+                'Could not initialize RoutingAgent with asyncio.run(): %s. '
+                'Consider initializing RoutingAgent within an async function.',
+                e,
             )
         raise
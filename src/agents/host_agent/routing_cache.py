@@ -0,0 +1,89 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return _WHITESPACE_RE.sub(' ', message.lower()).strip().rstrip('?!.')
+
+
+class RoutingCache:
+    """LRU cache of routing decisions with a per-entry TTL.
+
+    Entries are keyed on the normalized user message plus a hash of the
+    routing context, so the same question asked after different prior turns
+    is a miss. Only ``agent_name`` and ``reasoning`` are stored.
+    """
+
+    def __init__(self, ttl: float = 600, max_entries: int = 256, enabled: bool = True):
+        """
+        Args:
+            ttl: Seconds a decision stays valid.
+            max_entries: Maximum number of decisions kept before the least
+                recently used one is evicted.
+            enabled: Whether lookups and stores are active.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, dict[str, str]]] = OrderedDict()
+
+    @staticmethod
+    def make_key(user_message: str, routing_context: str) -> str:
+        context_hash = hashlib.sha256(routing_context.encode()).hexdigest()[:16]
+        return f'{normalize_message(user_message)}|{context_hash}'
+
+    def get(self, user_message: str, routing_context: str) -> dict[str, str] | None:
+        """Return a cached decision, or None on a miss or when disabled."""
+        if not self.enabled:
+            return None
+        key = self.make_key(user_message, routing_context)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def put(
+        self, user_message: str, routing_context: str, decision: dict[str, str]
+    ) -> None:
+        """Store the ``agent_name`` and ``reasoning`` of a decision."""
+        if not self.enabled:
+            return
+        key = self.make_key(user_message, routing_context)
+        value = {
+            'agent_name': decision.get('agent_name', ''),
+            'reasoning': decision.get('reasoning', ''),
+        }
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop serving and storing decisions and drop existing entries."""
+        self.enabled = False
+        self.clear()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
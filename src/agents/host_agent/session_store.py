@@ -0,0 +1,180 @@
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.core.sqlite import execute
+
+logger = logging.getLogger(__name__)
+
+
+def new_session_state(session_id: str) -> dict[str, Any]:
+    """Return the empty routing state for a browser session."""
+    return {
+        'session_id': session_id,
+        'chat_session_id': None,
+        'turn_history': [],
+        'last_active': time.time(),
+    }
+
+
+class SessionStore(ABC):
+    """Per-browser-session routing state with bounded history.
+
+    Each state is a dict holding the H2OGPTE routing ``chat_session_id``, the
+    ``turn_history`` used for routing context and enriched messages, and a
+    ``last_active`` timestamp. Sessions idle for longer than ``idle_timeout``
+    are evicted; ``turn_history`` is trimmed to the last ``max_turns`` turns.
+    The routing chat sessions of evicted states are passed to ``on_evict``
+    so they can be deleted on the H2OGPTE server.
+    """
+
+    # Minimum seconds between idle sweeps triggered from get()
+    SWEEP_INTERVAL = 60
+
+    def __init__(
+        self,
+        idle_timeout: float = 3600,
+        max_turns: int = 20,
+        on_evict: Callable[[list[str]], Awaitable[None]] | None = None,
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_turns = max_turns
+        self.on_evict = on_evict
+        self._last_sweep = 0.0
+
+    async def get(self, session_id: str) -> dict[str, Any]:
+        """Load the state for a session, creating it if unknown or expired."""
+        now = time.time()
+        if now - self._last_sweep >= self.SWEEP_INTERVAL:
+            self._last_sweep = now
+            evicted = await self.evict_idle()
+            if evicted:
+                logger.info('Evicted %d idle routing session(s).', len(evicted))
+                chat_session_ids = [
+                    state['chat_session_id'] for state in evicted if state['chat_session_id']
+                ]
+                if chat_session_ids and self.on_evict is not None:
+                    await self.on_evict(chat_session_ids)
+        state = await self._load(session_id)
+        if state is None:
+            state = new_session_state(session_id)
+        return state
+
+    async def save(self, state: dict[str, Any]) -> None:
+        """Trim history, refresh the activity timestamp and persist the state."""
+        state['turn_history'] = state['turn_history'][-self.max_turns:]
+        state['last_active'] = time.time()
+        await self._save(state)
+
+    @abstractmethod
+    async def _load(self, session_id: str) -> dict[str, Any] | None:
+        ...
+
+    @abstractmethod
+    async def _save(self, state: dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    async def evict_idle(self) -> list[dict[str, Any]]:
+        """Drop sessions idle longer than ``idle_timeout``; return their states."""
+        ...
+
+
+class InMemorySessionStore(SessionStore):
+    """Keeps session state in process memory. Not shared between hosts."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._states: dict[str, dict[str, Any]] = {}
+
+    async def _load(self, session_id: str) -> dict[str, Any] | None:
+        return self._states.get(session_id)
+
+    async def _save(self, state: dict[str, Any]) -> None:
+        self._states[state['session_id']] = state
+
+    async def evict_idle(self) -> list[dict[str, Any]]:
+        cutoff = time.time() - self.idle_timeout
+        expired = [sid for sid, s in self._states.items() if s['last_active'] < cutoff]
+        return [self._states.pop(session_id) for session_id in expired]
+
+
+class SQLiteSessionStore(SessionStore):
+    """Keeps session state in a SQLite file so several host processes can
+    serve the same user. Statements run in a worker thread."""
+
+    def __init__(self, db_path: str, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.db_path = db_path
+        execute(self.db_path, 'PRAGMA journal_mode=WAL')
+        execute(
+            self.db_path,
+            'CREATE TABLE IF NOT EXISTS routing_sessions ('
+            ' session_id TEXT PRIMARY KEY,'
+            ' state TEXT NOT NULL,'
+            ' last_active REAL NOT NULL)'
+        )
+
+    async def _load(self, session_id: str) -> dict[str, Any] | None:
+        rows, _ = await asyncio.to_thread(
+            execute,
+            self.db_path,
+            'SELECT state FROM routing_sessions WHERE session_id = ?',
+            (session_id,),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    async def _save(self, state: dict[str, Any]) -> None:
+        await asyncio.to_thread(
+            execute,
+            self.db_path,
+            'INSERT OR REPLACE INTO routing_sessions (session_id, state, last_active)'
+            ' VALUES (?, ?, ?)',
+            (state['session_id'], json.dumps(state), state['last_active']),
+        )
+
+    async def evict_idle(self) -> list[dict[str, Any]]:
+        cutoff = time.time() - self.idle_timeout
+        rows, _ = await asyncio.to_thread(
+            execute,
+            self.db_path,
+            'DELETE FROM routing_sessions WHERE last_active < ? RETURNING state',
+            (cutoff,),
+        )
+        return [json.loads(row[0]) for row in rows]
+
+
+def create_session_store(
+    config: dict[str, Any],
+    on_evict: Callable[[list[str]], Awaitable[None]] | None = None,
+) -> SessionStore:
+    """Build the session store selected by the host agent config.
+
+    Args:
+        config: The ``host`` section of agents.yaml. Reads ``session_backend``
+            (``"memory"`` or ``"sqlite"``), ``session_db_path``,
+            ``session_idle_timeout`` and ``session_max_turns``.
+        on_evict: Receives the routing chat session IDs of evicted sessions.
+
+    Raises:
+        ValueError: If the backend name is not recognised.
+    """
+    backend = config.get('session_backend', 'memory')
+    idle_timeout = config.get('session_idle_timeout', 3600)
+    max_turns = config.get('session_max_turns', 20)
+    options = {
+        'idle_timeout': idle_timeout,
+        'max_turns': max_turns,
+        'on_evict': on_evict,
+    }
+    if backend == 'memory':
+        return InMemorySessionStore(**options)
+    if backend == 'sqlite':
+        return SQLiteSessionStore(
+            config.get('session_db_path', 'routing_sessions.db'), **options
+        )
+    raise ValueError(f"Unknown session_backend '{backend}'")
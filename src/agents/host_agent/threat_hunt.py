@@ -1,13 +1,53 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import logging
+
+from typing import TYPE_CHECKING, Any
 
 from a2a.client.errors import A2AClientTimeoutError
+from src.core.config import get_agent_config
+from src.core.context_budget import fit_to_budget
 from src.core.prompt_loader import load_message
 
+from .hunt_store import new_hunt_id
+from .latency import HUNT
+from .progress import ProgressCallback, with_heading
+from .remote_agent_connection import AgentUnavailableError
+from .workflow import run_workflow
+
 if TYPE_CHECKING:
     from .routing_agent import RoutingAgent
 
+logger = logging.getLogger(__name__)
+
+# Phase 2 sub-investigations. Each runs in its own query agent session.
+INVESTIGATIONS = [
+    {
+        "id": "entities",
+        "title": "Anomalous Entities",
+        "focus": "Identify the anomalous entities (users, IPs, roles) — look for "
+        "unusual API call volumes, unexpected source IPs, or abnormal user behavior.",
+    },
+    {
+        "id": "privilege_escalation",
+        "title": "Privilege Escalation",
+        "focus": "Track privilege escalation (e.g., AssumeRole events, policy "
+        "changes, credential modifications).",
+    },
+    {
+        "id": "data_access",
+        "title": "Data Access",
+        "focus": "Track data access patterns (e.g., S3 operations, file downloads, "
+        "sensitive resource access).",
+    },
+    {
+        "id": "timeline",
+        "title": "Incident Timeline",
+        "focus": "Establish a chronological timeline of the suspicious activity, "
+        "with timestamps for each event.",
+    },
+]
+
 
 def _find_agent_by_type(
     remote_agent_connections: dict, agent_type: str
@@ -19,10 +59,11 @@ def _find_agent_by_type(
     raise ValueError(f"No agent found matching type '{agent_type}'")
 
 
-def _format_report(workflow_state: dict[str, str]) -> str:
+def _format_report(workflow_state: dict[str, Any]) -> str:
     """Assemble the complete threat hunt results as a markdown report."""
-    return (
+    report = (
         "# Threat Hunting Investigation Report\n\n"
+        f"**Hunt ID:** `{workflow_state['hunt_id']}`\n\n"
         f"## Hypothesis\n"
         f"{workflow_state['hypothesis']}\n\n"
         f"## Phase 1: Discovery & Reconnaissance\n"
@@ -32,82 +73,256 @@ def _format_report(workflow_state: dict[str, str]) -> str:
         f"## Phase 3: Jira Ticket\n"
         f"{workflow_state.get('ticket', '')}\n"
     )
+    if "ticket" not in workflow_state["completed"]:
+        report += f"\n{_resume_hint(workflow_state)}\n"
+    return report
+
+
+def _resume_hint(workflow_state: dict[str, Any]) -> str:
+    return (
+        "_To retry from the last completed phase, send "
+        f"`resume hunt {workflow_state['hunt_id']}`._"
+    )
+
+
+def _failed(workflow_state: dict[str, Any], error: str) -> str:
+    """Return a phase error along with how to resume the hunt."""
+    return f"{error}\n\n{_resume_hint(workflow_state)}"
+
+
+async def _investigate(
+    routing_agent: RoutingAgent,
+    query_agent: str,
+    workflow_state: dict[str, Any],
+    on_progress: ProgressCallback | None = None,
+) -> str | None:
+    """Run the Phase 2 sub-investigations concurrently and merge their findings.
+
+    Each entry in INVESTIGATIONS becomes an independent workflow step, so
+    the phase takes about as long as its slowest sub-investigation. At most
+    ``threat_hunt_max_parallel`` (host config) run at once. Findings are
+    checkpointed in ``workflow_state['investigations']`` as they arrive, and
+    sub-investigations already there (from an earlier attempt) are not rerun.
+    A sub-investigation that times out, finds the agent unavailable or
+    returns nothing is noted in its section.
+
+    Returns:
+        The merged findings, an "Error: ..." message if every
+        sub-investigation timed out or found the agent unavailable, or None
+        if none of them responded.
+    """
+    message = load_message("query")
+    findings: dict[str, str] = workflow_state["investigations"]
+    steps = []
+    for investigation in INVESTIGATIONS:
+        if investigation["id"] in findings:
+            continue
+        # Each sub-investigation gets the discovery lines relevant to its focus.
+        discovery_findings = fit_to_budget(
+            [workflow_state["discovery"]],
+            routing_agent.context_budget(query_agent),
+            query=f"{workflow_state['hypothesis']} {investigation['focus']}",
+            label=f"threat hunt {investigation['id']} discovery",
+        )[0]
+        steps.append({
+            "id": investigation["id"],
+            "title": investigation["title"],
+            "agent_name": query_agent,
+            "task": message.format(
+                hypothesis=workflow_state["hypothesis"],
+                discovery_findings=discovery_findings,
+                investigation_title=investigation["title"],
+                investigation_focus=investigation["focus"],
+            ),
+            "depends_on": [],
+        })
+    if len(steps) < len(INVESTIGATIONS):
+        logger.info(
+            "Threat hunt Phase 2 reusing %d checkpointed sub-investigation(s).",
+            len(INVESTIGATIONS) - len(steps),
+        )
+    # Why a sub-investigation got no findings: "timed out" or "is unavailable"
+    failures: dict[str, str] = {}
+    step_ids = {step["task"]: step["id"] for step in steps}
+
+    async def send(agent_name, task, step_progress):
+        try:
+            result = await routing_agent.send_message(
+                agent_name, task, on_progress=step_progress, call_class=HUNT
+            )
+        except A2AClientTimeoutError:
+            failures[step_ids[task]] = "timed out"
+            return None
+        except AgentUnavailableError:
+            failures[step_ids[task]] = "is unavailable"
+            return None
+        if result is not None:
+            findings[step_ids[task]] = result
+            await routing_agent.hunt_store.save(workflow_state)
+        return result
+
+    if steps:
+        await run_workflow(
+            steps,
+            send,
+            max_parallel=get_agent_config("host").get("threat_hunt_max_parallel", 4),
+            on_progress=on_progress,
+        )
+
+    if not findings:
+        if failures:
+            reason = next(iter(failures.values()))
+            return f"Error: Query agent {reason} during investigation phase."
+        return None
+
+    sections = []
+    for investigation in INVESTIGATIONS:
+        output = findings.get(investigation["id"])
+        if output is None:
+            reason = failures.get(investigation["id"], "returned no response")
+            logger.warning("Threat hunt Phase 2 %s %s.", investigation["id"], reason)
+            output = f"Error: Query agent {reason} for this sub-investigation."
+        sections.append(f"### {investigation['title']}\n{output}")
+    return "\n\n".join(sections)
 
 
 async def execute_threat_hunt(
-    routing_agent: RoutingAgent, user_message: str
+    routing_agent: RoutingAgent,
+    user_message: str,
+    on_progress: ProgressCallback | None = None,
+    hunt_id: str | None = None,
 ) -> str:
     """Execute the three-phase threat hunting workflow.
 
     The user's message IS the hypothesis. No LLM generation needed.
 
+    ``workflow_state`` is checkpointed in ``routing_agent.hunt_store`` after
+    each phase. If ``hunt_id`` names an existing checkpoint, the hunt resumes
+    from it: completed phases (and completed Phase 2 sub-investigations) are
+    not rerun and the stored hypothesis is used instead of ``user_message``.
+
     Args:
         routing_agent: The RoutingAgent instance (provides send_message).
         user_message: The user-provided hypothesis / investigation request.
+        on_progress: Optional callback receiving each phase's streamed output.
+        hunt_id: ID to checkpoint a new hunt under, or of a hunt to resume.
+            A new ID is generated if omitted.
 
     Returns:
         A markdown investigation report.
     """
     connections = routing_agent.remote_agent_connections
-    workflow_state: dict[str, str] = {"hypothesis": user_message}
+    hunts = routing_agent.hunt_store
+    workflow_state = await hunts.load(hunt_id) if hunt_id else None
+    if workflow_state is None:
+        workflow_state = await hunts.create(hunt_id or new_hunt_id(), user_message)
+    else:
+        logger.info(
+            "Resuming threat hunt %s; completed phases: %s",
+            hunt_id,
+            workflow_state["completed"] or "none",
+        )
+    hypothesis = workflow_state["hypothesis"]
 
     # Phase 1: Discovery & Reconnaissance (Splunk Inventory Agent)
-    print("[Threat Hunt] Phase 1: Discovery & Reconnaissance...")
-    discovery_msg = load_message("inventory").format(
-        hypothesis=user_message,
-    )
-    inventory_agent = _find_agent_by_type(connections, "inventory")
-    try:
-        discovery_result = await routing_agent.send_message(
-            inventory_agent, discovery_msg
-        )
-    except A2AClientTimeoutError:
-        print("[Threat Hunt] Phase 1 timed out.")
-        return "Error: Inventory agent timed out during discovery phase. Please try again."
-    if discovery_result is None:
-        return "Error: No response from inventory agent during discovery phase."
-    workflow_state["discovery"] = discovery_result
-
-    # Phase 2: Investigation (Splunk Query Agent)
-    print("[Threat Hunt] Phase 2: Investigation...")
-    investigation_msg = load_message("query").format(
-        hypothesis=user_message,
-        discovery_findings=workflow_state["discovery"],
-    )
-    query_agent = _find_agent_by_type(connections, "query")
-    try:
-        investigation_result = await routing_agent.send_message(
-            query_agent, investigation_msg
+    if "discovery" not in workflow_state["completed"]:
+        logger.info("Threat hunt Phase 1: Discovery & Reconnaissance...")
+        discovery_msg = load_message("inventory").format(
+            hypothesis=hypothesis,
         )
-    except A2AClientTimeoutError:
-        print("[Threat Hunt] Phase 2 timed out.")
-        workflow_state["investigation"] = (
-            "Error: Query agent timed out during investigation phase."
+        inventory_agent = _find_agent_by_type(connections, "inventory")
+        try:
+            discovery_result = await routing_agent.send_message(
+                inventory_agent,
+                discovery_msg,
+                on_progress=with_heading(on_progress, "Phase 1: Discovery & Reconnaissance"),
+                call_class=HUNT,
+            )
+        except A2AClientTimeoutError:
+            logger.warning("Threat hunt Phase 1 timed out.")
+            return _failed(
+                workflow_state,
+                "Error: Inventory agent timed out during discovery phase. Please try again.",
+            )
+        except AgentUnavailableError as e:
+            logger.warning("Threat hunt Phase 1 skipped: inventory agent unavailable.")
+            return _failed(workflow_state, f"Error: {e}")
+        if discovery_result is None:
+            return _failed(
+                workflow_state,
+                "Error: No response from inventory agent during discovery phase.",
+            )
+        workflow_state["discovery"] = discovery_result
+        workflow_state["completed"].append("discovery")
+        await hunts.save(workflow_state)
+
+    # Phase 2: Investigation (parallel Splunk Query Agent sessions)
+    if "investigation" not in workflow_state["completed"]:
+        logger.info("Threat hunt Phase 2: Investigation...")
+        query_agent = _find_agent_by_type(connections, "query")
+        investigation = await _investigate(
+            routing_agent,
+            query_agent,
+            workflow_state,
+            on_progress=with_heading(on_progress, "Phase 2: Investigation"),
         )
-        workflow_state["ticket"] = "Skipped: Investigation phase did not complete."
-        return _format_report(workflow_state)
-    if investigation_result is None:
-        return "Error: No response from query agent during investigation phase."
-    workflow_state["investigation"] = investigation_result
+        if investigation is None:
+            return _failed(
+                workflow_state,
+                "Error: No response from query agent during investigation phase.",
+            )
+        workflow_state["investigation"] = investigation
+        if investigation.startswith("Error:"):
+            workflow_state["ticket"] = "Skipped: Investigation phase did not complete."
+            await hunts.save(workflow_state)
+            return _format_report(workflow_state)
+        # Partial findings still feed Phase 3, but the phase only counts as
+        # complete (and is skipped on resume) once every sub-investigation is.
+        if len(workflow_state["investigations"]) == len(INVESTIGATIONS):
+            workflow_state["completed"].append("investigation")
+        await hunts.save(workflow_state)
 
     # Phase 3: Ticket Creation (Jira Ticket Agent)
-    print("[Threat Hunt] Phase 3: Creating Jira ticket...")
-    ticket_msg = load_message("ticket").format(
-        hypothesis=user_message,
-        discovery_findings=workflow_state["discovery"],
-        investigation_evidence=workflow_state["investigation"],
-    )
-    jira_agent = _find_agent_by_type(connections, "jira")
-    try:
-        ticket_result = await routing_agent.send_message(jira_agent, ticket_msg)
-    except A2AClientTimeoutError:
-        print("[Threat Hunt] Phase 3 timed out.")
-        workflow_state["ticket"] = (
-            "Error: Jira agent timed out during ticket creation phase."
+    if "ticket" not in workflow_state["completed"]:
+        logger.info("Threat hunt Phase 3: Creating Jira ticket...")
+        jira_agent = _find_agent_by_type(connections, "jira")
+        discovery_findings, investigation_evidence = fit_to_budget(
+            [workflow_state["discovery"], workflow_state["investigation"]],
+            routing_agent.context_budget(jira_agent),
+            query=hypothesis,
+            label="threat hunt ticket",
+        )
+        ticket_msg = load_message("ticket").format(
+            hypothesis=hypothesis,
+            discovery_findings=discovery_findings or "[omitted]",
+            investigation_evidence=investigation_evidence or "[omitted]",
         )
-        return _format_report(workflow_state)
-    if ticket_result is None:
-        return "Error: No response from Jira agent during ticket creation phase."
-    workflow_state["ticket"] = ticket_result
+        try:
+            ticket_result = await routing_agent.send_message(
+                jira_agent,
+                ticket_msg,
+                on_progress=with_heading(on_progress, "Phase 3: Jira Ticket"),
+                call_class=HUNT,
+            )
+        except A2AClientTimeoutError:
+            logger.warning("Threat hunt Phase 3 timed out.")
+            workflow_state["ticket"] = (
+                "Error: Jira agent timed out during ticket creation phase."
+            )
+            await hunts.save(workflow_state)
+            return _format_report(workflow_state)
+        except AgentUnavailableError as e:
+            logger.warning("Threat hunt Phase 3 skipped: Jira agent unavailable.")
+            workflow_state["ticket"] = f"Error: {e}"
+            await hunts.save(workflow_state)
+            return _format_report(workflow_state)
+        if ticket_result is None:
+            return _failed(
+                workflow_state,
+                "Error: No response from Jira agent during ticket creation phase.",
+            )
+        workflow_state["ticket"] = ticket_result
+        workflow_state["completed"].append("ticket")
+        await hunts.save(workflow_state)
 
     return _format_report(workflow_state)
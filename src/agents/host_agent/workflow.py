@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.core.context_budget import fit_to_budget
+
+from .progress import ProgressCallback
+
+logger = logging.getLogger(__name__)
+
+
+# send(agent_name, task, on_progress) -> response text, or None on failure
+SendFunction = Callable[[str, str, ProgressCallback | None], Awaitable[str | None]]
+
+
+def validate_workflow(steps: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Normalize workflow steps and order them so dependencies come first.
+
+    Each step is a dict with ``agent_name``, ``task`` and optionally ``id``
+    (defaults to ``step<N>``), ``depends_on`` (ids of steps whose output
+    this step needs; defaults to none) and ``title`` (shown in progress
+    instead of the agent name).
+
+    Returns:
+        Copies of the steps with ``id`` and ``depends_on`` filled in, in
+        topological order.
+
+    Raises:
+        ValueError: If a step is missing ``agent_name`` or ``task``, ids are
+            duplicated, a dependency is unknown, or the steps form a cycle.
+    """
+    normalized: dict[str, dict[str, Any]] = {}
+    for index, step in enumerate(steps, start=1):
+        if not step.get('agent_name') or not step.get('task'):
+            raise ValueError('Workflow step is missing agent_name or task.')
+        step_id = str(step.get('id') or f'step{index}')
+        if step_id in normalized:
+            raise ValueError(f"Duplicate workflow step id '{step_id}'.")
+        normalized[step_id] = {
+            **step,
+            'id': step_id,
+            'depends_on': [str(dep) for dep in step.get('depends_on') or []],
+        }
+
+    for step in normalized.values():
+        for dep in step['depends_on']:
+            if dep not in normalized:
+                raise ValueError(
+                    f"Workflow step '{step['id']}' depends on unknown step '{dep}'."
+                )
+
+    ordered: list[dict[str, Any]] = []
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(step_id: str) -> None:
+        if step_id in done:
+            return
+        if step_id in visiting:
+            raise ValueError(f"Workflow has a dependency cycle at step '{step_id}'.")
+        visiting.add(step_id)
+        for dep in normalized[step_id]['depends_on']:
+            visit(dep)
+        visiting.discard(step_id)
+        done.add(step_id)
+        ordered.append(normalized[step_id])
+
+    for step_id in normalized:
+        visit(step_id)
+    return ordered
+
+
+def sink_steps(steps: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return the steps no other step depends on (the workflow's results)."""
+    used = {dep for step in steps for dep in step['depends_on']}
+    return [step for step in steps if step['id'] not in used]
+
+
+def _with_inputs(
+    step: dict[str, Any],
+    outputs: dict[str, str],
+    agents: dict[str, str],
+    context_budget: Callable[[str], int] | None = None,
+) -> str:
+    """Append the outputs of a step's declared dependencies to its task.
+
+    With ``context_budget``, the outputs are fitted into the budget of the
+    step's agent first.
+    """
+    if not step['depends_on']:
+        return step['task']
+    inputs = [outputs[dep] for dep in step['depends_on']]
+    if context_budget is not None:
+        inputs = fit_to_budget(
+            inputs,
+            context_budget(step['agent_name']),
+            query=step['task'],
+            label=f"workflow step {step['id']} ({step['agent_name']})",
+        )
+    previous_outputs = '\n\n'.join(
+        f"Step {dep} ({agents[dep]}) output:\n{text or '[omitted]'}"
+        for dep, text in zip(step['depends_on'], inputs)
+    )
+    return (
+        f"{step['task']}\n\n"
+        "Use the following verified outputs from previous steps as context:\n"
+        f"{previous_outputs}"
+    )
+
+
+class _WorkflowProgress:
+    """Combines the streamed output of concurrently running steps."""
+
+    def __init__(self, on_progress: ProgressCallback, total: int):
+        self.on_progress = on_progress
+        self.total = total
+        self.sections: dict[str, str] = {}
+
+    def start(self, index: int, step: dict[str, Any]) -> ProgressCallback:
+        title = step.get('title', step['agent_name'])
+        heading = f'**Step {index}/{self.total}: {title}**'
+        self.sections[step['id']] = heading
+        self._publish()
+
+        def report(partial: str) -> None:
+            self.sections[step['id']] = f'{heading}\n\n{partial}'
+            self._publish()
+
+        return report
+
+    def _publish(self) -> None:
+        self.on_progress('\n\n'.join(self.sections.values()))
+
+
+async def run_workflow(
+    steps: list[dict[str, Any]],
+    send: SendFunction,
+    max_parallel: int = 3,
+    on_progress: ProgressCallback | None = None,
+    context_budget: Callable[[str], int] | None = None,
+) -> dict[str, str | None]:
+    """Run a workflow graph, starting each step once its dependencies finish.
+
+    Independent steps run concurrently, at most ``max_parallel`` at a time.
+    A step only sees the outputs of the steps listed in its ``depends_on``.
+    If a step gets no response, the steps depending on it are skipped.
+
+    Args:
+        steps: Steps as returned by ``validate_workflow``.
+        send: Delegates one task to an agent (RoutingAgent.send_message).
+        max_parallel: Maximum number of steps in flight at once.
+        on_progress: Optional callback for the combined in-progress output.
+        context_budget: Optional token budget per agent name for the
+            dependency outputs passed to a step.
+
+    Returns:
+        Output text per step id; None for steps that failed or were skipped.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+    agents = {step['id']: step['agent_name'] for step in steps}
+    outputs: dict[str, str | None] = {}
+    durations: dict[str, float] = {}
+    progress = _WorkflowProgress(on_progress, len(steps)) if on_progress else None
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def run_step(index: int, step: dict[str, Any]) -> None:
+        for dep in step['depends_on']:
+            await tasks[dep]
+        if any(outputs[dep] is None for dep in step['depends_on']):
+            logger.info('Skipping workflow step %s: an upstream step failed.', step['id'])
+            outputs[step['id']] = None
+            return
+        async with semaphore:
+            logger.info('Starting workflow step %s on %s', step['id'], step['agent_name'])
+            started = time.monotonic()
+            step_progress = progress.start(index, step) if progress else None
+            outputs[step['id']] = await send(
+                step['agent_name'],
+                _with_inputs(step, outputs, agents, context_budget),
+                step_progress,
+            )
+            durations[step['id']] = time.monotonic() - started
+
+    started = time.monotonic()
+    for index, step in enumerate(steps, start=1):
+        tasks[step['id']] = asyncio.create_task(run_step(index, step))
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+    logger.info(
+        'Workflow of %d step(s) finished in %.1fs (sum of step times %.1fs, max_parallel=%d)',
+        len(steps),
+        time.monotonic() - started,
+        sum(durations.values()),
+        max_parallel,
+    )
+    return outputs
@@ -1,6 +1,7 @@
 # pylint: disable=logging-fstring-interpolation
 
 import asyncio
+import logging
 import sys
 
 from contextlib import asynccontextmanager
@@ -10,60 +11,43 @@ import click
 import uvicorn
 from dotenv import load_dotenv
 
-from a2a.server.apps import A2AStarletteApplication
-from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
-
 from src.core.client import create_client
-from src.core.setup import (
-    create_collection,
-    register_mcp_tool,
-    setup_agent_keys,
-    upload_and_ingest_mcp_config,
-)
-from .jira_agent import build_agent_card
-from .jira_executor import JiraTicketAgentExecutor
-from .schema import get_jira_schema
+from src.core.log import setup_logging
+from src.core.setup import ensure_agent_keys, ensure_mcp_tool
+from src.core.workers import run_workers
+
+from .server import DEFAULT_PORT, build_app, setup_agent
 
 
 load_dotenv(override=True)
+setup_logging('jira')
+logger = logging.getLogger(__name__)
 
 app_context: dict[str, Any] = {}
 
 DEFAULT_HOST = "0.0.0.0"
-DEFAULT_PORT = 8084
 DEFAULT_LOG_LEVEL = "info"
-COLLECTION_NAME = "Jira Ticket Agent"
-COLLECTION_DESC = "Jira Ticket Agent with Jira Remote MCP Tool Capabilities"
 
 
 @asynccontextmanager
 async def app_lifespan(context: dict[str, Any]):
     """Manage lifecycle of shared resources like H2OGPTE client and MCP tools."""
-    print("Lifespan: Initializing H2OGPTE client and Jira MCP tools...")
+    logger.info("Lifespan: Initializing H2OGPTE client and Jira MCP tools...")
 
     try:
         client = create_client()
-        collection_id = create_collection(client, COLLECTION_NAME, COLLECTION_DESC)
-        upload_and_ingest_mcp_config(client, collection_id)
-        register_mcp_tool(client)
-        setup_agent_keys(client)
-
-        context["client"] = client
-        context["collection_id"] = collection_id
+        setup_agent(client, context)
+        ensure_mcp_tool(client)
+        ensure_agent_keys(client)
 
-        print("Lifespan: Discovering Jira schema via REST API...")
-        context["schema_context"] = get_jira_schema()
-        print(f'Lifespan: Schema discovered:\n{context["schema_context"]}')
-
-        print('Lifespan: H2OGPTE client and MCP tools initialized successfully.')
+        logger.info('Lifespan: H2OGPTE client and MCP tools initialized successfully.')
         yield
     except Exception as e:
-        print(f"Lifespan: Error during initialization: {e}", file=sys.stderr)
+        logger.error(f"Lifespan: Error during initialization: {e}")
         raise
     finally:
-        print("Lifespan: Shutting down...")
-        print("Lifespan: Clearing application context.")
+        logger.info("Lifespan: Shutting down...")
+        logger.info("Lifespan: Clearing application context.")
         context.clear()
 
 
@@ -71,35 +55,34 @@ def main(
     host: str = DEFAULT_HOST,
     port: int = DEFAULT_PORT,
     log_level: str = DEFAULT_LOG_LEVEL,
+    workers: int = 1,
 ):
-    """Start the Jira Ticket Agent A2A server."""
+    """Start the Jira Ticket Agent A2A server.
+
+    With more than one worker, the collection, MCP tool and agent keys are
+    set up once here; each uvicorn worker process then builds its own app
+    from ``server.create_app`` and reuses them.
+    """
+    if workers > 1:
+        async def bootstrap():
+            async with app_lifespan(app_context):
+                pass
+
+        asyncio.run(bootstrap())
+        run_workers(
+            "src.agents.jira_ticket_agent.server:create_app", host, port, log_level, workers
+        )
+        return
 
     async def run_server_async():
         async with app_lifespan(app_context):
             if not app_context.get("client"):
-                print(
-                    "Warning: H2OGPTE client was not initialized. "
+                logger.warning(
+                    "H2OGPTE client was not initialized. "
                     "Agent may not function correctly.",
-                    file=sys.stderr,
                 )
 
-            jira_agent_executor = JiraTicketAgentExecutor(
-                client=app_context["client"],
-                collection_id=app_context["collection_id"],
-                jira_schema=app_context["schema_context"],
-            )
-
-            request_handler = DefaultRequestHandler(
-                agent_executor=jira_agent_executor,
-                task_store=InMemoryTaskStore(),
-            )
-
-            a2a_server = A2AStarletteApplication(
-                agent_card=build_agent_card(host, port),
-                http_handler=request_handler,
-            )
-
-            asgi_app = a2a_server.build()
+            asgi_app = build_app(app_context, host, port)
 
             config = uvicorn.Config(
                 app=asgi_app,
@@ -111,30 +94,29 @@ def main(
 
             uvicorn_server = uvicorn.Server(config)
 
-            print(
+            logger.info(
                 f"Starting Jira Ticket Agent at http://{host}:{port} "
                 f"with log-level {log_level}..."
             )
             try:
                 await uvicorn_server.serve()
             except KeyboardInterrupt:
-                print("Server shutdown requested (KeyboardInterrupt).")
+                logger.info("Server shutdown requested (KeyboardInterrupt).")
             finally:
-                print("Uvicorn server has stopped.")
+                logger.info("Uvicorn server has stopped.")
 
     try:
         asyncio.run(run_server_async())
     except RuntimeError as e:
         if "cannot be called from a running event loop" in str(e):
-            print(
-                "Critical Error: Attempted to nest asyncio.run().",
-                file=sys.stderr,
+            logger.critical(
+                "Attempted to nest asyncio.run().",
             )
         else:
-            print(f"RuntimeError in main: {e}", file=sys.stderr)
+            logger.error(f"RuntimeError in main: {e}")
         sys.exit(1)
     except Exception as e:
-        print(f"An unexpected error occurred in main: {e}", file=sys.stderr)
+        logger.error(f"An unexpected error occurred in main: {e}")
         sys.exit(1)
 
 
@@ -158,9 +140,16 @@ def main(
     default=DEFAULT_LOG_LEVEL,
     help="Uvicorn log level.",
 )
-def cli(host: str, port: int, log_level: str):
-    main(host, port, log_level)
+@click.option(
+    "--workers",
+    "workers",
+    default=1,
+    type=int,
+    help="Worker processes; more than one needs the sqlite task store.",
+)
+def cli(host: str, port: int, log_level: str, workers: int):
+    main(host, port, log_level, workers)
 
 
 if __name__ == "__main__":
-    main()
+    cli()
@@ -1,36 +1,95 @@
 import asyncio
+import logging
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
-from a2a.types import UnsupportedOperationError
-from a2a.utils import new_agent_text_message
+from a2a.server.tasks import TaskUpdater
+from a2a.utils import new_agent_text_message, new_task
+
+from src.core.client import get_chat_session_pool, get_session_pool
+from src.core.h2ogpte_executor import get_h2ogpte_executor
+from src.core.log import CORRELATION_KEY, Payload, bind_correlation_id
+from src.core.streaming import TaskStreamer
 
 from .run import query_jira_ticket_agent
 
+logger = logging.getLogger(__name__)
+
 
 class JiraTicketAgentExecutor(AgentExecutor):
     def __init__(self, client, collection_id: str, jira_schema: str):
         self.client = client
         self.collection_id = collection_id
         self.jira_schema = jira_schema
+        # Streamers of the tasks running now, so cancel() can abort them.
+        self._running: dict[str, TaskStreamer] = {}
+        self.h2ogpte = get_h2ogpte_executor("ticket")
+        # Fresh chat sessions, created ahead of requests.
+        self.chat_sessions = get_chat_session_pool(client, collection_id, "ticket")
 
     async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        chat_id = None
         try:
+            bind_correlation_id((context.message.metadata or {}).get(CORRELATION_KEY))
             user_message = context.get_user_input()
-            print(f"[execute] user_message={user_message!r}")
-            response = await asyncio.to_thread(
-                query_jira_ticket_agent,
-                client=self.client,
-                collection_id=self.collection_id,
-                jira_schema=self.jira_schema,
-                user_prompt=user_message,
+            logger.info(
+                "execute: user_message=%s h2ogpte=%s",
+                Payload(user_message),
+                self.h2ogpte.stats(),
+            )
+            task = context.current_task
+            if task is None:
+                task = new_task(context.message)
+                await event_queue.enqueue_event(task)
+            updater = TaskUpdater(event_queue, task.id, task.context_id)
+
+            async with TaskStreamer(updater) as stream:
+                self._running[context.task_id] = stream
+                chat_id = await self.h2ogpte.run(self.chat_sessions.acquire)
+                logger.info(
+                    "execute: chat session %s, pool=%s",
+                    chat_id,
+                    self.chat_sessions.stats(),
+                )
+                await stream.status("Running Jira ticket agent...")
+                response = await self.h2ogpte.run(
+                    query_jira_ticket_agent,
+                    client=self.client,
+                    chat_id=chat_id,
+                    jira_schema=self.jira_schema,
+                    user_prompt=user_message,
+                    callback=stream.on_message,
+                )
+            logger.info(
+                "execute: response of %d chars, stream_updates=%d",
+                len(response),
+                stream.updates,
             )
-            print(f"[execute] response={response!r}")
-            await event_queue.enqueue_event(new_agent_text_message(response))
-            print("[execute] event enqueued successfully")
+            logger.debug("execute: response=%s", Payload(response))
+            await updater.complete(
+                new_agent_text_message(response, task.context_id, task.id)
+            )
+            logger.info(
+                "execute: task completed, connections=%s",
+                get_session_pool(self.client).stats(),
+            )
+        except asyncio.CancelledError:
+            logger.info("execute: task %s cancelled", context.task_id)
+            raise
         except Exception as e:
-            print(f"[execute] ERROR: {type(e).__name__}: {e}")
+            logger.error("execute: %s: %s", type(e).__name__, e)
             raise
+        finally:
+            self._running.pop(context.task_id, None)
+            if chat_id is not None:
+                # One query per chat session; delete it once the task is done.
+                await self.h2ogpte.run(self.chat_sessions.release, chat_id)
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
-        raise UnsupportedOperationError()
+        """Abort the task's H2OGPTE query and mark the task canceled."""
+        stream = self._running.pop(context.task_id, None)
+        if stream is not None:
+            stream.cancel()
+        logger.info("cancel: task %s, running=%s", context.task_id, stream is not None)
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        await updater.cancel()
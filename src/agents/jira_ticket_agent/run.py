@@ -1,5 +1,9 @@
+from collections.abc import Callable
+from typing import Any
+
 from h2ogpte import H2OGPTE
 
+from src.core.client import connect_session
 from src.core.config import get_agent_config
 from src.core.prompt_loader import load_prompt
 
@@ -9,17 +13,27 @@ prompt = load_prompt("ticket")
 
 def query_jira_ticket_agent(
     client: H2OGPTE,
-    collection_id: str,
+    chat_id: str,
     jira_schema: str,
     user_prompt: str,
+    callback: Callable[[Any], None] | None = None,
 ) -> str:
-    """Create a chat session and query the Jira ticket agent."""
-    system_prompt = prompt.format(jira_schema=jira_schema)
+    """Run the Jira ticket agent on a chat session from the agent's pool.
 
-    chat_session_id = client.create_chat_session(collection_id)
-    print(f"Chat session created: {chat_session_id}")
+    Args:
+        client: An authenticated H2OGPTE client.
+        chat_id: A fresh chat session acquired from the ``ChatSessionPool``.
+        jira_schema: Pre-built markdown schema of the Jira projects.
+        user_prompt: The natural language request.
+        callback: Optional ``session.query`` callback receiving partial
+            messages as the agent streams its answer.
+
+    Returns:
+        The agent's response as a string.
+    """
+    system_prompt = prompt.format(jira_schema=jira_schema)
 
-    with client.connect(chat_session_id) as session:
+    with connect_session(client, chat_id) as session:
         reply = session.query(
             message=user_prompt,
             system_prompt=system_prompt,
@@ -35,6 +49,7 @@ def query_jira_ticket_agent(
                 agent_tools=jira_ticket_config["agent_tools"],
             ),
             rag_config={"rag_type": "llm_only"},
+            callback=callback,
         )
 
     return reply.content
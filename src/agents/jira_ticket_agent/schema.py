@@ -1,7 +1,10 @@
+import logging
 import os
 
 import requests
 
+logger = logging.getLogger(__name__)
+
 
 def _jira_rest(endpoint: str, method: str = "GET", **params) -> requests.Response:
     """Call a Jira REST API endpoint with basic auth.
@@ -45,7 +48,7 @@ def get_jira_schema() -> str:
         for project in projects:
             schema_output += f"- `{project['key']}` — {project['name']}\n"
     except Exception as e:
-        print(f"[schema] Failed to list Jira projects: {e}")
+        logger.warning("Failed to list Jira projects: %s", e)
         schema_output += "\n**Projects:** (unable to discover)\n"
 
     # 2. List all issue types
@@ -63,7 +66,7 @@ def get_jira_schema() -> str:
         if subtasks:
             schema_output += f"- Subtasks: {', '.join(subtasks)}\n"
     except Exception as e:
-        print(f"[schema] Failed to list Jira issue types: {e}")
+        logger.warning("Failed to list Jira issue types: %s", e)
         schema_output += "\n**Issue Types:** (unable to discover)\n"
 
     return schema_output
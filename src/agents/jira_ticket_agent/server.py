@@ -0,0 +1,66 @@
+import logging
+from typing import Any
+
+from a2a.server.apps import A2AStarletteApplication
+from h2ogpte import H2OGPTE
+from starlette.applications import Starlette
+
+from src.core.admission import (
+    AdmissionRequestHandler,
+    add_admission_route,
+    get_admission_controller,
+)
+from src.core.setup import ensure_collection
+from src.core.task_store import create_task_store
+from src.core.workers import create_worker_app
+
+from .jira_agent import build_agent_card
+from .jira_executor import JiraTicketAgentExecutor
+from .schema import get_jira_schema
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8084
+COLLECTION_NAME = "Jira Ticket Agent"
+COLLECTION_DESC = "Jira Ticket Agent with Jira Remote MCP Tool Capabilities"
+
+
+def setup_agent(client: H2OGPTE, context: dict[str, Any]) -> None:
+    """Create or reuse the agent's collection and discover the Jira schema.
+
+    Fills ``context`` with ``client``, ``collection_id`` and
+    ``schema_context``.
+    """
+    collection_id = ensure_collection(client, "ticket", COLLECTION_NAME, COLLECTION_DESC)
+    context["client"] = client
+    context["collection_id"] = collection_id
+
+    logger.info("Discovering Jira schema via REST API...")
+    context["schema_context"] = get_jira_schema()
+    logger.debug("Schema discovered:\n%s", context["schema_context"])
+
+
+def build_app(context: dict[str, Any], host: str, port: int) -> Starlette:
+    """Build the agent's A2A application from a context filled by setup_agent()."""
+    executor = JiraTicketAgentExecutor(
+        client=context["client"],
+        collection_id=context["collection_id"],
+        jira_schema=context["schema_context"],
+    )
+    admission = get_admission_controller("ticket")
+    request_handler = AdmissionRequestHandler(
+        agent_executor=executor,
+        task_store=create_task_store("ticket"),
+        admission=admission,
+    )
+    app = A2AStarletteApplication(
+        agent_card=build_agent_card(host, port),
+        http_handler=request_handler,
+    ).build()
+    add_admission_route(app, admission)
+    return app
+
+
+def create_app() -> Starlette:
+    """App factory for serving with several uvicorn workers (``--workers``)."""
+    return create_worker_app("jira", setup_agent, build_app, DEFAULT_PORT)
@@ -9,7 +9,7 @@ def build_agent_card(host: str, port: int) -> AgentCard:
         version="1.0.0",
         defaultInputModes=["text/plain"],
         defaultOutputModes=["text/plain"],
-        capabilities=AgentCapabilities(streaming=False),
+        capabilities=AgentCapabilities(streaming=True),
         skills=[
             AgentSkill(
                 id="splunk_inventory",
@@ -1,4 +1,9 @@
+from collections.abc import Callable
+from typing import Any
+
 from h2ogpte import H2OGPTE
+
+from src.core.client import connect_session
 from src.core.config import get_agent_config
 from src.core.prompt_loader import load_prompt
 
@@ -10,19 +15,22 @@ def run_splunk_agent(
     client: H2OGPTE,
     chat_id: str,
     user_prompt: str,
+    callback: Callable[[Any], None] | None = None,
 ) -> str:
-    """Create a chat session and run the Splunk agent.
+    """Run the Splunk agent on a chat session from the agent's pool.
 
     Args:
         client: An authenticated H2OGPTE client.
-        collection_id: The collection to associate the chat session with.
+        chat_id: A fresh chat session acquired from the ``ChatSessionPool``.
         user_prompt: The natural language question to ask.
+        callback: Optional ``session.query`` callback receiving partial
+            messages as the agent streams its answer.
 
     Returns:
         The agent's response as a string.
     """
 
-    with client.connect(chat_id) as session:
+    with connect_session(client, chat_id) as session:
         reply = session.query(
             message=user_prompt,
             system_prompt=prompt,
@@ -39,6 +47,7 @@ def run_splunk_agent(
                 agent_tools=inventory_config["agent_tools"],
             ),
             rag_config={"rag_type": "llm_only"},
+            callback=callback,
             include_chat_history="on"
         )
 
@@ -1,38 +1,118 @@
 import asyncio
+import logging
+import re
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
-from a2a.utils import new_agent_text_message
-from a2a.types import UnsupportedOperationError
+from a2a.server.tasks import TaskUpdater
+from a2a.utils import new_agent_text_message, new_task
+from src.core.client import get_chat_session_pool, get_session_pool
+from src.core.h2ogpte_executor import get_h2ogpte_executor
+from src.core.log import CORRELATION_KEY, Payload, bind_correlation_id
+from src.core.response_cache import CACHED_KEY, get_response_cache
+from src.core.splunk import get_index_fingerprint
+from src.core.streaming import TaskStreamer
 from .run import run_splunk_agent
 
+logger = logging.getLogger(__name__)
+
+# SPL commands that write data or trigger actions; answers to tasks using
+# them are never cached.
+_SPL_WRITE_COMMANDS = re.compile(
+    r"\b(outputlookup|outputcsv|collect|tscollect|mcollect|meventcollect|"
+    r"delete|sendemail|sendalert)\b",
+    re.IGNORECASE,
+)
+
+
 class SplunkQueryAgentExecutor(AgentExecutor):
     def __init__(self, client, collection_id: str, schema_context: str):
         self.client = client
         self.collection_id = collection_id
         self.schema_context = schema_context
+        # Streamers of the tasks running now, so cancel() can abort them.
+        self._running: dict[str, TaskStreamer] = {}
+        self.h2ogpte = get_h2ogpte_executor("query")
+        self.chat_sessions = get_chat_session_pool(client, collection_id, "query")
+        self.cache = get_response_cache("query", get_index_fingerprint)
 
     async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        chat_id = None
         try:
+            bind_correlation_id((context.message.metadata or {}).get(CORRELATION_KEY))
             user_message = context.get_user_input()
-            print(f"[execute] user_message={user_message!r}")
-            chat_id = await asyncio.to_thread(
-                self.client.create_chat_session, self.collection_id
+            logger.info(
+                "execute: user_message=%s h2ogpte=%s",
+                Payload(user_message),
+                self.h2ogpte.stats(),
+            )
+            task = context.current_task
+            if task is None:
+                task = new_task(context.message)
+                await event_queue.enqueue_event(task)
+            updater = TaskUpdater(event_queue, task.id, task.context_id)
+
+            cached = await asyncio.to_thread(self.cache.get, user_message)
+            if cached is not None:
+                logger.info(
+                    "execute: answered from cache, %d chars, cache=%s",
+                    len(cached),
+                    self.cache.stats(),
+                )
+                message = new_agent_text_message(cached, task.context_id, task.id)
+                message.metadata = {CACHED_KEY: True}
+                await updater.complete(message)
+                return
+
+            async with TaskStreamer(updater) as stream:
+                self._running[context.task_id] = stream
+                chat_id = await self.h2ogpte.run(self.chat_sessions.acquire)
+                logger.info(
+                    "execute: chat session %s, pool=%s",
+                    chat_id,
+                    self.chat_sessions.stats(),
+                )
+                await stream.status("Running Splunk query agent...")
+                response = await self.h2ogpte.run(
+                    run_splunk_agent,
+                    client=self.client,
+                    chat_id=chat_id,
+                    schema_context=self.schema_context,
+                    user_prompt=user_message,
+                    callback=stream.on_message,
+                )
+            logger.info(
+                "execute: response of %d chars, stream_updates=%d",
+                len(response),
+                stream.updates,
             )
-            print(f"[execute] created chat session: {chat_id}")
-            response = await asyncio.to_thread(
-                run_splunk_agent,
-                client=self.client,
-                chat_id=chat_id,
-                schema_context=self.schema_context,
-                user_prompt=user_message,
+            logger.debug("execute: response=%s", Payload(response))
+            if not _SPL_WRITE_COMMANDS.search(user_message + response):
+                await asyncio.to_thread(self.cache.put, user_message, response)
+            await updater.complete(
+                new_agent_text_message(response, task.context_id, task.id)
             )
-            print(f"[execute] response={response!r}")
-            await event_queue.enqueue_event(new_agent_text_message(response))
-            print("[execute] event enqueued successfully")
+            logger.info(
+                "execute: task completed, connections=%s",
+                get_session_pool(self.client).stats(),
+            )
+        except asyncio.CancelledError:
+            logger.info("execute: task %s cancelled", context.task_id)
+            raise
         except Exception as e:
-            print(f"[execute] ERROR: {type(e).__name__}: {e}")
+            logger.error("execute: %s: %s", type(e).__name__, e)
             raise
+        finally:
+            self._running.pop(context.task_id, None)
+            if chat_id is not None:
+                # One query per chat session; delete it once the task is done.
+                await self.h2ogpte.run(self.chat_sessions.release, chat_id)
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
-        raise UnsupportedOperationError()
+        """Abort the task's H2OGPTE query and mark the task canceled."""
+        stream = self._running.pop(context.task_id, None)
+        if stream is not None:
+            stream.cancel()
+        logger.info("cancel: task %s, running=%s", context.task_id, stream is not None)
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        await updater.cancel()
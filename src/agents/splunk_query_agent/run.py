@@ -1,4 +1,9 @@
+from collections.abc import Callable
+from typing import Any
+
 from h2ogpte import H2OGPTE
+
+from src.core.client import connect_session
 from src.core.config import get_agent_config
 from src.core.prompt_loader import load_prompt
 
@@ -11,14 +16,17 @@ def run_splunk_agent(
     chat_id: str,
     schema_context: str,
     user_prompt: str,
+    callback: Callable[[Any], None] | None = None,
 ) -> str:
-    """Run the Splunk agent on an existing chat session.
+    """Run the Splunk agent on a chat session from the agent's pool.
 
     Args:
         client: An authenticated H2OGPTE client.
-        chat_id: The persistent chat session ID.
+        chat_id: A fresh chat session acquired from the ``ChatSessionPool``.
         schema_context: Pre-built markdown schema of Splunk indexes/fields.
         user_prompt: The natural language question to ask.
+        callback: Optional ``session.query`` callback receiving partial
+            messages as the agent streams its answer.
 
     Returns:
         The agent's response as a string.
@@ -27,7 +35,7 @@ def run_splunk_agent(
         schema_context=schema_context
     )
 
-    with client.connect(chat_id) as session:
+    with connect_session(client, chat_id) as session:
         reply = session.query(
             message=user_prompt,
             system_prompt=system_prompt,
@@ -44,6 +52,7 @@ def run_splunk_agent(
                 agent_tools=query_config["agent_tools"],
             ),
             rag_config={"rag_type": "llm_only"},
+            callback=callback,
             include_chat_history="on"
         )
 
@@ -1,36 +1,9 @@
 import json
-import os
+import logging
 
-import requests
-import urllib3
+from src.core.splunk import splunk_rest
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-
-def _splunk_rest(endpoint: str, method: str = "GET", **params) -> requests.Response:
-    """Call a Splunk REST API endpoint with basic auth.
-
-    Args:
-        endpoint: The REST path, e.g. "/services/data/indexes".
-        method: HTTP method (GET or POST).
-        **params: Extra query/form params forwarded to the request.
-
-    Returns:
-        The HTTP response object.
-    """
-    host = os.environ.get("SPLUNK_HOST", "localhost")
-    port = os.environ.get("SPLUNK_MGMT_PORT", "8089")
-    username = os.environ.get("SPLUNK_USERNAME", "admin")
-    password = os.environ.get("SPLUNK_PASSWORD", "")
-
-    url = f"https://{host}:{port}{endpoint}"
-    auth = (username, password)
-
-    params["output_mode"] = "json"
-
-    if method.upper() == "GET":
-        return requests.get(url, params=params, auth=auth, verify=False)
-    return requests.post(url, data=params, auth=auth, verify=False)
+logger = logging.getLogger(__name__)
 
 
 def get_dynamic_schema(days_back: int = 30) -> str:
@@ -47,7 +20,7 @@ def get_dynamic_schema(days_back: int = 30) -> str:
         A markdown string describing the discovered schema.
     """
     # 1. List all indexes
-    resp = _splunk_rest("/services/data/indexes")
+    resp = splunk_rest("/services/data/indexes")
     resp.raise_for_status()
     entries = resp.json().get("entry", [])
 
@@ -81,7 +54,7 @@ def get_dynamic_schema(days_back: int = 30) -> str:
             f"| head 5 | fieldsummary | where count > 0 | table field"
         )
         try:
-            search_resp = _splunk_rest(
+            search_resp = splunk_rest(
                 "/services/search/jobs/export",
                 method="POST",
                 search=spl,
@@ -100,7 +73,7 @@ def get_dynamic_schema(days_back: int = 30) -> str:
                     continue
             fields = fields[:10]
         except Exception as e:
-            print(f"[schema] Failed to get fields for index={name}: {e}")
+            logger.warning("Failed to get fields for index=%s: %s", name, e)
             fields = []
 
         schema_output += f"\n**Index:** `{name}`\n"
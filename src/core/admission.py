@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+
+from a2a.server.context import ServerCallContext
+from a2a.server.events import Event
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.types import JSONRPCError, Message, MessageSendParams, Task
+from a2a.utils.errors import ServerError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from src.core.config import get_agent_config
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC error code (from the server-defined range) for a request turned
+# away because the agent is at capacity. The error's ``data`` carries
+# ``retry_after`` (seconds) and the server's load figures.
+SERVER_BUSY_CODE = -32050
+
+# Route on each agent server returning its AdmissionController.stats(); the
+# host's health monitor reads it to route around replicas with long queues.
+ADMISSION_STATS_PATH = "/admission"
+
+# Recent queue waits and run times kept for metrics and retry-after hints.
+_SAMPLE_WINDOW = 200
+
+
+def _percentile(samples: deque[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+class AdmissionController:
+    """Bounds how many requests an agent server runs and queues at once.
+
+    Up to ``max_in_flight`` requests run concurrently and up to ``max_queue``
+    more wait for a slot. Anything beyond that is rejected immediately with
+    a ``SERVER_BUSY_CODE`` JSON-RPC error whose ``retry_after`` estimates
+    when a slot frees up, so callers can back off or try another replica
+    instead of piling on.
+    """
+
+    def __init__(self, name: str, max_in_flight: int = 8, max_queue: int = 16):
+        """
+        Args:
+            name: Agent name, used in logs and error messages.
+            max_in_flight: Requests allowed to run at once.
+            max_queue: Requests allowed to wait for a slot.
+        """
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._waits: deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self._runs: deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self._lock = threading.Lock()
+        self._slots: asyncio.Semaphore | None = None
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block.
+
+        Raises:
+            ServerError: ``SERVER_BUSY_CODE`` if every slot is taken and the
+                queue is full.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        with self._lock:
+            if self.in_flight + self.queued >= self.max_in_flight + self.max_queue:
+                self.rejected += 1
+                data = self._stats_locked()
+                data["retry_after"] = self._retry_after_locked()
+                logger.warning("Rejecting request, %s is at capacity: %s", self.name, data)
+                raise ServerError(
+                    error=JSONRPCError(
+                        code=SERVER_BUSY_CODE,
+                        message=(
+                            f"{self.name} is at capacity; "
+                            f"retry in {data['retry_after']}s"
+                        ),
+                        data=data,
+                    )
+                )
+            self.queued += 1
+
+        queued_at = time.monotonic()
+        try:
+            await self._slots.acquire()
+        finally:
+            with self._lock:
+                self.queued -= 1
+        started = time.monotonic()
+        with self._lock:
+            self.in_flight += 1
+            self.admitted += 1
+            self._waits.append(started - queued_at)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self._runs.append(time.monotonic() - started)
+            self._slots.release()
+
+    def _retry_after_locked(self) -> int:
+        """Seconds until the queue has likely drained by one slot."""
+        typical_run = _percentile(self._runs, 50) or 5.0
+        waves = (self.queued + 1) / self.max_in_flight
+        return max(1, math.ceil(typical_run * waves))
+
+    def _stats_locked(self) -> dict[str, int | float]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "queue_wait_p50": round(_percentile(self._waits, 50), 3),
+            "queue_wait_p95": round(_percentile(self._waits, 95), 3),
+        }
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            return self._stats_locked()
+
+
+class AdmissionRequestHandler(DefaultRequestHandler):
+    """A request handler that admits ``message/send`` and ``message/stream``
+    calls through an AdmissionController.
+
+    Rejection happens before a task is created, so a busy server does no
+    work for requests it turns away. The slot is held until the response
+    (or the stream) completes.
+    """
+
+    def __init__(self, *args, admission: AdmissionController, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.admission = admission
+
+    async def on_message_send(
+        self,
+        params: MessageSendParams,
+        context: ServerCallContext | None = None,
+    ) -> Message | Task:
+        async with self.admission.admit():
+            return await super().on_message_send(params, context)
+
+    async def on_message_send_stream(
+        self,
+        params: MessageSendParams,
+        context: ServerCallContext | None = None,
+    ) -> AsyncGenerator[Event, None]:
+        async with self.admission.admit():
+            async for event in super().on_message_send_stream(params, context):
+                yield event
+
+
+def add_admission_route(app: Starlette, admission: AdmissionController) -> None:
+    """Serve ``admission.stats()`` as JSON at ``ADMISSION_STATS_PATH``.
+
+    With several worker processes each answers with its own figures.
+    """
+
+    async def admission_stats(request: Request) -> JSONResponse:
+        return JSONResponse(admission.stats())
+
+    app.add_route(ADMISSION_STATS_PATH, admission_stats, methods=["GET"])
+
+
+_controllers: dict[str, AdmissionController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_admission_controller(agent_name: str) -> AdmissionController:
+    """Return the shared admission controller for an agent.
+
+    Limits come from ``max_in_flight`` (default ``h2ogpte_max_workers``) and
+    ``max_queue`` in the agent's section of agents.yaml.
+
+    Args:
+        agent_name: Key under ``agents`` in agents.yaml (e.g. "query").
+    """
+    with _controllers_lock:
+        controller = _controllers.get(agent_name)
+        if controller is None:
+            config = get_agent_config(agent_name)
+            controller = AdmissionController(
+                agent_name,
+                max_in_flight=config.get(
+                    "max_in_flight", config.get("h2ogpte_max_workers", 8)
+                ),
+                max_queue=config.get("max_queue", 16),
+            )
+            _controllers[agent_name] = controller
+        return controller
@@ -1,7 +1,32 @@
+import logging
 import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
 
 from dotenv import load_dotenv
 from h2ogpte import H2OGPTE
+from h2ogpte.session import Session
+from websockets.protocol import State
+
+from src.core.config import get_agent_config
+
+logger = logging.getLogger(__name__)
+
+# Idle connections kept per client, across all chat sessions.
+POOL_MAX_IDLE = 32
+# Idle connections older than this are closed instead of reused.
+POOL_IDLE_TIMEOUT = 300
+# How often idle connections are pinged to keep them (and the proxy) alive.
+POOL_KEEPALIVE_INTERVAL = 20
+# How long to wait for a pong before treating a connection as dead.
+POOL_PING_TIMEOUT = 5
+# Pre-created chat sessions kept per agent collection.
+CHAT_POOL_SIZE = 4
+# Unused pre-created chat sessions older than this are deleted and replaced.
+CHAT_POOL_MAX_AGE = 1800
 
 
 def create_client() -> H2OGPTE:
@@ -14,7 +39,421 @@ def create_client() -> H2OGPTE:
     if not api_key or not address:
         raise ValueError("H2OGPTE_API_KEY and H2OGPTE_ADDRESS must be set in .env")
 
-    print(f"Connecting to {address}...")
+    logger.info("Connecting to %s...", address)
     client = H2OGPTE(address=address, api_key=api_key)
-    print("Client created successfully.")
+    logger.info("Client created successfully.")
     return client
+
+
+def _is_alive(session: Session, ping: bool = True) -> bool:
+    """Check a session's websocket, optionally waiting for a ping's pong."""
+    try:
+        if session.connection.protocol.state is not State.OPEN:
+            return False
+        return session.connection.ping().wait(POOL_PING_TIMEOUT) if ping else True
+    except Exception:
+        return False
+
+
+class SessionConnectionPool:
+    """Reusable websocket connections to H2OGPTE chat sessions.
+
+    ``client.connect(chat_id)`` opens a new websocket (TLS + auth handshake)
+    for every query. The pool keeps connections open after use and hands
+    them back out for the same chat session. A background thread pings idle
+    connections so they stay alive, and drops ones that are dead or idle
+    longer than ``idle_timeout``. A connection that fails a health check at
+    checkout is reconnected transparently.
+
+    Chat sessions that serve a single query (see ``ChatSessionPool``) are
+    registered with ``hand_off()``: their connection, opened ahead of time
+    when possible, is closed after the query instead of kept idle, so it
+    never takes a slot from a connection that will be reused.
+    """
+
+    def __init__(
+        self,
+        client: H2OGPTE,
+        max_idle: int = POOL_MAX_IDLE,
+        idle_timeout: float = POOL_IDLE_TIMEOUT,
+        keepalive_interval: float = POOL_KEEPALIVE_INTERVAL,
+    ):
+        self.client = client
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self._idle: dict[str, list[tuple[float, Session]]] = {}
+        # Single-use chat sessions and their pre-opened connection, if any
+        self._single_use: dict[str, tuple[float, Session] | None] = {}
+        self._lock = threading.Lock()
+        self._keepalive_thread: threading.Thread | None = None
+        self.connects = 0
+        self.reuses = 0
+        self.connect_seconds = 0.0
+
+    @contextmanager
+    def session(self, chat_session_id: str) -> Iterator[Session]:
+        """Check out a connected session, returning it to the pool afterwards.
+
+        A session whose query raised is disconnected rather than reused, as
+        is the connection of a session registered with ``hand_off()``.
+        """
+        with self._lock:
+            single_use = chat_session_id in self._single_use
+            entry = self._single_use.pop(chat_session_id, None)
+        session = self._acquire(chat_session_id, entry)
+        try:
+            yield session
+        except BaseException:
+            session.disconnect()
+            raise
+        if single_use:
+            session.disconnect()
+        else:
+            self._release(chat_session_id, session)
+
+    def hand_off(
+        self,
+        chat_session_id: str,
+        session: Session | None = None,
+        opened_at: float | None = None,
+    ) -> None:
+        """Register a chat session that will serve exactly one query.
+
+        Args:
+            chat_session_id: The chat session.
+            session: Its connection, if already opened; it is used for the
+                query without a new handshake.
+            opened_at: ``time.monotonic()`` when ``session`` was connected;
+                older connections are pinged before use.
+        """
+        with self._lock:
+            self._single_use[chat_session_id] = (
+                (opened_at or time.monotonic(), session) if session is not None else None
+            )
+
+    def forget(self, chat_session_id: str) -> None:
+        """Close any connection kept for ``chat_session_id``, e.g. before the
+        chat session is deleted."""
+        with self._lock:
+            entries = self._idle.pop(chat_session_id, [])
+            handed_off = self._single_use.pop(chat_session_id, None)
+        if handed_off is not None:
+            entries.append(handed_off)
+        for _, session in entries:
+            session.disconnect()
+
+    def _acquire(
+        self, chat_session_id: str, entry: tuple[float, Session] | None = None
+    ) -> Session:
+        if entry is None:
+            with self._lock:
+                idle = self._idle.get(chat_session_id, [])
+                entry = idle.pop() if idle else None
+                if not idle:
+                    self._idle.pop(chat_session_id, None)
+
+        started = time.monotonic()
+        # Connections released recently were pinged by keepalive() or just
+        # used; only older ones pay for a ping round trip.
+        reused = entry is not None and _is_alive(
+            entry[1], ping=started - entry[0] > self.keepalive_interval
+        )
+        if reused:
+            session = entry[1]
+        else:
+            if entry is not None:
+                entry[1].disconnect()
+            session = self.client.connect(chat_session_id)
+            session.connect()
+        self._record_checkout(reused, time.monotonic() - started)
+        return session
+
+    def _record_checkout(self, reused: bool, seconds: float) -> None:
+        with self._lock:
+            if reused:
+                self.reuses += 1
+            else:
+                self.connects += 1
+            self.connect_seconds += seconds
+
+    def _release(self, chat_session_id: str, session: Session) -> None:
+        evicted = None
+        with self._lock:
+            idle_count = sum(len(v) for v in self._idle.values())
+            if idle_count >= self.max_idle and self._idle:
+                # Evict the least recently released connection.
+                oldest = min(self._idle, key=lambda k: self._idle[k][0][0])
+                evicted = self._idle[oldest].pop(0)[1]
+                if not self._idle[oldest]:
+                    del self._idle[oldest]
+            self._idle.setdefault(chat_session_id, []).append((time.monotonic(), session))
+            self._ensure_keepalive()
+        if evicted is not None:
+            evicted.disconnect()
+
+    def _ensure_keepalive(self) -> None:
+        if self._keepalive_thread is None or not self._keepalive_thread.is_alive():
+            self._keepalive_thread = threading.Thread(
+                target=self._keepalive_loop, name="h2ogpte-keepalive", daemon=True
+            )
+            self._keepalive_thread.start()
+
+    def _keepalive_loop(self) -> None:
+        while True:
+            time.sleep(self.keepalive_interval)
+            self.keepalive()
+
+    def keepalive(self) -> None:
+        """Ping idle connections and close dead or expired ones."""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            entries = [
+                (chat_id, entry)
+                for chat_id, idle in self._idle.items()
+                for entry in idle
+            ]
+            self._idle.clear()
+
+        keep: list[tuple[str, tuple[float, Session]]] = []
+        for chat_id, (released_at, session) in entries:
+            if released_at >= cutoff and _is_alive(session):
+                keep.append((chat_id, (released_at, session)))
+            else:
+                session.disconnect()
+
+        with self._lock:
+            for chat_id, entry in keep:
+                self._idle.setdefault(chat_id, []).append(entry)
+
+    def close(self) -> None:
+        """Disconnect every idle and handed-off connection."""
+        with self._lock:
+            sessions = [s for idle in self._idle.values() for _, s in idle]
+            sessions += [entry[1] for entry in self._single_use.values() if entry]
+            self._idle.clear()
+            self._single_use.clear()
+        for session in sessions:
+            session.disconnect()
+
+    def stats(self) -> dict[str, float | int]:
+        checkouts = self.connects + self.reuses
+        return {
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "idle": sum(len(v) for v in self._idle.values()),
+            "avg_connect_ms": (
+                round(1000 * self.connect_seconds / checkouts, 1) if checkouts else 0.0
+            ),
+        }
+
+
+_pools: dict[int, SessionConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_session_pool(client: H2OGPTE) -> SessionConnectionPool:
+    """Return the connection pool shared by every caller of this client."""
+    with _pools_lock:
+        pool = _pools.get(id(client))
+        if pool is None:
+            pool = SessionConnectionPool(client)
+            _pools[id(client)] = pool
+        return pool
+
+
+def _pooling_enabled() -> bool:
+    return os.getenv("H2OGPTE_SESSION_POOL", "1") != "0"
+
+
+@contextmanager
+def connect_session(client: H2OGPTE, chat_session_id: str) -> Iterator[Session]:
+    """Drop-in replacement for ``client.connect(chat_session_id)``.
+
+    Uses the client's pooled connections unless ``H2OGPTE_SESSION_POOL`` is
+    set to ``0``, which restores one connection per query so the connect
+    overhead can be compared. Either way the per-checkout connect time is
+    recorded in the pool's ``stats()``.
+    """
+    pool = get_session_pool(client)
+    if not _pooling_enabled():
+        started = time.monotonic()
+        with client.connect(chat_session_id) as session:
+            pool._record_checkout(False, time.monotonic() - started)
+            yield session
+        return
+
+    with pool.session(chat_session_id) as session:
+        yield session
+
+
+class ChatSessionPool:
+    """Pre-created chat sessions for one collection.
+
+    ``create_chat_session`` is a blocking round trip before every agent
+    run, and so is opening its websocket. The pool creates sessions and
+    connects them ahead of time in a background thread and hands each one
+    out exactly once, so a request can start its query immediately. On
+    checkout the open connection is handed to the client's
+    ``SessionConnectionPool`` as single use (see ``hand_off()``). Up to
+    ``size`` sessions are kept ready; the refill thread wakes after every
+    checkout and deletes sessions that sat unused longer than ``max_age``.
+    When the pool is empty (or ``size`` is 0) a session is created on the
+    caller's thread as before. Callers ``release()`` a session when their
+    request is done, which deletes it.
+    """
+
+    def __init__(
+        self,
+        client: H2OGPTE,
+        collection_id: str,
+        size: int = CHAT_POOL_SIZE,
+        max_age: float = CHAT_POOL_MAX_AGE,
+    ):
+        self.client = client
+        self.collection_id = collection_id
+        self.size = size
+        self.max_age = max_age
+        self._ready: deque[tuple[float, str, Session | None]] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.hits = 0
+        self.misses = 0
+        self.retired = 0
+        self.released = 0
+
+    def start(self) -> None:
+        """Fill the pool in a daemon thread and keep it filled."""
+        if self.size <= 0:
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._refill_loop,
+                    name=f"chat-sessions-{self.collection_id[:8]}",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def acquire(self) -> str:
+        """Return a chat session ID that no other caller has been given."""
+        cutoff = time.monotonic() - self.max_age
+        entry = None
+        with self._lock:
+            # Oldest first, so sessions are used before they expire. Expired
+            # ones are left for the refill thread to delete.
+            for i, ready in enumerate(self._ready):
+                if ready[0] >= cutoff:
+                    del self._ready[i]
+                    entry = ready
+                    break
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        self._wake.set()
+        if entry is None:
+            chat_id = self.client.create_chat_session(self.collection_id)
+            get_session_pool(self.client).hand_off(chat_id)
+            return chat_id
+        created, chat_id, session = entry
+        get_session_pool(self.client).hand_off(chat_id, session, created)
+        return chat_id
+
+    def release(self, chat_session_id: str) -> None:
+        """Retire a session returned by ``acquire()`` once its request is
+        done: close its connection and delete it on the server.
+
+        Failures are logged, not raised, so callers can release from a
+        ``finally`` block.
+        """
+        get_session_pool(self.client).forget(chat_session_id)
+        try:
+            self.client.delete_chat_sessions([chat_session_id])
+        except Exception as e:
+            logger.warning("Could not delete chat session %s: %s", chat_session_id, e)
+            return
+        with self._lock:
+            self.released += 1
+
+    def _refill_loop(self) -> None:
+        while True:
+            try:
+                self._retire_expired()
+                self._refill()
+            except Exception as e:
+                logger.warning("Chat session pool refill failed: %s", e)
+            self._wake.wait(max(1.0, self.max_age / 4))
+            self._wake.clear()
+
+    def _retire_expired(self) -> None:
+        cutoff = time.monotonic() - self.max_age
+        with self._lock:
+            expired = [entry for entry in self._ready if entry[0] < cutoff]
+            self._ready = deque(entry for entry in self._ready if entry[0] >= cutoff)
+            self.retired += len(expired)
+        for _, _, session in expired:
+            if session is not None:
+                session.disconnect()
+        if expired:
+            self.client.delete_chat_sessions([chat_id for _, chat_id, _ in expired])
+
+    def _refill(self) -> None:
+        while True:
+            with self._lock:
+                if len(self._ready) >= self.size:
+                    return
+            chat_id = self.client.create_chat_session(self.collection_id)
+            session = None
+            if _pooling_enabled():
+                try:
+                    session = self.client.connect(chat_id)
+                    session.connect()
+                except Exception as e:
+                    # The query connects on its own thread instead.
+                    logger.warning("Could not pre-connect chat session %s: %s", chat_id, e)
+                    session = None
+            with self._lock:
+                self._ready.append((time.monotonic(), chat_id, session))
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "ready": len(self._ready),
+                "hits": self.hits,
+                "misses": self.misses,
+                "retired": self.retired,
+                "released": self.released,
+            }
+
+
+_chat_pools: dict[tuple[int, str], ChatSessionPool] = {}
+
+
+def get_chat_session_pool(
+    client: H2OGPTE, collection_id: str, agent_name: str
+) -> ChatSessionPool:
+    """Return the chat session pool for a collection, starting it on first use.
+
+    The pool size and session age limit come from ``chat_session_pool_size``
+    and ``chat_session_max_age`` in the agent's section of agents.yaml.
+
+    Args:
+        client: The H2OGPTE client sessions are created with.
+        collection_id: Collection the sessions belong to.
+        agent_name: Key under ``agents`` in agents.yaml (e.g. "query").
+    """
+    with _pools_lock:
+        pool = _chat_pools.get((id(client), collection_id))
+        if pool is None:
+            config = get_agent_config(agent_name)
+            pool = ChatSessionPool(
+                client,
+                collection_id,
+                size=config.get("chat_session_pool_size", CHAT_POOL_SIZE),
+                max_age=config.get("chat_session_max_age", CHAT_POOL_MAX_AGE),
+            )
+            _chat_pools[(id(client), collection_id)] = pool
+    pool.start()
+    return pool
@@ -0,0 +1,151 @@
+import logging
+import math
+import re
+
+logger = logging.getLogger(__name__)
+
+# Word runs and single punctuation marks; long words count as several tokens.
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+_TERM_RE = re.compile(r"[a-z0-9_.:-]{3,}")
+# Lines worth keeping in an extract even without query overlap: headings,
+# list items and table rows, and anything with numbers, IPs or timestamps.
+_STRUCTURE_RE = re.compile(r"^\s*(#|[-*|]|\d+\.)")
+_FACT_RE = re.compile(r"\d")
+
+_STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "are", "was", "were",
+    "what", "which", "who", "how", "any", "all", "you", "your", "please", "show",
+    "find", "list", "give", "can", "there", "their", "them", "into", "about",
+}
+
+# Items below this many tokens are dropped rather than cut to a stub.
+MIN_EXTRACT_TOKENS = 32
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in ``text``.
+
+    Roughly matches BPE tokenizers on English and log text (about four
+    characters per token) without needing a tokenizer dependency.
+    """
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _PIECE_RE.findall(text))
+
+
+def _terms(text: str) -> set[str]:
+    return {t for t in _TERM_RE.findall(text.lower()) if t not in _STOPWORDS}
+
+
+def _relevance(text: str, query_terms: set[str]) -> float:
+    """Fraction of the query's terms that appear in ``text``."""
+    if not query_terms:
+        return 0.0
+    return len(query_terms & _terms(text)) / len(query_terms)
+
+
+def extract(text: str, max_tokens: int, query: str = "") -> str:
+    """Compress ``text`` to about ``max_tokens`` by keeping its key lines.
+
+    Lines are ranked by overlap with ``query``, with a bonus for structural
+    lines (headings, bullets, table rows) and lines containing numbers. The
+    kept lines stay in their original order; gaps are marked with how many
+    tokens were omitted.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    query_terms = _terms(query)
+    lines = text.splitlines()
+    costs = [count_tokens(line) + 1 for line in lines]
+    scores = [
+        _relevance(line, query_terms)
+        + (0.3 if _STRUCTURE_RE.match(line) else 0.0)
+        + (0.2 if _FACT_RE.search(line) else 0.0)
+        for line in lines
+    ]
+    # Earlier lines win ties: answers usually lead with the summary.
+    ranked = sorted(range(len(lines)), key=lambda i: (-scores[i], i))
+
+    keep: set[int] = set()
+    used = 0
+    for i in ranked:
+        if not lines[i].strip() or used + costs[i] > max_tokens:
+            continue
+        keep.add(i)
+        used += costs[i]
+
+    out: list[str] = []
+    omitted = 0
+    for i, line in enumerate(lines):
+        if i in keep:
+            if omitted:
+                out.append(f"[... {omitted} tokens omitted ...]")
+                omitted = 0
+            out.append(line)
+        else:
+            omitted += costs[i]
+    if omitted:
+        out.append(f"[... {omitted} tokens omitted ...]")
+    return "\n".join(out)
+
+
+def fit_to_budget(
+    texts: list[str], budget: int, query: str = "", label: str = "context"
+) -> list[str]:
+    """Fit several pieces of prompt context into one token budget.
+
+    Pieces are ranked by relevance to ``query`` and, after that, by recency
+    (later pieces are assumed newer). The highest-ranked pieces are kept
+    whole while they fit; the rest share what is left of the budget as
+    extracts (see ``extract``), or are dropped if their share is too small.
+    Tokens saved are logged under ``label``.
+
+    Args:
+        texts: Context pieces, oldest first.
+        budget: Maximum total tokens for all pieces together.
+        query: The task the context is for, used to judge relevance.
+        label: Name for the log line, e.g. the request and target agent.
+
+    Returns:
+        The fitted pieces, in the original order. Dropped pieces are empty
+        strings.
+    """
+    costs = [count_tokens(text) for text in texts]
+    total = sum(costs)
+    if total <= budget:
+        return list(texts)
+
+    query_terms = _terms(query)
+    count = len(texts)
+    ranked = sorted(
+        range(count),
+        key=lambda i: (_relevance(texts[i], query_terms), i / count),
+        reverse=True,
+    )
+
+    fitted = [""] * count
+    remaining = budget
+    leftover: list[int] = []
+    for position, i in enumerate(ranked):
+        # Leave room for at least a minimal extract of every lower-ranked piece.
+        reserve = MIN_EXTRACT_TOKENS * (count - position - 1)
+        if costs[i] <= remaining - reserve:
+            fitted[i] = texts[i]
+            remaining -= costs[i]
+        else:
+            leftover.append(i)
+
+    for position, i in enumerate(leftover):
+        share = remaining // (len(leftover) - position)
+        if share >= MIN_EXTRACT_TOKENS:
+            fitted[i] = extract(texts[i], share, query)
+            remaining -= count_tokens(fitted[i])
+
+    kept = sum(count_tokens(text) for text in fitted)
+    logger.info(
+        "Context %s: %d -> %d tokens (saved %d, budget %d)",
+        label,
+        total,
+        kept,
+        total - kept,
+        budget,
+    )
+    return fitted
@@ -0,0 +1,100 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from src.core.config import get_agent_config
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 8
+
+_executors: dict[str, "H2OGPTEExecutor"] = {}
+_executors_lock = threading.Lock()
+
+
+class H2OGPTEExecutor:
+    """Bounded thread pool for blocking H2OGPTE SDK calls.
+
+    Keeps long agent runs off the default asyncio executor so they cannot
+    starve unrelated blocking work, and tracks how many calls are waiting
+    for a worker (``queued``) and how many are running (``in_flight``).
+    """
+
+    def __init__(self, name: str, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"h2ogpte-{name}"
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+
+    def _track(self, fn: Callable[..., T]) -> T:
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def _on_done(self, future: Future) -> None:
+        # A call cancelled while still queued never reaches _track.
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call in the pool, like ``asyncio.to_thread``.
+
+        Context variables are copied into the worker thread. Cancelling the
+        caller while the call is still queued removes it from the pool.
+        """
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, fn, *args, **kwargs)
+        with self._lock:
+            self.queued += 1
+        future = self._pool.submit(self._track, call)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, int | str]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_h2ogpte_executor(agent_name: str) -> H2OGPTEExecutor:
+    """Return the shared H2OGPTE executor for an agent, creating it on first use.
+
+    The pool size comes from ``h2ogpte_max_workers`` in the agent's section
+    of agents.yaml.
+
+    Args:
+        agent_name: Key under ``agents`` in agents.yaml (e.g. "host", "query").
+    """
+    with _executors_lock:
+        executor = _executors.get(agent_name)
+        if executor is None:
+            max_workers = get_agent_config(agent_name).get(
+                "h2ogpte_max_workers", DEFAULT_MAX_WORKERS
+            )
+            executor = H2OGPTEExecutor(agent_name, max_workers=max_workers)
+            _executors[agent_name] = executor
+        return executor
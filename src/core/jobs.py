@@ -0,0 +1,89 @@
+import logging
+import random
+import time
+from collections.abc import Callable, Iterator
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class JobTimeoutError(TimeoutError):
+    """Raised when a job is still running at the waiter's deadline."""
+
+
+def backoff_delays(
+    initial: float = 0.5,
+    maximum: float = 10.0,
+    multiplier: float = 2.0,
+    jitter: float = 0.2,
+) -> Iterator[float]:
+    """Yield exponentially growing delays, capped at ``maximum``.
+
+    Each delay is scaled by a random factor in ``1 +/- jitter`` so that
+    waiters started together do not poll in lockstep.
+    """
+    delay = initial
+    while True:
+        yield delay * random.uniform(1 - jitter, 1 + jitter)
+        delay = min(delay * multiplier, maximum)
+
+
+def _next_delay(
+    delays: Iterator[float], started: float, timeout: float | None, description: str
+) -> float:
+    """The next sleep, shortened to the deadline; raises once it has passed."""
+    delay = next(delays)
+    if timeout is None:
+        return delay
+    remaining = timeout - (time.monotonic() - started)
+    if remaining <= 0:
+        raise JobTimeoutError(f"{description} did not finish within {timeout}s")
+    return min(delay, remaining)
+
+
+def wait_for_job(
+    poll: Callable[[], T],
+    done: Callable[[T], bool],
+    description: str = "job",
+    timeout: float | None = None,
+    initial_interval: float = 0.5,
+    max_interval: float = 10.0,
+    on_progress: Callable[[T, float], None] | None = None,
+) -> T:
+    """Poll a long-running remote job until it finishes.
+
+    Polls immediately, then backs off exponentially (with jitter) from
+    ``initial_interval`` up to ``max_interval``, so short jobs are noticed
+    quickly and long ones do not flood the server. ``poll`` should raise
+    if the job failed.
+
+    Args:
+        poll: Fetches the job's current status.
+        done: Whether a status means the job has finished.
+        description: Names the job in logs and errors.
+        timeout: Seconds to wait overall; None waits indefinitely.
+        initial_interval: First delay between polls, in seconds.
+        max_interval: Longest delay between polls, in seconds.
+        on_progress: Called with each unfinished status and the seconds
+            elapsed.
+
+    Returns:
+        The finished status.
+
+    Raises:
+        JobTimeoutError: If the job is still running after ``timeout``.
+    """
+    started = time.monotonic()
+    delays = backoff_delays(initial_interval, max_interval)
+    while True:
+        status = poll()
+        elapsed = time.monotonic() - started
+        if done(status):
+            logger.info("%s finished after %.1fs.", description, elapsed)
+            return status
+        if on_progress is not None:
+            on_progress(status, elapsed)
+        time.sleep(_next_delay(delays, started, timeout, description))
+
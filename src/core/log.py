@@ -0,0 +1,136 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from typing import Any
+
+# ID of the user request being handled, carried from the host to remote
+# agents in A2A message metadata under CORRELATION_KEY.
+CORRELATION_KEY = "correlation_id"
+correlation_id: ContextVar[str] = ContextVar("correlation_id", default="-")
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def bind_correlation_id(value: str | None = None) -> str:
+    """Set the correlation ID for the current task or thread.
+
+    Args:
+        value: An ID received from the caller; a new one is generated if
+            omitted.
+
+    Returns:
+        The ID now in effect.
+    """
+    value = value or uuid.uuid4().hex[:12]
+    correlation_id.set(value)
+    return value
+
+
+def truncate(text: str, limit: int | None = None) -> str:
+    """Shorten ``text`` to ``limit`` characters (``LOG_MAX_CHARS``)."""
+    if limit is None:
+        limit = int(os.getenv("LOG_MAX_CHARS", "500"))
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [+{len(text) - limit} chars]"
+
+
+class Payload:
+    """A log argument rendered only if its record's level is enabled.
+
+    Pydantic models are serialized to JSON and other values with ``repr``,
+    then truncated. Bodies over the limit are logged in full for a
+    ``LOG_BODY_SAMPLE_RATE`` fraction of records, so large responses can
+    still be inspected without paying for every one of them.
+    """
+
+    def __init__(self, value: Any, limit: int | None = None):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        if hasattr(self.value, "model_dump_json"):
+            text = self.value.model_dump_json(exclude_none=True)
+        elif isinstance(self.value, str):
+            text = self.value
+        else:
+            text = repr(self.value)
+        if random.random() < float(os.getenv("LOG_BODY_SAMPLE_RATE", "0.01")):
+            return text
+        return truncate(text, self.limit)
+
+
+class _CorrelationFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = correlation_id.get()
+        return True
+
+
+class _JsonFormatter(logging.Formatter):
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "service": self.service,
+            "level": record.levelname,
+            "logger": record.name,
+            "correlation_id": record.correlation_id,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+def setup_logging(service: str) -> None:
+    """Route all logging through a queue to a background writer thread.
+
+    Callers only enqueue records, so logging never blocks on stdout. The
+    correlation ID is captured when the record is created, before it
+    crosses to the writer thread. Safe to call more than once.
+
+    Reads ``LOG_LEVEL`` (default ``INFO``) and ``LOG_FORMAT`` (``text`` or
+    ``json``).
+
+    Args:
+        service: Name of the process (e.g. "host"), shown in text output.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        stream.setFormatter(_JsonFormatter(service))
+    else:
+        stream.setFormatter(
+            logging.Formatter(
+                f"%(asctime)s %(levelname)s {service} %(name)s "
+                "[%(correlation_id)s] %(message)s"
+            )
+        )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(_CorrelationFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    # Per-request HTTP logs from the client libraries drown everything else.
+    for noisy in ("httpx", "httpcore"):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,165 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from src.core.config import get_agent_config
+
+logger = logging.getLogger(__name__)
+
+# Metadata key set on the A2A message of an answer served from the cache, so
+# callers can tell it apart from a real run (e.g. to leave it out of latency
+# statistics).
+CACHED_KEY = "cached"
+
+
+def _key(task: str) -> str:
+    return hashlib.sha256(" ".join(task.lower().split()).encode()).hexdigest()
+
+
+class ResponseCache:
+    """LRU cache of agent answers with a TTL and data-change invalidation.
+
+    Entries are keyed on the task text (case and whitespace insensitive).
+    Each entry also records the data ``fingerprint`` it was computed
+    against; when the fingerprint changes, every entry is dropped. The
+    fingerprint is refreshed at most every ``fingerprint_interval`` seconds.
+    If it cannot be computed, the cache is bypassed rather than risk
+    serving stale answers.
+
+    Methods may block on the fingerprint call; run them in a thread from
+    async code.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 900,
+        max_entries: int = 256,
+        fingerprint: Callable[[], str] | None = None,
+        fingerprint_interval: float = 30,
+        enabled: bool = True,
+    ):
+        """
+        Args:
+            ttl: Seconds an answer stays valid.
+            max_entries: Maximum number of answers kept before the least
+                recently used one is evicted.
+            fingerprint: Returns a short string that changes whenever the
+                underlying data changes.
+            fingerprint_interval: Seconds a computed fingerprint is reused.
+            enabled: Whether lookups and stores are active.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.fingerprint = fingerprint
+        self.fingerprint_interval = fingerprint_interval
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, tuple[float, str, str]] = OrderedDict()
+        self._current: str | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _current_fingerprint(self) -> str | None:
+        """The data fingerprint, recomputed once it is older than the interval.
+
+        Clears the cache when it changed. Returns None if it could not be
+        computed.
+        """
+        if self.fingerprint is None:
+            return ""
+        now = time.monotonic()
+        with self._lock:
+            if self._current is not None and now - self._checked_at < self.fingerprint_interval:
+                return self._current
+        try:
+            current = self.fingerprint()
+        except Exception as e:
+            logger.warning("Response cache fingerprint failed, bypassing cache: %s", e)
+            return None
+        with self._lock:
+            if self._current is not None and current != self._current and self._entries:
+                self.invalidations += 1
+                logger.info(
+                    "Data fingerprint changed; dropping %d cached answer(s).",
+                    len(self._entries),
+                )
+                self._entries.clear()
+            self._current = current
+            self._checked_at = now
+        return current
+
+    def get(self, task: str) -> str | None:
+        """Return the cached answer for ``task``, or None."""
+        if not self.enabled:
+            return None
+        fingerprint = self._current_fingerprint()
+        key = _key(task)
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is None
+                or fingerprint is None
+                or entry[1] != fingerprint
+                or time.monotonic() - entry[0] > self.ttl
+            ):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, task: str, response: str) -> None:
+        if not self.enabled:
+            return
+        fingerprint = self._current_fingerprint()
+        if fingerprint is None:
+            return
+        key = _key(task)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), fingerprint, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int | bool]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+def get_response_cache(
+    agent_name: str, fingerprint: Callable[[], str] | None = None
+) -> ResponseCache:
+    """Build an agent's response cache from its section of agents.yaml.
+
+    Reads ``response_cache_enabled``, ``response_cache_ttl``,
+    ``response_cache_max_entries`` and ``index_fingerprint_interval``.
+
+    Args:
+        agent_name: Key under ``agents`` in agents.yaml (e.g. "query").
+        fingerprint: Returns a string that changes when the agent's data does.
+    """
+    config = get_agent_config(agent_name)
+    return ResponseCache(
+        ttl=config.get("response_cache_ttl", 900),
+        max_entries=config.get("response_cache_max_entries", 256),
+        fingerprint=fingerprint,
+        fingerprint_interval=config.get("index_fingerprint_interval", 30),
+        enabled=config.get("response_cache_enabled", False),
+    )
@@ -1,9 +1,17 @@
+import hashlib
 import io
 import json
+import logging
 import os
-import time
+import threading
 
 from h2ogpte import H2OGPTE
+from h2ogpte.types import Job
+
+from src.core.config import get_agent_config
+from src.core.jobs import JobTimeoutError, wait_for_job
+
+logger = logging.getLogger(__name__)
 
 MCP_CONFIG_PATH = "config/mcp_config.json"
 _PLACEHOLDERS = {
@@ -11,6 +19,15 @@ _PLACEHOLDERS = {
     "YOUR_JIRA_MCP_URL": "JIRA_MCP_URL",
 }
 
+# Seconds the MCP config ingestion may take before it is cancelled.
+INGEST_TIMEOUT = 600
+
+# IDs created by earlier starts, with a hash of the inputs each was built
+# from; see ensure_collection(), ensure_mcp_tool() and ensure_agent_keys().
+BOOTSTRAP_STATE_PATH = "bootstrap_state.json"
+_state_lock = threading.Lock()
+
+
 def _load_mcp_config() -> str:
     """Read mcp_config.json and substitute MCP URLs from the environment."""
     with open(MCP_CONFIG_PATH, "r") as f:
@@ -29,20 +46,68 @@ def _load_mcp_config() -> str:
     return content
 
 
+def _inputs_hash(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def _state_path() -> str:
+    return os.getenv("BOOTSTRAP_STATE_PATH", BOOTSTRAP_STATE_PATH)
+
+
+def _read_state() -> dict:
+    try:
+        with open(_state_path(), "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable bootstrap state %s: %s", _state_path(), e)
+        return {}
+
+
+def _get_step(step: str) -> dict | None:
+    """The recorded result of a bootstrap step on this H2OGPTE server."""
+    return _read_state().get(os.getenv("H2OGPTE_ADDRESS", ""), {}).get(step)
+
+
+def _record_step(step: str, entry: dict) -> None:
+    """Record a bootstrap step's result, replacing the state file atomically."""
+    path = _state_path()
+    with _state_lock:
+        state = _read_state()
+        state.setdefault(os.getenv("H2OGPTE_ADDRESS", ""), {})[step] = entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+def _collection_exists(client: H2OGPTE, collection_id: str) -> bool:
+    try:
+        client.get_collection(collection_id)
+    except Exception:
+        return False
+    return True
+
+
+def _tool_id(tool) -> str:
+    return tool["id"] if isinstance(tool, dict) else tool.id
+
+
 def create_collection(client: H2OGPTE, collection_name: str, collection_desc: str) -> str:
     """Create a new H2OGPTE collection for the Splunk agent."""
     collection_id = client.create_collection(
         name=collection_name,
         description=collection_desc,
     )
-    print(f"Collection created: {collection_id}")
+    logger.info("Collection created: %s", collection_id)
     return collection_id
 
 
 def create_chat(client: H2OGPTE, collection_id: str) -> str:
     """Create a new chat session in the specified collection."""
     chat_session_id = client.create_chat_session(collection_id)
-    print(f"Chat session created: {chat_session_id}")
+    logger.info("Chat session created: %s", chat_session_id)
     return chat_session_id
 
 
@@ -57,19 +122,68 @@ def upload_and_ingest_mcp_config(client: H2OGPTE, collection_id: str) -> str:
         ingest_mode="agent_only",
     )
 
-    print("Waiting for ingestion...")
-    while True:
-        job_status = client.get_job(ingest_job.id)
-        if job_status.completed:
-            print("Ingestion complete.")
-            break
-        if job_status.failed:
-            raise RuntimeError(f"Ingestion failed: {job_status.errors}")
-        time.sleep(2)
+    def poll() -> Job:
+        job = client.get_job(ingest_job.id)
+        if job.failed or job.canceled:
+            raise RuntimeError(f"Ingestion failed: {job.errors}")
+        return job
+
+    logger.info("Waiting for ingestion...")
+    try:
+        wait_for_job(
+            poll,
+            lambda job: job.completed,
+            description="Ingestion",
+            timeout=INGEST_TIMEOUT,
+            on_progress=lambda job, elapsed: logger.info(
+                "Ingestion %.0f%% after %.0fs...", job.progress * 100, elapsed
+            ),
+        )
+    except JobTimeoutError:
+        client.cancel_job(ingest_job.id)
+        raise
 
     return upload_id
 
 
+def ensure_collection(
+    client: H2OGPTE, agent_name: str, collection_name: str, collection_desc: str
+) -> str:
+    """Return the agent's collection with the MCP config ingested.
+
+    The collection from the last start is reused while it still exists and
+    its inputs (name, description, rendered MCP config and the agent's
+    ``agent_tools``) are unchanged. Otherwise a new one is created and
+    ingested, and the outdated one is deleted.
+
+    Args:
+        agent_name: Key under ``agents`` in agents.yaml (e.g. "query").
+    """
+    step = f"collection:{collection_name}"
+    inputs = _inputs_hash(
+        collection_name,
+        collection_desc,
+        _load_mcp_config(),
+        get_agent_config(agent_name).get("agent_tools"),
+    )
+    previous = _get_step(step)
+    if previous and previous["hash"] == inputs and _collection_exists(client, previous["id"]):
+        logger.info("Reusing collection %s for %s.", previous["id"], collection_name)
+        return previous["id"]
+
+    collection_id = create_collection(client, collection_name, collection_desc)
+    upload_and_ingest_mcp_config(client, collection_id)
+    _record_step(step, {"hash": inputs, "id": collection_id})
+
+    if previous and previous["hash"] != inputs:
+        try:
+            client.delete_collections([previous["id"]])
+            logger.info("Deleted outdated collection %s.", previous["id"])
+        except Exception as e:
+            logger.warning("Could not delete outdated collection %s: %s", previous["id"], e)
+    return collection_id
+
+
 def register_mcp_tool(client: H2OGPTE) -> list:
     """Register the Splunk MCP tool with H2OGPTE."""
     json_str = _load_mcp_config()
@@ -82,13 +196,35 @@ def register_mcp_tool(client: H2OGPTE) -> list:
         },
         custom_tool_path=MCP_CONFIG_PATH,
     )
-    print(f"MCP tool registered: {tool_ids}")
+    logger.info("MCP tool registered: %s", tool_ids)
     return tool_ids
 
 
-def setup_agent_keys(client: H2OGPTE) -> None:
-    """Ensure agent keys for MCP env vars exist, reusing or creating as needed."""
-    required_keys = {
+def ensure_mcp_tool(client: H2OGPTE) -> list:
+    """Register the MCP tool unless the one registered last time still
+    exists and was built from the same rendered MCP config.
+
+    When the config changed, the outdated tool is deleted first.
+    """
+    inputs = _inputs_hash(_load_mcp_config())
+    previous = _get_step("mcp_tool")
+    if previous:
+        registered = {_tool_id(tool) for tool in client.get_custom_agent_tools()}
+        current = [tid for tid in previous["ids"] if tid in registered]
+        if previous["hash"] == inputs and current and current == previous["ids"]:
+            logger.info("Reusing MCP tool: %s", current)
+            return current
+        if current:
+            client.delete_custom_agent_tool(current)
+            logger.info("Deleted outdated MCP tool: %s", current)
+
+    tool_ids = register_mcp_tool(client)
+    _record_step("mcp_tool", {"hash": inputs, "ids": tool_ids})
+    return tool_ids
+
+
+def _required_agent_keys() -> dict[str, str | None]:
+    return {
         "H2OGPTE_API_KEY": os.getenv("H2OGPTE_API_KEY"),
         "H2OGPTE_ADDRESS": os.getenv("H2OGPTE_ADDRESS"),
         "SPLUNK_MCP_TOKEN": os.getenv("SPLUNK_MCP_TOKEN"),
@@ -97,6 +233,18 @@ def setup_agent_keys(client: H2OGPTE) -> None:
         "JIRA_API_TOKEN": os.getenv("JIRA_API_TOKEN"),
     }
 
+
+def setup_agent_keys(client: H2OGPTE, update_values: bool = False) -> dict[str, str]:
+    """Ensure agent keys for MCP env vars exist, reusing or creating as needed.
+
+    Args:
+        update_values: Also write the current values into reused keys.
+
+    Returns:
+        The key IDs by name.
+    """
+    required_keys = _required_agent_keys()
+
     existing = {
         k["name"]: k["id"]
         for k in client.get_agent_keys()
@@ -114,9 +262,12 @@ def setup_agent_keys(client: H2OGPTE) -> None:
                 }
             ])
             existing[name] = result[0]["agent_key_id"]
-            print(f"  Created agent key: {name}")
+            logger.info("Created agent key: %s", name)
+        elif update_values:
+            client.update_agent_key(existing[name], value=value)
+            logger.info("Updated agent key: %s", name)
         else:
-            print(f"  Reusing agent key: {name}")
+            logger.info("Reusing agent key: %s", name)
 
     with open(MCP_CONFIG_PATH, "r") as f:
         mcp_config = json.load(f)
@@ -130,4 +281,27 @@ def setup_agent_keys(client: H2OGPTE) -> None:
                 "keys": key_assignments,
             }
         }])
-    print("Agent keys associated with MCP tools.")
+    logger.info("Agent keys associated with MCP tools.")
+    return existing
+
+
+def ensure_agent_keys(client: H2OGPTE) -> None:
+    """Run setup_agent_keys() unless the keys and tool assignments made last
+    time still exist and the key values and MCP tool are unchanged.
+
+    Only a hash of the key values is recorded, never the values.
+    """
+    with open(MCP_CONFIG_PATH, "r") as f:
+        tool_names = sorted(json.load(f)["mcpServers"])
+    # A re-registered MCP tool needs its keys assigned again.
+    tool = _get_step("mcp_tool")
+    inputs = _inputs_hash(_required_agent_keys(), tool_names, tool and tool["ids"])
+    previous = _get_step("agent_keys")
+    if previous and previous["hash"] == inputs:
+        present = {k["id"] for k in client.get_agent_keys()}
+        if set(previous["ids"].values()) <= present:
+            logger.info("Agent keys unchanged; reusing tool assignments.")
+            return
+
+    key_ids = setup_agent_keys(client, update_values=previous is not None)
+    _record_step("agent_keys", {"hash": inputs, "ids": key_ids})
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import logging
+import os
+
+import requests
+import urllib3
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+logger = logging.getLogger(__name__)
+
+
+def splunk_rest(
+    endpoint: str, method: str = "GET", timeout: float | None = None, **params
+) -> requests.Response:
+    """Call a Splunk REST API endpoint with basic auth.
+
+    Args:
+        endpoint: The REST path, e.g. "/services/data/indexes".
+        method: HTTP method (GET or POST).
+        timeout: Optional request timeout in seconds.
+        **params: Extra query/form params forwarded to the request.
+
+    Returns:
+        The HTTP response object.
+    """
+    host = os.environ.get("SPLUNK_HOST", "localhost")
+    port = os.environ.get("SPLUNK_MGMT_PORT", "8089")
+    username = os.environ.get("SPLUNK_USERNAME", "admin")
+    password = os.environ.get("SPLUNK_PASSWORD", "")
+
+    url = f"https://{host}:{port}{endpoint}"
+    auth = (username, password)
+
+    params["output_mode"] = "json"
+
+    if method.upper() == "GET":
+        return requests.get(url, params=params, auth=auth, verify=False, timeout=timeout)
+    return requests.post(url, data=params, auth=auth, verify=False, timeout=timeout)
+
+
+def index_fingerprint(entries: list[dict]) -> str:
+    """Hash the names, event counts and latest event times of user indexes,
+    from /services/data/indexes entries.
+
+    Internal ``_`` indexes are left out: Splunk writes to them all the time,
+    so including them would empty the cache on every check even when no
+    user data changed. New events in a user index do change the
+    fingerprint, so answers about recent activity go stale for at most the
+    fingerprint interval.
+    """
+    summary = sorted(
+        (
+            entry["name"],
+            entry.get("content", {}).get("totalEventCount"),
+            entry.get("content", {}).get("maxTime"),
+        )
+        for entry in entries
+        if not entry["name"].startswith("_")
+    )
+    return hashlib.sha256(json.dumps(summary).encode()).hexdigest()[:16]
+
+
+def get_index_fingerprint() -> str:
+    """Fingerprint the Splunk indexes (see ``index_fingerprint``) with one
+    cheap REST call, for ``ResponseCache`` invalidation."""
+    resp = splunk_rest(
+        "/services/data/indexes",
+        timeout=10,
+        count=0,
+        f=["totalEventCount", "maxTime"],
+    )
+    resp.raise_for_status()
+    return index_fingerprint(resp.json().get("entry", []))
@@ -0,0 +1,21 @@
+import sqlite3
+from contextlib import closing
+
+
+def execute(db_path: str, sql: str, params: tuple = ()) -> tuple[list[tuple], int]:
+    """Run one statement in its own short-lived, committed connection.
+
+    Opening a connection per statement keeps the stores safe to call from
+    any worker thread, and lets several processes share the file.
+
+    Args:
+        db_path: Path of the SQLite file.
+        sql: The statement to run.
+        params: Values bound to the statement's placeholders.
+
+    Returns:
+        The fetched rows and the affected row count.
+    """
+    with closing(sqlite3.connect(db_path, timeout=10)) as conn, conn:
+        cursor = conn.execute(sql, params)
+        return cursor.fetchall(), cursor.rowcount
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+from typing import Any, Self
+
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Part, TaskState, TextPart
+from h2ogpte.types import PartialChatMessage
+
+# Minimum seconds between two token updates; deltas arriving faster are
+# coalesced into the next update.
+DEFAULT_MIN_INTERVAL = 0.25
+
+# Metadata key naming the kind of a streamed update ("delta" or "status"),
+# set on both the status event and its message.
+STREAM_KEY = "stream"
+
+
+class QueryCancelledError(Exception):
+    """Raised in the H2OGPTE worker thread to abort a cancelled query."""
+
+
+class TaskStreamer:
+    """Publishes H2OGPTE partial output for an A2A task as status updates.
+
+    ``on_message`` is passed as the ``callback`` of ``session.query`` and runs
+    in the H2OGPTE worker thread. Deltas are buffered and a pump on the event
+    loop sends them as ``working`` ``TaskStatusUpdateEvent``s, at most one per
+    ``min_interval``. Token updates carry ``{"stream": "delta"}`` metadata and
+    step updates sent with ``status()`` carry ``{"stream": "status"}``; the
+    same metadata is set on the update's message, so task stores can leave
+    deltas out of the persisted history.
+
+    Use as an async context manager; leaving it flushes any buffered text.
+
+    ``cancel()`` stops publishing and makes the next ``on_message`` call
+    raise QueryCancelledError, which aborts ``session.query`` and closes
+    its websocket. The H2OGPTE SDK has no call to stop a chat query, so
+    this is the earliest point the worker thread can be released.
+    """
+
+    def __init__(self, updater: TaskUpdater, min_interval: float = DEFAULT_MIN_INTERVAL):
+        self.updater = updater
+        self.min_interval = min_interval
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+        self._wake = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pump_task: asyncio.Task | None = None
+        self._closed = False
+        self._cancelled = threading.Event()
+        self.updates = 0
+
+    async def __aenter__(self) -> Self:
+        self._loop = asyncio.get_running_loop()
+        self._pump_task = asyncio.create_task(self._pump())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._closed = True
+        self._wake.set()
+        if self._pump_task is not None:
+            await self._pump_task
+
+    def on_message(self, message: Any) -> None:
+        """H2OGPTE query callback; buffers partial messages (thread-safe).
+
+        The final ``ChatMessage`` is ignored, the caller sends it on completion.
+
+        Raises:
+            QueryCancelledError: If the task was cancelled.
+        """
+        if self._cancelled.is_set():
+            raise QueryCancelledError()
+        if not isinstance(message, PartialChatMessage) or not message.content:
+            return
+        with self._lock:
+            self._buffer.append(message.content)
+        if self._loop is not None and not self._closed:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def cancel(self) -> None:
+        """Abort the query at its next partial message and stop publishing."""
+        self._cancelled.set()
+        self._closed = True
+        self._wake.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    async def status(self, text: str) -> None:
+        """Send a step update such as "Running agent..." immediately."""
+        await self._send(text, "status")
+
+    async def _send(self, text: str, kind: str) -> None:
+        metadata = {STREAM_KEY: kind}
+        message = self.updater.new_agent_message(
+            [Part(root=TextPart(text=text))], metadata=metadata
+        )
+        await self.updater.update_status(
+            TaskState.working, message=message, metadata=metadata
+        )
+        self.updates += 1
+
+    def _take(self) -> str:
+        with self._lock:
+            text = "".join(self._buffer)
+            self._buffer.clear()
+        return text
+
+    async def _pump(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            chunk = self._take()
+            if chunk and not self.cancelled:
+                await self._send(chunk, "delta")
+            if self._closed:
+                return
+            await asyncio.sleep(self.min_interval)
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import InMemoryTaskStore, TaskStore
+from a2a.types import Task
+
+from src.core.config import get_agent_config
+from src.core.sqlite import execute
+from src.core.streaming import STREAM_KEY
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between eviction sweeps triggered from save().
+SWEEP_INTERVAL = 60
+
+
+def _without_deltas(task: Task) -> Task:
+    """A copy of ``task`` without streamed token deltas in its history.
+
+    The A2A task manager moves every status message into the history and
+    saves the whole task on each update, so keeping the deltas (one every
+    ``DEFAULT_MIN_INTERVAL``) would make a long answer cost quadratic bytes
+    to persist. The final answer is sent as its own message, so nothing is
+    lost.
+    """
+    if not task.history:
+        return task
+    history = [
+        message
+        for message in task.history
+        if (message.metadata or {}).get(STREAM_KEY) != "delta"
+    ]
+    if len(history) == len(task.history):
+        return task
+    return task.model_copy(update={"history": history})
+
+
+class BoundedInMemoryTaskStore(InMemoryTaskStore):
+    """InMemoryTaskStore that forgets tasks not updated for ``ttl`` seconds
+    and keeps at most ``max_tasks``, dropping the least recently updated.
+    Streamed token deltas are left out of the stored history."""
+
+    def __init__(self, ttl: float = 3600, max_tasks: int = 10000):
+        super().__init__()
+        self.ttl = ttl
+        self.max_tasks = max_tasks
+        self._updated: OrderedDict[str, float] = OrderedDict()
+
+    async def save(self, task: Task, context: ServerCallContext | None = None) -> None:
+        await super().save(_without_deltas(task), context)
+        now = time.monotonic()
+        async with self.lock:
+            self._updated[task.id] = now
+            self._updated.move_to_end(task.id)
+            while self._updated and (
+                len(self._updated) > self.max_tasks
+                or next(iter(self._updated.values())) < now - self.ttl
+            ):
+                task_id, _ = self._updated.popitem(last=False)
+                self.tasks.pop(task_id, None)
+
+    async def delete(self, task_id: str, context: ServerCallContext | None = None) -> None:
+        await super().delete(task_id, context)
+        async with self.lock:
+            self._updated.pop(task_id, None)
+
+
+class SQLiteTaskStore(TaskStore):
+    """Keeps A2A tasks in a SQLite file (WAL mode).
+
+    Every call uses its own short-lived connection, so several server
+    processes can share the file and any of them can answer ``tasks/get``
+    or ``tasks/cancel`` for a task another one created. Tasks not updated
+    for ``ttl`` seconds are deleted, and beyond ``max_tasks`` the least
+    recently updated are; both are enforced at most every
+    ``SWEEP_INTERVAL`` seconds from ``save()``. Streamed token deltas are
+    left out of the stored history.
+    """
+
+    def __init__(self, db_path: str, ttl: float = 3600, max_tasks: int = 10000):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_tasks = max_tasks
+        self._last_sweep = 0.0
+        execute(self.db_path, "PRAGMA journal_mode=WAL")
+        execute(
+            self.db_path,
+            "CREATE TABLE IF NOT EXISTS a2a_tasks ("
+            " task_id TEXT PRIMARY KEY,"
+            " task TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        execute(
+            self.db_path,
+            "CREATE INDEX IF NOT EXISTS a2a_tasks_updated_at ON a2a_tasks (updated_at)"
+        )
+
+    async def save(self, task: Task, context: ServerCallContext | None = None) -> None:
+        now = time.time()
+        await asyncio.to_thread(
+            execute,
+            self.db_path,
+            "INSERT OR REPLACE INTO a2a_tasks (task_id, task, updated_at)"
+            " VALUES (?, ?, ?)",
+            (task.id, _without_deltas(task).model_dump_json(exclude_none=True), now),
+        )
+        if now - self._last_sweep >= SWEEP_INTERVAL:
+            self._last_sweep = now
+            evicted = await asyncio.to_thread(self.evict)
+            if evicted:
+                logger.info("Evicted %d expired A2A task(s).", evicted)
+
+    async def get(
+        self, task_id: str, context: ServerCallContext | None = None
+    ) -> Task | None:
+        rows, _ = await asyncio.to_thread(
+            execute,
+            self.db_path,
+            "SELECT task FROM a2a_tasks WHERE task_id = ?",
+            (task_id,),
+        )
+        return Task.model_validate_json(rows[0][0]) if rows else None
+
+    async def delete(self, task_id: str, context: ServerCallContext | None = None) -> None:
+        await asyncio.to_thread(
+            execute,
+            self.db_path,
+            "DELETE FROM a2a_tasks WHERE task_id = ?",
+            (task_id,),
+        )
+
+    def evict(self) -> int:
+        """Drop expired tasks and any beyond ``max_tasks``; return how many."""
+        _, expired = execute(
+            self.db_path,
+            "DELETE FROM a2a_tasks WHERE updated_at < ?",
+            (time.time() - self.ttl,),
+        )
+        _, overflow = execute(
+            self.db_path,
+            "DELETE FROM a2a_tasks WHERE task_id IN ("
+            " SELECT task_id FROM a2a_tasks ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_tasks,),
+        )
+        return expired + overflow
+
+
+def create_task_store(agent_name: str) -> TaskStore:
+    """Build the A2A task store selected in an agent's section of agents.yaml.
+
+    Reads ``task_store_backend`` (``"memory"`` or ``"sqlite"``),
+    ``task_db_path``, ``task_ttl`` and ``task_max_entries``.
+
+    Args:
+        agent_name: Key under ``agents`` in agents.yaml (e.g. "query").
+
+    Raises:
+        ValueError: If the backend name is not recognised.
+    """
+    config = get_agent_config(agent_name)
+    backend = config.get("task_store_backend", "memory")
+    ttl = config.get("task_ttl", 3600)
+    max_tasks = config.get("task_max_entries", 10000)
+    if backend == "memory":
+        return BoundedInMemoryTaskStore(ttl=ttl, max_tasks=max_tasks)
+    if backend == "sqlite":
+        return SQLiteTaskStore(
+            config.get("task_db_path", f"a2a_tasks_{agent_name}.db"),
+            ttl=ttl,
+            max_tasks=max_tasks,
+        )
+    raise ValueError(f"Unknown task_store_backend '{backend}'")
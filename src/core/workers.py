@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+import uvicorn
+from h2ogpte import H2OGPTE
+from starlette.applications import Starlette
+
+from src.core.client import create_client
+from src.core.log import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Where the parent process tells its workers which address to advertise in
+# the agent card; uvicorn app factories take no arguments.
+HOST_ENV = "A2A_AGENT_HOST"
+PORT_ENV = "A2A_AGENT_PORT"
+
+
+def create_worker_app(
+    agent_name: str,
+    setup_agent: Callable[[H2OGPTE, dict[str, Any]], None],
+    build_app: Callable[[dict[str, Any], str, int], Starlette],
+    default_port: int,
+) -> Starlette:
+    """Build an agent's A2A app inside a uvicorn worker process.
+
+    The returned app's lifespan creates this worker's H2OGPTE client, runs
+    ``setup_agent`` (which reuses the collection the parent process set up)
+    and mounts ``build_app``'s routes. Everything built there, including the
+    admission limit and response cache, is per worker; the SQLite task store
+    is shared, so any worker can answer ``tasks/get`` and ``tasks/cancel``.
+
+    Args:
+        agent_name: Service name shown in the worker's logs (e.g. "query").
+        setup_agent: The agent server's ``setup_agent``.
+        build_app: The agent server's ``build_app``.
+        default_port: Port advertised when the parent did not set one.
+    """
+    setup_logging(agent_name)
+    host = os.environ.get(HOST_ENV, "0.0.0.0")
+    port = int(os.environ.get(PORT_ENV, default_port))
+    context: dict[str, Any] = {}
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        logger.info("Worker %d: setting up %s agent...", os.getpid(), agent_name)
+        await asyncio.to_thread(setup_agent, create_client(), context)
+        app.mount("/", build_app(context, host, port))
+        try:
+            yield
+        finally:
+            context.clear()
+
+    return Starlette(lifespan=lifespan)
+
+
+def run_workers(
+    app_factory: str, host: str, port: int, log_level: str, workers: int
+) -> None:
+    """Serve ``app_factory`` (an import string such as
+    ``"src.agents.splunk_query_agent.server:create_app"``) from ``workers``
+    uvicorn worker processes sharing one port."""
+    os.environ[HOST_ENV] = host
+    os.environ[PORT_ENV] = str(port)
+    uvicorn.run(
+        app_factory,
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        log_level=log_level.lower(),
+        lifespan="on",
+    )
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from a2a.utils.errors import ServerError
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from src.core.admission import (
+    ADMISSION_STATS_PATH,
+    SERVER_BUSY_CODE,
+    AdmissionController,
+    add_admission_route,
+)
+
+
+def test_rejects_beyond_slots_and_queue():
+    admission = AdmissionController("query", max_in_flight=1, max_queue=1)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            async with admission.admit():
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        queued = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(ServerError) as rejected:
+            async with admission.admit():
+                pass
+        release.set()
+        await asyncio.gather(running, queued)
+        return rejected.value.error
+
+    error = asyncio.run(scenario())
+    assert error.code == SERVER_BUSY_CODE
+    assert error.data["retry_after"] >= 1
+    assert admission.stats()["admitted"] == 2
+    assert admission.stats()["rejected"] == 1
+
+
+def test_stats_are_served_on_the_agent_app():
+    admission = AdmissionController("query")
+    app = Starlette()
+    add_admission_route(app, admission)
+
+    with TestClient(app) as client:
+        stats = client.get(ADMISSION_STATS_PATH).json()
+
+    assert stats == admission.stats()
+    assert {"in_flight", "queued", "queue_wait_p50", "queue_wait_p95"} <= set(stats)
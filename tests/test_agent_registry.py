@@ -0,0 +1,120 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from src.agents.host_agent.agent_registry import AgentRegistry
+from src.agents.jira_ticket_agent.jira_agent import build_agent_card as jira_card
+from src.agents.splunk_inventory_agent.inventory_agent import (
+    build_agent_card as inventory_card,
+)
+
+INVENTORY = 'Splunk Inventory Agent'
+JIRA = 'Jira Ticket Agent'
+
+CARDS = {
+    'http://inventory-1:8080': inventory_card('inventory-1', 8080),
+    'http://inventory-2:8080': inventory_card('inventory-2', 8080),
+    'http://jira:8084': jira_card('jira', 8084),
+}
+
+
+@pytest.fixture
+def changes():
+    return []
+
+
+@pytest.fixture
+def registry(changes):
+    registry = AgentRegistry(
+        httpx.AsyncClient(),
+        on_change=lambda: changes.append(threading.get_ident()),
+    )
+
+    async def resolve(client, address):
+        return CARDS.get(address)
+
+    registry._resolve = resolve
+    return registry
+
+
+def test_same_card_name_becomes_a_replica(registry):
+    async def main():
+        registry.bind_loop(asyncio.get_running_loop())
+        await registry.discover(list(CARDS))
+
+    asyncio.run(main())
+    assert sorted(registry.connections) == [JIRA, INVENTORY]
+    replicas = registry.connections[INVENTORY].replicas
+    assert [replica.url for replica in replicas] == [
+        'http://inventory-1:8080',
+        'http://inventory-2:8080',
+    ]
+
+
+def test_unreachable_addresses_stay_pending(registry, changes):
+    async def main():
+        registry.bind_loop(asyncio.get_running_loop())
+        await registry.discover(['http://down:9000'])
+
+    asyncio.run(main())
+    assert registry.pending == {'http://down:9000'}
+    assert registry.connections == {}
+    assert changes == []
+
+
+def test_add_queues_each_replica(registry):
+    registry.add('http://a:1, http://b:2')
+    registry.stop()
+    assert registry.pending == {'http://a:1', 'http://b:2'}
+
+
+def test_discovery_thread_changes_are_applied_on_the_serving_loop(registry, changes):
+    async def main():
+        registry.bind_loop(asyncio.get_running_loop())
+        # Discovery on its own thread and event loop, as AgentRegistry._run does.
+        await asyncio.to_thread(asyncio.run, registry.discover(['http://jira:8084']))
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert changes == [threading.get_ident()]
+
+
+def test_change_without_a_loop_is_held_until_one_is_bound(registry, changes):
+    asyncio.run(registry.discover(['http://jira:8084']))
+    assert changes == []
+
+    async def main():
+        registry.bind_loop(asyncio.get_running_loop())
+
+    asyncio.run(main())
+    assert changes == [threading.get_ident()]
+
+
+def test_change_scheduled_on_a_closed_loop_is_delivered_on_rebind(registry, changes):
+    async def bind():
+        registry.bind_loop(asyncio.get_running_loop())
+
+    asyncio.run(bind())
+    asyncio.run(registry.discover(['http://jira:8084']))
+    assert changes == []
+
+    asyncio.run(bind())
+    assert len(changes) == 1
+
+
+def test_remove_replaces_the_snapshot(registry, changes):
+    async def main():
+        registry.bind_loop(asyncio.get_running_loop())
+        await registry.discover(list(CARDS))
+        before = registry.connections
+        assert registry.remove(JIRA)
+        assert not registry.remove(JIRA)
+        return before
+
+    before = asyncio.run(main())
+    assert JIRA in before
+    assert list(registry.connections) == [INVENTORY]
+    assert list(registry.cards) == [INVENTORY]
+    assert len(changes) == 2
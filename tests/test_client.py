@@ -0,0 +1,112 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+from websockets.protocol import State
+
+from src.core.client import ChatSessionPool, connect_session, get_session_pool
+
+
+class FakeSession:
+    def __init__(self, chat_session_id):
+        self.chat_session_id = chat_session_id
+        self.connected = False
+        self.connection = SimpleNamespace(
+            protocol=SimpleNamespace(state=State.OPEN),
+            ping=lambda: SimpleNamespace(wait=lambda timeout: True),
+        )
+
+    def connect(self):
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+
+
+class FakeClient:
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.sessions = []
+        self.deleted = []
+
+    def create_chat_session(self, collection_id):
+        return f"chat-{next(self._ids)}"
+
+    def connect(self, chat_session_id):
+        session = FakeSession(chat_session_id)
+        self.sessions.append(session)
+        return session
+
+    def delete_chat_sessions(self, chat_session_ids):
+        self.deleted.extend(chat_session_ids)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.delenv("H2OGPTE_SESSION_POOL", raising=False)
+    return FakeClient()
+
+
+def _run_query(client, chat_sessions):
+    """What an executor does per request."""
+    chat_id = chat_sessions.acquire()
+    with connect_session(client, chat_id) as session:
+        assert session.connected
+        used = session
+    return chat_id, used
+
+
+def test_executor_requests_use_pre_opened_connections(client):
+    chat_sessions = ChatSessionPool(client, "collection", size=2)
+    chat_sessions._refill()
+    pre_opened = list(client.sessions)
+
+    first = _run_query(client, chat_sessions)
+    second = _run_query(client, chat_sessions)
+
+    assert [session for _, session in (first, second)] == pre_opened
+    # No handshake on the request path, and nothing left idle afterwards.
+    assert len(client.sessions) == 2
+    assert get_session_pool(client).stats()["reuses"] == 2
+    assert get_session_pool(client).stats()["connects"] == 0
+    assert get_session_pool(client).stats()["idle"] == 0
+    assert not any(session.connected for session in pre_opened)
+
+
+def test_single_use_sessions_do_not_evict_reused_connections(client):
+    pool = get_session_pool(client)
+    pool.max_idle = 1
+    with connect_session(client, "routing-chat"):
+        pass
+
+    chat_sessions = ChatSessionPool(client, "collection", size=0)
+    _run_query(client, chat_sessions)
+
+    with connect_session(client, "routing-chat"):
+        pass
+    assert pool.stats()["reuses"] == 1
+    assert pool.stats()["idle"] == 1
+
+
+def test_released_sessions_are_deleted(client):
+    chat_sessions = ChatSessionPool(client, "collection", size=1)
+    chat_sessions._refill()
+
+    chat_id, session = _run_query(client, chat_sessions)
+    chat_sessions.release(chat_id)
+
+    assert client.deleted == [chat_id]
+    assert not session.connected
+    assert chat_sessions.stats()["released"] == 1
+
+
+def test_release_failure_is_not_raised(client):
+    def delete_chat_sessions(chat_session_ids):
+        raise ConnectionError("h2ogpte down")
+
+    client.delete_chat_sessions = delete_chat_sessions
+    chat_sessions = ChatSessionPool(client, "collection", size=0)
+    chat_id, _ = _run_query(client, chat_sessions)
+
+    chat_sessions.release(chat_id)
+    assert chat_sessions.stats()["released"] == 0
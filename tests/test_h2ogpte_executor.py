@@ -0,0 +1,64 @@
+import asyncio
+import contextvars
+import threading
+
+from src.core.h2ogpte_executor import H2OGPTEExecutor
+
+
+def test_stats_count_completed_calls():
+    executor = H2OGPTEExecutor("test", max_workers=2)
+
+    async def scenario():
+        return await asyncio.gather(*(executor.run(pow, 2, n) for n in range(4)))
+
+    assert asyncio.run(scenario()) == [1, 2, 4, 8]
+    assert executor.stats() == {
+        "name": "test",
+        "max_workers": 2,
+        "queued": 0,
+        "in_flight": 0,
+        "completed": 4,
+    }
+    executor.shutdown()
+
+
+def test_cancelling_a_queued_call_releases_the_queue_slot():
+    executor = H2OGPTEExecutor("test", max_workers=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    async def scenario():
+        running = asyncio.create_task(executor.run(block))
+        await asyncio.to_thread(started.wait, 5)
+        queued = asyncio.create_task(executor.run(pow, 2, 3))
+        await asyncio.sleep(0)
+        assert executor.stats()["queued"] == 1
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        stats = executor.stats()
+        release.set()
+        await running
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats["queued"] == 0
+    assert stats["in_flight"] == 1
+    assert executor.stats()["queued"] == 0
+    assert executor.stats()["completed"] == 1
+    executor.shutdown()
+
+
+def test_context_variables_reach_the_worker_thread():
+    var = contextvars.ContextVar("var", default="unset")
+    executor = H2OGPTEExecutor("test", max_workers=1)
+
+    async def scenario():
+        var.set("set")
+        return await executor.run(var.get)
+
+    assert asyncio.run(scenario()) == "set"
+    executor.shutdown()
@@ -0,0 +1,74 @@
+import pytest
+
+from src.agents.host_agent.intent_classifier import IntentClassifier
+from src.agents.jira_ticket_agent.jira_agent import build_agent_card as jira_card
+from src.agents.splunk_inventory_agent.inventory_agent import (
+    build_agent_card as inventory_card,
+)
+from src.agents.splunk_query_agent.query_agent import build_agent_card as query_card
+
+INVENTORY = 'Splunk Inventory Agent'
+QUERY = 'Splunk Query Agent'
+JIRA = 'Jira Ticket Agent'
+
+
+@pytest.fixture
+def classifier():
+    cards = [
+        inventory_card('localhost', 8080),
+        query_card('localhost', 8082),
+        jira_card('localhost', 8084),
+    ]
+    return IntentClassifier({card.name: card for card in cards})
+
+
+def _route(classifier, message):
+    decision = classifier.classify(message)
+    return decision['agent_name'] if decision else None
+
+
+@pytest.mark.parametrize('message', [
+    'Find events where sourcetype is aws:cloudtrail',
+    'Show me the top 10 source IPs',
+    'Count events in index=main by sourcetype',
+    'How many events are in the aws index?',
+    'Search the main index for failed logins',
+    'Who logged in to host web-01?',
+])
+def test_event_questions_never_fast_path_to_inventory(classifier, message):
+    assert _route(classifier, message) != INVENTORY
+    assert classifier.score(message)[INVENTORY] == 0
+
+
+@pytest.mark.parametrize('message', [
+    'Count events in index=main by sourcetype',
+    'Show me the top 10 source IPs',
+])
+def test_container_nouns_are_not_evidence(classifier, message):
+    assert _route(classifier, message) is None
+
+
+@pytest.mark.parametrize('message', [
+    'List all indexes',
+    'What indexes exist?',
+    'Which sourcetypes are available?',
+    'What version of Splunk is this?',
+])
+def test_listing_questions_route_to_inventory(classifier, message):
+    assert _route(classifier, message) == INVENTORY
+
+
+def test_spl_request_routes_to_query(classifier):
+    assert _route(classifier, 'Run an SPL query for failed logins') == QUERY
+
+
+def test_ticket_request_routes_to_jira(classifier):
+    assert _route(classifier, 'Create a Jira ticket for the failed login') == JIRA
+
+
+@pytest.mark.parametrize('message', [
+    'Investigate suspicious activity by user pedro',
+    'Run that again for the previous index',
+])
+def test_ambiguous_messages_fall_through(classifier, message):
+    assert _route(classifier, message) is None
@@ -0,0 +1,46 @@
+import itertools
+
+import pytest
+
+from src.core.jobs import JobTimeoutError, backoff_delays, wait_for_job
+
+
+def test_backoff_grows_to_the_cap_within_jitter():
+    delays = list(itertools.islice(backoff_delays(1, 8, jitter=0.2), 6))
+    for delay, base in zip(delays, [1, 2, 4, 8, 8, 8]):
+        assert base * 0.8 <= delay <= base * 1.2
+
+
+def test_polls_until_done_and_reports_progress():
+    statuses = iter(["queued", "running", "done"])
+    progress = []
+
+    status = wait_for_job(
+        lambda: next(statuses),
+        lambda status: status == "done",
+        initial_interval=0.001,
+        on_progress=lambda status, elapsed: progress.append(status),
+    )
+
+    assert status == "done"
+    assert progress == ["queued", "running"]
+
+
+def test_raises_at_the_deadline():
+    with pytest.raises(JobTimeoutError, match="delete job did not finish"):
+        wait_for_job(
+            lambda: "running",
+            lambda status: False,
+            description="delete job",
+            timeout=0.05,
+            initial_interval=0.01,
+            max_interval=0.01,
+        )
+
+
+def test_poll_failure_propagates():
+    def poll():
+        raise RuntimeError("job failed")
+
+    with pytest.raises(RuntimeError, match="job failed"):
+        wait_for_job(poll, lambda status: True)
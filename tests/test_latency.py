@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.agents.host_agent.latency import (
+    HUNT,
+    INTERACTIVE,
+    AdaptiveTimeouts,
+    LatencyHistogram,
+)
+from src.agents.host_agent.routing_agent import RoutingAgent
+
+CONFIG = {
+    'http_timeout': 600,
+    'adaptive_timeout_min': 30,
+    'hunt_timeout_min': 300,
+    'adaptive_timeout_multiplier': 3,
+    'latency_min_samples': 5,
+    'hedge_agents': ['query'],
+}
+
+
+def test_percentile_needs_min_samples_and_uses_nearest_rank():
+    histogram = LatencyHistogram(window=10, min_samples=4)
+    for seconds in (1, 2, 3):
+        histogram.record(seconds)
+    assert histogram.percentile(50) is None
+    histogram.record(4)
+    assert histogram.percentile(50) == 2
+    assert histogram.percentile(95) == 4
+
+
+def test_histogram_keeps_only_the_window():
+    histogram = LatencyHistogram(window=3, min_samples=1)
+    for seconds in (100, 1, 1, 1):
+        histogram.record(seconds)
+    assert histogram.percentile(99) == 1
+
+
+def test_deadline_uses_ceiling_until_enough_samples():
+    timeouts = AdaptiveTimeouts(CONFIG)
+    assert timeouts.deadline('Splunk Query Agent') == 600
+    for _ in range(5):
+        timeouts.record('Splunk Query Agent', 20)
+    assert timeouts.deadline('Splunk Query Agent') == 60
+
+
+def test_call_classes_have_separate_stats_and_floors():
+    timeouts = AdaptiveTimeouts(CONFIG)
+    for _ in range(5):
+        timeouts.record('Splunk Query Agent', 2)
+        timeouts.record('Splunk Query Agent', 50, HUNT)
+    assert timeouts.deadline('Splunk Query Agent', INTERACTIVE) == 30
+    assert timeouts.hedge_delay('Splunk Query Agent', INTERACTIVE) == 2
+    # p99 x 3 = 150s would cut hunts short; the hunt floor keeps 300s.
+    assert timeouts.deadline('Splunk Query Agent', HUNT) == 300
+    assert timeouts.hedge_delay('Splunk Query Agent', HUNT) == 50
+
+
+def test_only_hedge_agents_are_hedged():
+    timeouts = AdaptiveTimeouts(CONFIG)
+    for _ in range(5):
+        timeouts.record('Jira Ticket Agent', 2)
+    assert timeouts.hedge_delay('Jira Ticket Agent') is None
+
+
+def _agent_answering(cached: bool) -> RoutingAgent:
+    agent = RoutingAgent.__new__(RoutingAgent)
+    agent.timeouts = AdaptiveTimeouts(CONFIG)
+    agent.remote_agent_connections = {
+        'Splunk Query Agent': SimpleNamespace(
+            card=SimpleNamespace(capabilities=SimpleNamespace(streaming=True))
+        )
+    }
+
+    async def send_streaming(agent_name, request, on_progress):
+        return 'answer', cached
+
+    agent._send_message_streaming = send_streaming
+    return agent
+
+
+def test_cache_hits_are_not_recorded():
+    agent = _agent_answering(cached=True)
+    result = asyncio.run(agent._send_once('Splunk Query Agent', 'task', None))
+    assert result == 'answer'
+    assert not agent.timeouts.histograms['Splunk Query Agent', INTERACTIVE].samples
+
+
+def test_real_executions_are_recorded_under_their_call_class():
+    agent = _agent_answering(cached=False)
+    asyncio.run(agent._send_once('Splunk Query Agent', 'task', None, HUNT))
+    assert len(agent.timeouts.histograms['Splunk Query Agent', HUNT].samples) == 1
+    assert not agent.timeouts.histograms['Splunk Query Agent', INTERACTIVE].samples
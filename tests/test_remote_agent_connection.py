@@ -0,0 +1,67 @@
+import time
+
+import httpx
+
+from src.agents.host_agent.health import CircuitBreaker, HealthMonitor
+from src.agents.host_agent.remote_agent_connection import RemoteAgentConnections
+from src.agents.splunk_query_agent.query_agent import build_agent_card
+
+
+def _connections(*urls):
+    connections = RemoteAgentConnections(
+        build_agent_card('localhost', 8082), urls[0], httpx.AsyncClient()
+    )
+    for url in urls[1:]:
+        connections.add_replica(url)
+    return connections
+
+
+def test_equally_busy_replicas_prefer_the_shorter_server_queue():
+    connections = _connections('http://a:8082', 'http://b:8082')
+    slow, fast = connections.replicas
+    slow.queue_wait_p95 = 4.2
+    fast.queue_wait_p95 = 0.3
+
+    assert {connections._pick_replica().url for _ in range(4)} == {fast.url}
+
+
+def test_sub_second_queue_waits_still_rotate():
+    connections = _connections('http://a:8082', 'http://b:8082')
+    connections.replicas[0].queue_wait_p95 = 0.2
+    connections.replicas[1].queue_wait_p95 = 0.7
+
+    picked = {connections._pick_replica().url for _ in range(4)}
+    assert picked == {'http://a:8082', 'http://b:8082'}
+
+
+def test_picking_leaves_unchosen_open_breakers_alone():
+    connections = _connections('http://a:8082', 'http://b:8082')
+    healthy, recovering = connections.replicas
+    recovering.breaker.state = CircuitBreaker.OPEN
+    recovering.breaker.opened_at = time.monotonic() - recovering.breaker.reset_timeout
+    # Busier, so the healthy replica is the one chosen.
+    recovering.outstanding = 1
+
+    assert connections._pick_replica() is healthy
+    assert recovering.breaker.state == CircuitBreaker.OPEN
+
+    recovering.outstanding = 0
+    healthy.outstanding = 1
+    assert connections._pick_replica() is recovering
+    assert recovering.breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_health_probe_records_queue_wait():
+    def handler(request):
+        if request.url.path == '/admission':
+            if request.url.host == 'old':
+                return httpx.Response(404)
+            return httpx.Response(200, json={'queue_wait_p95': 2.5})
+        return httpx.Response(200, json={})
+
+    connections = _connections('http://new:8082', 'http://old:8082')
+    monitor = HealthMonitor(lambda: connections.replicas)
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        monitor.probe_all(client)
+
+    assert [replica.queue_wait_p95 for replica in connections.replicas] == [2.5, 0.0]
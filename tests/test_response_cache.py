@@ -0,0 +1,93 @@
+import pytest
+
+from src.core import response_cache
+from src.core.response_cache import ResponseCache
+from src.core.splunk import index_fingerprint
+
+
+def _index(name, events, max_time="2026-10-18T10:00:00"):
+    return {"name": name, "content": {"totalEventCount": str(events), "maxTime": max_time}}
+
+
+INDEXES = [_index("main", 10), _index("aws", 0), _index("_internal", 5000)]
+
+
+def test_fingerprint_ignores_internal_indexes():
+    busy = [
+        _index("main", 10),
+        _index("aws", 0),
+        _index("_internal", 7, "2026-10-18T10:05:00"),
+        _index("_audit", 1),
+    ]
+    assert index_fingerprint(busy) == index_fingerprint(INDEXES)
+
+
+@pytest.mark.parametrize("changed", [
+    INDEXES + [_index("okta", 3)],
+    [_index("aws", 0), _index("_internal", 5000)],
+    [_index("main", 11), _index("aws", 0), _index("_internal", 5000)],
+    [_index("main", 10, "2026-10-18T10:05:00"), _index("aws", 0), _index("_internal", 5000)],
+])
+def test_fingerprint_changes_with_user_data(changed):
+    assert index_fingerprint(changed) != index_fingerprint(INDEXES)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_hit_is_case_and_whitespace_insensitive(clock):
+    cache = ResponseCache()
+    cache.put("List  the indexes", "main, aws")
+    assert cache.get("list the INDEXES") == "main, aws"
+    assert cache.stats()["hits"] == 1
+
+
+def test_fingerprint_change_drops_every_answer(clock):
+    data = {"fingerprint": "a"}
+    cache = ResponseCache(fingerprint=lambda: data["fingerprint"], fingerprint_interval=30)
+    cache.put("list the indexes", "main")
+
+    data["fingerprint"] = "b"
+    clock.now += 10
+    # Still within the interval: the old fingerprint is reused.
+    assert cache.get("list the indexes") == "main"
+
+    clock.now += 30
+    assert cache.get("list the indexes") is None
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_failing_fingerprint_bypasses_the_cache(clock):
+    def fingerprint():
+        raise ConnectionError("splunk down")
+
+    cache = ResponseCache(fingerprint=fingerprint)
+    cache.put("list the indexes", "main")
+    assert cache.get("list the indexes") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_entries_expire_and_lru_is_bounded(clock):
+    cache = ResponseCache(ttl=60, max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+    clock.now += 61
+    assert cache.get("c") is None
@@ -0,0 +1,63 @@
+from src.agents.host_agent import routing_cache
+from src.agents.host_agent.routing_cache import RoutingCache
+
+DECISION = {'agent_name': 'Splunk Query Agent', 'reasoning': 'Event search.', 'source': 'llm'}
+
+
+def test_hit_ignores_case_whitespace_and_trailing_punctuation():
+    cache = RoutingCache()
+    cache.put('Count failed logins', 'ctx', DECISION)
+    assert cache.get('  count   FAILED logins? ', 'ctx') == {
+        'agent_name': 'Splunk Query Agent',
+        'reasoning': 'Event search.',
+    }
+    assert cache.stats()['hits'] == 1
+
+
+def test_different_context_misses():
+    cache = RoutingCache()
+    cache.put('Count failed logins', 'ctx', DECISION)
+    assert cache.get('Count failed logins', 'other ctx') is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(routing_cache.time, 'monotonic', lambda: now[0])
+    cache = RoutingCache(ttl=10)
+    cache.put('q', 'ctx', DECISION)
+    now[0] += 9
+    assert cache.get('q', 'ctx') is not None
+    now[0] += 2
+    assert cache.get('q', 'ctx') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RoutingCache(max_entries=2)
+    cache.put('a', 'ctx', DECISION)
+    cache.put('b', 'ctx', DECISION)
+    cache.get('a', 'ctx')
+    cache.put('c', 'ctx', DECISION)
+    assert cache.get('b', 'ctx') is None
+    assert cache.get('a', 'ctx') is not None
+    assert cache.get('c', 'ctx') is not None
+
+
+def test_disable_flushes_and_bypasses_until_enabled():
+    cache = RoutingCache()
+    cache.put('q', 'ctx', DECISION)
+    cache.disable()
+    assert cache.stats() == {'enabled': False, 'entries': 0, 'hits': 0, 'misses': 0}
+    cache.put('q', 'ctx', DECISION)
+    assert cache.get('q', 'ctx') is None
+    cache.enable()
+    cache.put('q', 'ctx', DECISION)
+    assert cache.get('q', 'ctx') is not None
+
+
+def test_clear_keeps_cache_enabled():
+    cache = RoutingCache()
+    cache.put('q', 'ctx', DECISION)
+    cache.clear()
+    assert cache.get('q', 'ctx') is None
+    assert cache.stats()['enabled'] is True
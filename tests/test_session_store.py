@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from src.agents.host_agent import session_store
+from src.agents.host_agent.hunt_store import ThreatHuntStore
+from src.agents.host_agent.session_store import InMemorySessionStore, SQLiteSessionStore
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_store(request, tmp_path):
+    def make(**kwargs):
+        if request.param == 'memory':
+            return InMemorySessionStore(**kwargs)
+        return SQLiteSessionStore(str(tmp_path / 'sessions.db'), **kwargs)
+    return make
+
+
+def test_state_round_trips_with_trimmed_history(make_store):
+    async def scenario():
+        store = make_store(max_turns=2)
+        state = await store.get('browser-1')
+        state['chat_session_id'] = 'chat-1'
+        state['turn_history'] = [{'user': str(i)} for i in range(5)]
+        await store.save(state)
+        return await store.get('browser-1')
+
+    state = asyncio.run(scenario())
+    assert state['chat_session_id'] == 'chat-1'
+    assert state['turn_history'] == [{'user': '3'}, {'user': '4'}]
+
+
+def test_eviction_hands_chat_sessions_to_on_evict(make_store, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, 'time', lambda: now[0])
+    deleted = []
+
+    async def on_evict(chat_session_ids):
+        deleted.extend(chat_session_ids)
+
+    async def scenario():
+        store = make_store(idle_timeout=60, on_evict=on_evict)
+        for session_id, chat_session_id in [('idle', 'chat-idle'), ('no-chat', None)]:
+            state = await store.get(session_id)
+            state['chat_session_id'] = chat_session_id
+            await store.save(state)
+        now[0] += 120
+        state = await store.get('active')
+        await store.save(state)
+        now[0] += store.SWEEP_INTERVAL
+        return await store.get('idle')
+
+    state = asyncio.run(scenario())
+    assert deleted == ['chat-idle']
+    assert state['chat_session_id'] is None
+
+
+def test_hunt_checkpoints_round_trip(tmp_path):
+    async def scenario():
+        store = ThreatHuntStore(str(tmp_path / 'hunts.db'))
+        state = await store.create('hunt-1', 'Exfiltration via S3')
+        state['completed'].append('discovery')
+        await store.save(state)
+        return await store.load('hunt-1'), await store.load('missing')
+
+    state, missing = asyncio.run(scenario())
+    assert state['completed'] == ['discovery']
+    assert missing is None
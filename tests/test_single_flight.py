@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.agents.host_agent.routing_agent import RoutingAgent
+
+QUERY = 'Splunk Query Agent'
+
+
+def _agent(send):
+    agent = RoutingAgent.__new__(RoutingAgent)
+    agent.remote_agent_connections = {QUERY: SimpleNamespace()}
+    agent._in_flight = {}
+    agent.coalesce_stats = {'calls': 0, 'coalesced': 0}
+    agent._send_with_deadline = send
+    return agent
+
+
+def test_identical_concurrent_tasks_share_one_call():
+    calls = []
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def send(agent_name, task, on_progress, call_class):
+            calls.append(task)
+            await gate.wait()
+            return 'answer'
+
+        agent = _agent(send)
+        first = asyncio.create_task(agent.send_message(QUERY, 'Top 10 hosts'))
+        second = asyncio.create_task(agent.send_message(QUERY, '  top 10   HOSTS '))
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(first, second)
+        await asyncio.sleep(0)
+        return agent, results
+
+    agent, results = asyncio.run(main())
+    assert results == ['answer', 'answer']
+    assert calls == ['Top 10 hosts']
+    assert agent.coalesce_stats == {'calls': 1, 'coalesced': 1}
+    assert agent._in_flight == {}
+
+
+def test_cancelled_flight_does_not_unlist_its_successor():
+    calls = []
+
+    async def main():
+        release_old = asyncio.Event()
+        gate = asyncio.Event()
+
+        async def send(agent_name, task, on_progress, call_class):
+            calls.append(task)
+            if len(calls) == 1:
+                try:
+                    await gate.wait()
+                except asyncio.CancelledError:
+                    # Cleanup that outlives the cancel request, e.g. a
+                    # remote task cancellation.
+                    await release_old.wait()
+                    raise
+            await gate.wait()
+            return 'answer'
+
+        agent = _agent(send)
+        key = (QUERY, 'top 10 hosts')
+        abandoned = asyncio.create_task(agent.send_message(QUERY, 'top 10 hosts'))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        await asyncio.sleep(0)
+
+        # Arrives while the abandoned call is still winding down.
+        fresh = asyncio.create_task(agent.send_message(QUERY, 'top 10 hosts'))
+        await asyncio.sleep(0)
+        flight = agent._in_flight[key]
+
+        release_old.set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert agent._in_flight.get(key) is flight
+
+        joined = asyncio.create_task(agent.send_message(QUERY, 'top 10 hosts'))
+        await asyncio.sleep(0)
+        gate.set()
+        return await asyncio.gather(fresh, joined)
+
+    assert asyncio.run(main()) == ['answer', 'answer']
+    assert len(calls) == 2
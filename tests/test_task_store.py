@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from a2a.types import Message, Part, Role, Task, TaskState, TaskStatus, TextPart
+
+from src.core import task_store
+from src.core.task_store import BoundedInMemoryTaskStore, SQLiteTaskStore
+
+
+def _message(text, metadata=None, role=Role.agent):
+    return Message(
+        message_id=text,
+        role=role,
+        parts=[Part(root=TextPart(text=text))],
+        metadata=metadata,
+    )
+
+
+def _task(task_id, history=()):
+    return Task(
+        id=task_id,
+        context_id="ctx",
+        status=TaskStatus(state=TaskState.working),
+        history=list(history),
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "memory":
+            return BoundedInMemoryTaskStore(**kwargs)
+        return SQLiteTaskStore(str(tmp_path / "tasks.db"), **kwargs)
+    return make
+
+
+def test_streamed_deltas_are_not_persisted(make_store):
+    history = [
+        _message("question", role=Role.user),
+        _message("Running agent...", {"stream": "status"}),
+        *(_message(f"token {i}", {"stream": "delta"}) for i in range(50)),
+    ]
+
+    async def scenario():
+        store = make_store()
+        task = _task("t1", history)
+        await store.save(task)
+        return task, await store.get("t1")
+
+    task, stored = asyncio.run(scenario())
+    assert [m.message_id for m in stored.history] == ["question", "Running agent..."]
+    # The caller's task is left untouched.
+    assert len(task.history) == 52
+
+
+def test_memory_store_keeps_the_most_recently_updated():
+    async def scenario():
+        store = BoundedInMemoryTaskStore(max_tasks=2)
+        for task_id in ("a", "b", "a", "c"):
+            await store.save(_task(task_id))
+        return [task_id for task_id in "abc" if await store.get(task_id)]
+
+    assert asyncio.run(scenario()) == ["a", "c"]
+
+
+def test_memory_store_forgets_expired_tasks(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(task_store.time, "monotonic", lambda: now[0])
+
+    async def scenario():
+        store = BoundedInMemoryTaskStore(ttl=60)
+        await store.save(_task("old"))
+        now[0] += 61
+        await store.save(_task("new"))
+        return await store.get("old"), await store.get("new")
+
+    old, new = asyncio.run(scenario())
+    assert old is None and new is not None
+
+
+def test_sqlite_evict_drops_expired_and_overflow(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(task_store.time, "time", lambda: now[0])
+    # Only the explicit evict() below sweeps.
+    monkeypatch.setattr(task_store, "SWEEP_INTERVAL", float("inf"))
+    store = SQLiteTaskStore(str(tmp_path / "tasks.db"), ttl=60, max_tasks=1)
+
+    async def scenario():
+        await store.save(_task("expired"))
+        for task_id in ("a", "b", "c"):
+            now[0] += 30
+            await store.save(_task(task_id))
+        now[0] += 1
+        evicted = store.evict()
+        remaining = [t for t in ("expired", "a", "b", "c") if await store.get(t)]
+        return evicted, remaining
+
+    evicted, remaining = asyncio.run(scenario())
+    # "expired" and "a" are past the TTL; "b" is beyond max_tasks.
+    assert evicted == 3
+    assert remaining == ["c"]
@@ -0,0 +1,38 @@
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.core import workers
+from src.core.workers import HOST_ENV, PORT_ENV, create_worker_app
+
+
+def test_worker_app_sets_up_the_agent_in_its_lifespan(monkeypatch):
+    monkeypatch.setenv(HOST_ENV, "agents.internal")
+    monkeypatch.setenv(PORT_ENV, "9082")
+    monkeypatch.setattr(workers, "create_client", lambda: "client")
+    calls = []
+
+    def setup_agent(client, context):
+        calls.append("setup")
+        context["client"] = client
+
+    def build_app(context, host, port):
+        calls.append("build")
+
+        async def card(request):
+            return JSONResponse(
+                {"url": f"http://{host}:{port}/", "client": context["client"]}
+            )
+
+        return Starlette(routes=[Route("/.well-known/agent-card.json", card)])
+
+    app = create_worker_app("query", setup_agent, build_app, 8082)
+    # Nothing is set up until the worker process starts serving.
+    assert calls == []
+
+    with TestClient(app) as client:
+        response = client.get("/.well-known/agent-card.json")
+
+    assert calls == ["setup", "build"]
+    assert response.json() == {"url": "http://agents.internal:9082/", "client": "client"}